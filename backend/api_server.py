@@ -0,0 +1,436 @@
+# -*- coding: utf-8 -*-
+# backend/api_server.py
+"""
+Headless HTTP/JSON API over the services (stdlib only).
+
+    python -m backend.api_server --port 8080 [--db path] [--workers 8] [--group-commit] [--quiet]
+
+Endpoints (JSON in, JSON out):
+
+    GET    /api/health
+    POST   /api/login                 {"username", "password"} -> {"token", "user"}
+    GET    /api/flights?origin=&destination=&date=    or    ?q=<text>
+    GET    /api/flights/<id>
+    GET    /api/bookings?cursor=&page_size=&search=&upcoming=1     (auth)
+    POST   /api/bookings              {"flight_id", "seat_count", "cabin"?}  (auth)
+    DELETE /api/bookings/<id>                                      (auth)
+
+Authenticated calls send "Authorization: Bearer <token>" from /api/login.
+
+The event loop only parses and writes; every service call runs in the
+AsyncServices thread pool (sized like the connection pool). At most
+max_pending calls may be queued or running; past that the server answers
+503 straight away instead of letting latency grow without bound.
+
+Connections are kept alive (HTTP/1.1 default) until the client closes,
+sends "Connection: close" or stays idle for idle_timeout seconds. Each
+response carries Server-Timing (queue = waiting for a worker, db = in the
+service call, total = whole request) and X-Response-Time in ms.
+
+While it runs, the server prunes change_log (backend.change_feed) and drops
+expired sessions at start and every prune_interval seconds, so a headless
+deployment keeps both bounded.
+"""
+import os
+import re
+import sys
+import json
+import time
+import asyncio
+import secrets
+import argparse
+from urllib.parse import urlsplit, parse_qs
+
+from backend import database, group_commit, change_feed
+from backend.async_service import AsyncServices
+from backend.flight_service import FlightService
+from backend.booking_service import BookingService
+from backend.user_service import UserService
+
+MAX_HEADER_BYTES = 16 * 1024
+MAX_BODY_BYTES = 64 * 1024
+IDLE_TIMEOUT = 15.0         # seconds a kept-alive connection may sit idle
+MAX_PENDING = 256           # queued + running service calls before 503
+MAX_PAGE_SIZE = 100
+SESSION_TTL = 12 * 3600
+PRUNE_INTERVAL = 3600.0     # seconds between change_log prunes
+
+REASONS = {
+    200: "OK", 201: "Created", 400: "Bad Request", 401: "Unauthorized", 404: "Not Found",
+    405: "Method Not Allowed", 409: "Conflict", 411: "Length Required", 413: "Payload Too Large",
+    431: "Request Header Fields Too Large", 500: "Internal Server Error",
+    501: "Not Implemented", 503: "Service Unavailable",
+}
+
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class Request:
+    __slots__ = ("method", "path", "query", "headers", "body", "version", "timing", "user")
+
+    def __init__(self, method, target, version, headers, body):
+        parts = urlsplit(target)
+        self.method = method
+        self.path = parts.path.rstrip("/") or "/"
+        self.query = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+        self.version = version
+        self.headers = headers
+        self.body = body
+        self.timing = {"queue": 0.0, "db": 0.0}
+        self.user = None
+
+    def json(self):
+        if not self.body:
+            return {}
+        try:
+            data = json.loads(self.body)
+        except ValueError:
+            raise HttpError(400, "Body is not valid JSON")
+        if not isinstance(data, dict):
+            raise HttpError(400, "Body must be a JSON object")
+        return data
+
+    @property
+    def keep_alive(self):
+        connection = self.headers.get("connection", "").lower()
+        if self.version == "HTTP/1.0":
+            return connection == "keep-alive"
+        return connection != "close"
+
+
+def _int(value, name):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise HttpError(400, f"'{name}' must be an integer")
+
+
+class ApiServer:
+    def __init__(self, host="127.0.0.1", port=8080, max_workers=database.POOL_MAX_SIZE,
+                 max_pending=MAX_PENDING, idle_timeout=IDLE_TIMEOUT, prune_interval=PRUNE_INTERVAL):
+        self.host = host
+        self.port = port
+        self.max_pending = max_pending
+        self.idle_timeout = idle_timeout
+        self.prune_interval = prune_interval
+        self.services = AsyncServices(max_workers=max_workers)
+        self.sessions = {}      # token -> (user dict, expires at)
+        self.pending = 0
+        self.server = None
+        self.maintenance = None
+        self.routes = [
+            ("GET", re.compile(r"/api/health"), self.health),
+            ("POST", re.compile(r"/api/login"), self.login),
+            ("GET", re.compile(r"/api/flights"), self.search_flights),
+            ("GET", re.compile(r"/api/flights/(\d+)"), self.flight_details),
+            ("GET", re.compile(r"/api/bookings"), self.list_bookings),
+            ("POST", re.compile(r"/api/bookings"), self.create_booking),
+            ("DELETE", re.compile(r"/api/bookings/(\d+)"), self.cancel_booking),
+        ]
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+    async def start(self):
+        """Start listening; returns the bound port (useful with port=0)."""
+        self.server = await asyncio.start_server(
+            self.handle_connection, self.host, self.port, limit=MAX_HEADER_BYTES
+        )
+        self.port = self.server.sockets[0].getsockname()[1]
+        self.maintenance = asyncio.create_task(self.maintain())
+        return self.port
+
+    async def serve_forever(self):
+        await self.start()
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def close(self):
+        if self.maintenance is not None:
+            self.maintenance.cancel()
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        self.services.shutdown(wait=False)
+
+    async def maintain(self):
+        """Prune the change log and expired sessions now, then every prune_interval seconds."""
+        while True:
+            self.sweep_sessions()
+            try:
+                await self.services.call(change_feed.prune)
+            except Exception as e:
+                print(f"⚠️ Change log prune failed: {e!r}", file=sys.stderr)
+            await asyncio.sleep(self.prune_interval)
+
+    # ------------------------------------------------------------------
+    # Connection handling
+    # ------------------------------------------------------------------
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await self.read_request(reader)
+                except HttpError as e:
+                    await self.write_response(writer, e.status, {"error": e.message}, None, time.perf_counter(), False)
+                    break
+                if request is None:
+                    break
+
+                started = time.perf_counter()
+                try:
+                    status, payload = await self.dispatch(request)
+                except HttpError as e:
+                    status, payload = e.status, {"error": e.message}
+                except Exception as e:
+                    print(f"❌ {request.method} {request.path} failed: {e!r}", file=sys.stderr)
+                    status, payload = 500, {"error": "Internal server error"}
+
+                keep_alive = request.keep_alive
+                await self.write_response(writer, status, payload, request, started, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def read_request(self, reader):
+        """Next request on the connection, or None when the client is done/idle."""
+        try:
+            head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), self.idle_timeout)
+        except asyncio.TimeoutError:
+            return None
+        except asyncio.IncompleteReadError as e:
+            if e.partial.strip():
+                raise HttpError(400, "Incomplete request")
+            return None
+        except asyncio.LimitOverrunError:
+            raise HttpError(431, "Request headers too large")
+
+        lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, target, version = lines[0].split(" ")
+        except ValueError:
+            raise HttpError(400, "Malformed request line")
+        headers = {}
+        for line in lines[1:]:
+            if line:
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+
+        if "transfer-encoding" in headers:
+            raise HttpError(501, "Chunked request bodies are not supported")
+        length = _int(headers.get("content-length", 0), "Content-Length")
+        if length > MAX_BODY_BYTES:
+            raise HttpError(413, "Request body too large")
+        body = await reader.readexactly(length) if length else b""
+        return Request(method.upper(), target, version, headers, body)
+
+    async def write_response(self, writer, status, payload, request, started, keep_alive):
+        body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode()
+        total_ms = (time.perf_counter() - started) * 1000
+        head = [
+            f"HTTP/1.1 {status} {REASONS.get(status, '')}",
+            "Content-Type: application/json; charset=utf-8",
+            f"Content-Length: {len(body)}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+        ]
+        if keep_alive:
+            head.append(f"Keep-Alive: timeout={int(self.idle_timeout)}")
+        if request is not None:
+            head.append(
+                f"Server-Timing: queue;dur={request.timing['queue'] * 1000:.2f}, "
+                f"db;dur={request.timing['db'] * 1000:.2f}, total;dur={total_ms:.2f}"
+            )
+        head.append(f"X-Response-Time: {total_ms:.2f}ms")
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+        await writer.drain()
+
+    # ------------------------------------------------------------------
+    # Dispatch
+    # ------------------------------------------------------------------
+    async def dispatch(self, request):
+        allowed = []
+        for method, pattern, handler in self.routes:
+            match = pattern.fullmatch(request.path)
+            if match is None:
+                continue
+            if method != request.method:
+                allowed.append(method)
+                continue
+            return await handler(request, *match.groups())
+        if allowed:
+            raise HttpError(405, f"Use {', '.join(allowed)} for {request.path}")
+        raise HttpError(404, "No such endpoint")
+
+    async def run(self, request, fn, *args, **kwargs):
+        """Run a blocking service call in the pool, timing its queue and run time."""
+        if self.pending >= self.max_pending:
+            raise HttpError(503, "Server busy, retry shortly")
+        self.pending += 1
+        submitted = time.perf_counter()
+
+        def job():
+            began = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                request.timing["queue"] += began - submitted
+                request.timing["db"] += time.perf_counter() - began
+
+        try:
+            return await self.services.call(job)
+        finally:
+            self.pending -= 1
+
+    def sweep_sessions(self):
+        """Forget expired tokens, including ones never presented again; returns how many."""
+        now = time.time()
+        expired = [token for token, (_, expires) in self.sessions.items() if expires < now]
+        for token in expired:
+            del self.sessions[token]
+        return len(expired)
+
+    def authenticate(self, request):
+        scheme, _, token = request.headers.get("authorization", "").partition(" ")
+        session = self.sessions.get(token) if scheme.lower() == "bearer" else None
+        if session is None or session[1] < time.time():
+            self.sessions.pop(token, None)
+            raise HttpError(401, "Login required")
+        request.user = session[0]
+        return session[0]
+
+    # ------------------------------------------------------------------
+    # Handlers — each returns (status, payload)
+    # ------------------------------------------------------------------
+    async def health(self, request):
+        return 200, {"status": "ok", "pending": self.pending, "sessions": len(self.sessions)}
+
+    async def login(self, request):
+        data = request.json()
+        username, password = data.get("username"), data.get("password")
+        if not isinstance(username, str) or not isinstance(password, str):
+            raise HttpError(400, "'username' and 'password' are required")
+        user = await self.run(request, UserService.login_user, username, password)
+        if not user:
+            raise HttpError(401, "Invalid username or password")
+        token = secrets.token_urlsafe(24)
+        self.sessions[token] = (user, time.time() + SESSION_TTL)
+        return 200, {"token": token, "user": user}
+
+    async def search_flights(self, request):
+        q = request.query
+        if q.get("q"):
+            limit = min(_int(q.get("limit", 50), "limit"), MAX_PAGE_SIZE)
+            items = await self.run(request, FlightService.search_flights_text, q["q"], limit)
+        elif q.get("origin") and q.get("destination"):
+            items = await self.run(request, FlightService.search_flights,
+                                   q["origin"], q["destination"], q.get("date") or None)
+        else:
+            raise HttpError(400, "Pass 'origin' and 'destination' (and optionally 'date'), or 'q'")
+        return 200, {"items": items}
+
+    async def flight_details(self, request, flight_id):
+        flight = await self.run(request, FlightService.get_flight_details, int(flight_id))
+        if flight is None:
+            raise HttpError(404, "Flight not found")
+        return 200, flight
+
+    async def list_bookings(self, request):
+        user = self.authenticate(request)
+        q = request.query
+        page_size = _int(q.get("page_size", 20), "page_size")
+        if not 1 <= page_size <= MAX_PAGE_SIZE:
+            raise HttpError(400, f"'page_size' must be between 1 and {MAX_PAGE_SIZE}")
+        try:
+            page = await self.run(
+                request, BookingService.get_user_bookings_page, user["user_id"],
+                cursor=q.get("cursor") or None, page_size=page_size,
+                search=q.get("search") or None, upcoming_only=q.get("upcoming") in ("1", "true"),
+                with_total=q.get("total") in ("1", "true"),
+            )
+        except ValueError as e:
+            raise HttpError(400, str(e))
+        return 200, page
+
+    async def create_booking(self, request):
+        user = self.authenticate(request)
+        data = request.json()
+        flight_id = _int(data.get("flight_id"), "flight_id")
+        seat_count = _int(data.get("seat_count", 1), "seat_count")
+        if seat_count <= 0:
+            raise HttpError(400, "'seat_count' must be positive")
+        cabin = data.get("cabin")
+        if cabin is not None and not isinstance(cabin, str):
+            raise HttpError(400, "'cabin' must be a cabin code")
+        booking = await self.run(request, BookingService.create_booking, user["user_id"], flight_id, seat_count, cabin)
+        if booking is None:
+            raise HttpError(409, "Flight not found or not enough seats")
+        return 201, booking
+
+    async def cancel_booking(self, request, booking_id):
+        user = self.authenticate(request)
+        booking = await self.run(request, BookingService.get_booking, int(booking_id))
+        # other users' bookings look missing rather than forbidden
+        if booking is None or (booking["user_id"] != user["user_id"] and not user["is_admin"]):
+            raise HttpError(404, "Booking not found")
+        if not await self.run(request, BookingService.cancel_booking, int(booking_id)):
+            raise HttpError(404, "Booking not found")
+        return 200, {"cancelled": True, "booking_id": int(booking_id)}
+
+
+# ------------------------------------------------------------------------------
+# Entry point
+# ------------------------------------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Al-Kawthar booking API server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--db", help=f"database file (default {database.DB_NAME})")
+    parser.add_argument("--workers", type=int, default=database.POOL_MAX_SIZE,
+                        help="threads running service calls")
+    parser.add_argument("--max-pending", type=int, default=MAX_PENDING)
+    parser.add_argument("--idle-timeout", type=float, default=IDLE_TIMEOUT)
+    parser.add_argument("--group-commit", action="store_true",
+                        help="query_only reads and one group-committing writer (backend.group_commit)")
+    parser.add_argument("--quiet", action="store_true", help="silence the services' per-call output")
+    args = parser.parse_args(argv)
+
+    if args.db:
+        database.close_pool()
+        database.DB_NAME = args.db
+    database.initialize_database()
+    if args.group_commit:
+        group_commit.enable()
+
+    server = ApiServer(args.host, args.port, args.workers, args.max_pending, args.idle_timeout)
+
+    async def serve():
+        await server.start()
+        print(f"🌐 Serving on http://{server.host}:{server.port} ({args.workers} workers)", flush=True)
+        if args.quiet:
+            sys.stdout = open(os.devnull, "w")
+        try:
+            async with server.server:
+                await server.server.serve_forever()
+        finally:
+            await server.close()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+# backend/archive.py
+"""
+Hot/cold partitioning: departed flights and their bookings move to an
+archive database next to the main one (al_kawthar_flights_archive.db),
+attached to connections as `archive`.
+
+    python -m backend.archive [--before 2030-01-01] [--batch-size 500]
+    python -m backend.archive --stats
+
+    from backend import archive
+    archive.archive_departed()          # {"flights", "bookings", "batches", "ms"}
+
+Live queries (search, listings, pages, revenue summaries) only see the
+main tables, so they stop paying for years of past departures. History
+queries opt in with include_archived=True (BookingService.get_user_bookings,
+get_all_bookings), which unions the archive when it exists (union_archived).
+
+Each batch is copied into the archive in one transaction and deleted from
+the main tables in the next. In WAL mode a transaction that spans attached
+databases is atomic per database, not across them, so the copy is an
+idempotent INSERT OR REPLACE: a crash between the two steps leaves the
+batch in both places until the next run finishes moving it, never lost.
+The delete only removes bookings the archive holds, and keeps any flight
+that still has others; BookingService.create_booking refuses departed
+flights, so nothing new should arrive on them in the first place.
+"""
+import os
+import re
+import sys
+import time
+import sqlite3
+import argparse
+from datetime import date as _date
+
+from backend import database, change_feed
+from backend.database import pooled_connection, read_connection
+from backend.cache import flight_cache
+
+ALIAS = "archive"
+# Tables moved, with the column that links them to the archived flights.
+# Archived bookings keep exactly the main columns (in order), so `b.*`
+# selects can be unioned; archived flights also record when they moved.
+ARCHIVED_TABLES = (("flights", "flight_id"), ("bookings", "flight_id"))
+EXTRA_COLUMNS = {"flights": ("archived_at",)}
+ARCHIVE_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS archive.idx_archive_flights_date ON flights (date)",
+    "CREATE INDEX IF NOT EXISTS archive.idx_archive_bookings_user ON bookings (user_id)",
+    "CREATE INDEX IF NOT EXISTS archive.idx_archive_bookings_flight ON bookings (flight_id)",
+    "CREATE INDEX IF NOT EXISTS archive.idx_archive_bookings_date ON bookings (booking_date)",
+)
+
+
+def archive_path(db_name=None):
+    """Archive file for a database: <name>_archive<ext> beside it."""
+    root, ext = os.path.splitext(db_name or database.DB_NAME)
+    return f"{root}_archive{ext or '.db'}"
+
+
+def attach(conn, create=False):
+    """
+    Attach the archive to `conn` as `archive` (once per connection).
+    Returns False when there is no archive yet and create is False.
+    """
+    attached = {row[1] for row in conn.execute("PRAGMA database_list")}
+    if ALIAS in attached:
+        return True
+    path = archive_path()
+    if not create and not os.path.exists(path):
+        return False
+    conn.execute(f"ATTACH DATABASE ? AS {ALIAS}", (path,))
+    if create:
+        conn.execute(f"PRAGMA {ALIAS}.journal_mode = WAL")
+    return True
+
+
+def _columns(conn, schema, table):
+    return [(row[1], row[2]) for row in conn.execute(f"PRAGMA {schema}.table_info({table})")]
+
+
+def ensure_schema(conn):
+    """Create the archive tables, adding any column the main tables gained since."""
+    for table, _ in ARCHIVED_TABLES:
+        main_columns = _columns(conn, "main", table)
+        existing = {name for name, _ in _columns(conn, ALIAS, table)}
+        if not existing:
+            key = main_columns[0][0]
+            body = ", ".join([f"{key} INTEGER PRIMARY KEY"]
+                             + [f"{name} {decl}" for name, decl in main_columns[1:]]
+                             + [f"{name} TEXT" for name in EXTRA_COLUMNS.get(table, ())])
+            conn.execute(f"CREATE TABLE {ALIAS}.{table} ({body})")
+            continue
+        for name, decl in main_columns:
+            if name not in existing:
+                conn.execute(f"ALTER TABLE {ALIAS}.{table} ADD COLUMN {name} {decl}")
+    for statement in ARCHIVE_INDEXES:
+        conn.execute(statement)
+
+
+def qualify(sql):
+    """The same SELECT over the archived tables (`bookings b`, `flights f` aliases)."""
+    return re.sub(r"\b(bookings|flights)(\s+(?:AS\s+)?[bf]\b)", rf"{ALIAS}.\1\2", sql)
+
+
+def union_archived(conn, sql):
+    """
+    `sql UNION ALL` the same SELECT over the archive. The archive only gains
+    a column the main tables got from a migration at the next archive run
+    (and a reader can't add it), so the archived side spells out `b.*`/`f.*`
+    in main order and reads a column it doesn't have yet as NULL.
+    """
+    archived = sql
+    for alias, table in (("b", "bookings"), ("f", "flights")):
+        present = {name for name, _ in _columns(conn, ALIAS, table)}
+        columns = [name for name, _ in _columns(conn, "main", table)]
+        archived = archived.replace(f"{alias}.*", ", ".join(
+            f"{alias}.{name}" if name in present else f"NULL AS {name}" for name in columns))
+        archived = re.sub(rf"\b{alias}\.(\w+)\b",
+                          lambda m: m.group(0) if m.group(1) in present else "NULL", archived)
+    return sql + " UNION ALL " + qualify(archived)
+
+
+# ------------------------------------------------------------------------------
+# Moving data
+# ------------------------------------------------------------------------------
+def _move_batch(conn, before, batch_size):
+    """
+    Copy then delete one batch of departed flights.
+    Returns (flights, bookings) moved, or None when nothing is left to move.
+    """
+    conn.execute("BEGIN IMMEDIATE;")
+    try:
+        conn.execute("DELETE FROM temp.archive_batch")
+        conn.execute("""
+            INSERT INTO temp.archive_batch (flight_id)
+            SELECT flight_id FROM main.flights WHERE date < ? ORDER BY date, flight_id LIMIT ?
+        """, (before, batch_size))
+        flights = conn.execute("SELECT COUNT(*) FROM temp.archive_batch").fetchone()[0]
+        if not flights:
+            conn.rollback()
+            return None
+        archived_at = time.strftime("%Y-%m-%d %H:%M:%S")
+        for table, link in ARCHIVED_TABLES:
+            columns = ", ".join(name for name, _ in _columns(conn, "main", table))
+            extra = EXTRA_COLUMNS.get(table, ())
+            conn.execute(f"""
+                INSERT OR REPLACE INTO {ALIAS}.{table} ({", ".join((columns,) + extra)})
+                SELECT {", ".join((columns,) + ("?",) * len(extra))} FROM main.{table}
+                WHERE {link} IN (SELECT flight_id FROM temp.archive_batch)
+            """, (archived_at,) * len(extra))
+        conn.commit()
+
+        conn.execute("BEGIN IMMEDIATE;")
+        # Only what the copy holds: a booking committed since then stays in
+        # main, and so does its flight until a later batch copies it too.
+        bookings = conn.execute("""
+            DELETE FROM main.bookings
+            WHERE flight_id IN (SELECT flight_id FROM temp.archive_batch)
+              AND booking_id IN (SELECT booking_id FROM archive.bookings
+                                 WHERE flight_id IN (SELECT flight_id FROM temp.archive_batch))
+        """).rowcount
+        conn.execute("""
+            DELETE FROM temp.archive_batch
+            WHERE flight_id IN (SELECT flight_id FROM main.bookings)
+        """)
+        conn.execute("DELETE FROM main.seat_maps WHERE flight_id IN (SELECT flight_id FROM temp.archive_batch)")
+        # the flights delete triggers keep FTS, fares and revenue summaries in step
+        flights = conn.execute(
+            "DELETE FROM main.flights WHERE flight_id IN (SELECT flight_id FROM temp.archive_batch)"
+        ).rowcount
+        conn.commit()
+        return flights, bookings
+    except sqlite3.Error:
+        conn.rollback()
+        raise
+
+
+def archive_departed(before=None, batch_size=500, on_batch=None):
+    """
+    Move flights departing before `before` (default: today) and their
+    bookings to the archive, `batch_size` flights per transaction so
+    bookings keep flowing in between. Old change_log entries are pruned
+    afterwards (see backend.change_feed).
+    Returns {"flights", "bookings", "batches", "log_pruned", "ms"}.
+    """
+    before = before or _date.today().isoformat()
+    result = {"flights": 0, "bookings": 0, "batches": 0}
+    started = time.perf_counter()
+    with pooled_connection() as conn:
+        attach(conn, create=True)
+        ensure_schema(conn)
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS archive_batch (flight_id INTEGER PRIMARY KEY)")
+        conn.commit()
+        while True:
+            moved = _move_batch(conn, before, batch_size)
+            if moved is None:
+                break
+            flights, bookings = moved
+            result["flights"] += flights
+            result["bookings"] += bookings
+            result["batches"] += 1
+            if on_batch:
+                on_batch(dict(result))
+    if result["flights"]:
+        flight_cache.clear()
+    result["log_pruned"] = change_feed.prune()
+    result["ms"] = (time.perf_counter() - started) * 1000
+    return result
+
+
+def stats():
+    """Row counts in the main tables and in the archive."""
+    with read_connection() as conn:
+        has_archive = attach(conn)
+        counts = {}
+        for table, _ in ARCHIVED_TABLES:
+            counts[f"hot_{table}"] = conn.execute(f"SELECT COUNT(*) FROM main.{table}").fetchone()[0]
+            counts[f"archived_{table}"] = (
+                conn.execute(f"SELECT COUNT(*) FROM {ALIAS}.{table}").fetchone()[0] if has_archive else 0
+            )
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Archive departed flights and their bookings")
+    parser.add_argument("--before", help="archive flights departing before this date (default: today)")
+    parser.add_argument("--batch-size", type=int, default=500, help="flights per transaction")
+    parser.add_argument("--stats", action="store_true", help="only print hot/archived row counts")
+    args = parser.parse_args(argv)
+
+    if not args.stats:
+        result = archive_departed(args.before, args.batch_size)
+        print(f"🗄️ Archived {result['flights']:,} flights and {result['bookings']:,} bookings "
+              f"in {result['batches']} batch(es), {result['ms']:,.1f} ms → {archive_path()}")
+    counts = stats()
+    print("📊 " + " | ".join(f"{name} {count:,}" for name, count in counts.items()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+# backend/async_service.py
+"""
+asyncio facade over the synchronous services.
+
+The services block on SQLite, so every call is handed to a bounded thread
+pool and awaited:
+
+    services = AsyncServices()
+    flights = await services.search_flights("Cairo", "Paris", "2025-10-25")
+
+Cancelling the awaiting task (e.g. a superseded refresh) abandons the
+result; a call that already started still finishes in its worker thread.
+"""
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+from backend.flight_service import FlightService
+from backend.booking_service import BookingService
+from backend.user_service import UserService
+
+DEFAULT_WORKERS = 4
+
+
+class AsyncServices:
+    def __init__(self, max_workers=DEFAULT_WORKERS, executor=None):
+        self._own_executor = executor is None
+        self.executor = executor or ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="backend"
+        )
+
+    async def call(self, fn, *args, **kwargs):
+        """Run any blocking callable in the backend pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, functools.partial(fn, *args, **kwargs))
+
+    def shutdown(self, wait=True):
+        if self._own_executor:
+            self.executor.shutdown(wait=wait, cancel_futures=True)
+
+    # ------------------------------------------------------------------
+    # Flights
+    # ------------------------------------------------------------------
+    async def get_all_flights(self):
+        return await self.call(FlightService.get_all_flights)
+
+    async def search_flights(self, origin, destination, date=None):
+        return await self.call(FlightService.search_flights, origin, destination, date)
+
+    async def get_flight_by_id(self, flight_id):
+        return await self.call(FlightService.get_flight_by_id, flight_id)
+
+    async def search_connections(self, origin, destination, date, **options):
+        return await self.call(FlightService.search_connections, origin, destination, date, **options)
+
+    async def get_price_calendar(self, origin, destination, date, days=3, min_seats=1):
+        return await self.call(FlightService.get_price_calendar, origin, destination, date, days, min_seats)
+
+    # ------------------------------------------------------------------
+    # Bookings
+    # ------------------------------------------------------------------
+    async def create_booking(self, user_id, flight_id, seat_count, cabin=None):
+        return await self.call(BookingService.create_booking, user_id, flight_id, seat_count, cabin)
+
+    async def cancel_booking(self, booking_id):
+        return await self.call(BookingService.cancel_booking, booking_id)
+
+    async def get_user_bookings(self, user_id):
+        return await self.call(BookingService.get_user_bookings, user_id)
+
+    async def get_user_bookings_page(self, user_id, **options):
+        return await self.call(BookingService.get_user_bookings_page, user_id, **options)
+
+    # ------------------------------------------------------------------
+    # Users
+    # ------------------------------------------------------------------
+    async def login_user(self, username, password):
+        return await self.call(UserService.login_user, username, password)
+
+    async def register_user(self, username, password, email="", is_admin=0):
+        return await self.call(UserService.register_user, username, password, email, is_admin)
+
+
+class LatestOnly:
+    """
+    Keeps at most one in-flight task per key; starting a new one cancels
+    the previous (stale) one.
+
+        latest = LatestOnly()
+        flights = await latest.run("refresh", services.get_all_flights())
+    """
+
+    def __init__(self):
+        self._tasks = {}
+
+    async def run(self, key, coro):
+        previous = self._tasks.get(key)
+        if previous is not None and not previous.done():
+            previous.cancel()
+        task = asyncio.ensure_future(coro)
+        self._tasks[key] = task
+        try:
+            return await task
+        finally:
+            if self._tasks.get(key) is task:
+                del self._tasks[key]
@@ -1,170 +1,461 @@
 # -*- coding: utf-8 -*-
 import sqlite3
 from datetime import datetime
-from backend.database import get_connection
-from backend.flight_service import FlightService
+from backend.database import pooled_connection, read_connection
+from backend import group_commit, seat_map, revenue, archive
+from backend.seat_map import SeatMapError
+from backend.cache import flight_cache
+from backend.pagination import fetch_keyset_page
+from backend.text_search import user_match_expression, BOOKING_RANK_WEIGHTS
 
 
 class BookingService:
     @staticmethod
-    def create_booking(user_id, flight_id, seat_count):
+    def create_booking(user_id, flight_id, seat_count, cabin=None):
         """
         Create a new booking.
-        - Checks available seats.
-        - Reduces flight seats.
-        - Stores booking record.
+        - Reserves seats with one conditional UPDATE (never oversells, and
+          never books a flight that has already departed).
+        - Stores booking record in the same short transaction.
+        - On flights with a seat map, assigns seat numbers (adjacent when
+          possible), optionally within one `cabin`.
+        - In split mode (backend.group_commit) the transaction is shared
+          with other queued writes; this returns once it is committed.
         Returns: dict (booking info) or None if failed.
         """
-        conn = get_connection()
-        cursor = conn.cursor()
+        if seat_count <= 0:
+            print("❌ Seat count must be positive.")
+            return None
 
+        before = flight_cache.write_token()
         try:
-            flight = FlightService.get_flight_by_id(flight_id)
-            if not flight:
-                print("❌ Flight not found.")
-                return None
-
-            available = flight["available_seats"]
-            if seat_count > available:
-                print(f"❌ Not enough seats. Available: {available}")
-                return None
-
-            total_price = seat_count * flight["price"]
-            booking_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            writer = group_commit.active_writer()
+            if writer is not None:
+                booking = writer.execute(BookingService._book_seats, user_id, flight_id, seat_count, cabin)
+            else:
+                with pooled_connection() as conn:
+                    # IMMEDIATE takes the write lock up front, so concurrent
+                    # bookers queue on busy_timeout instead of deadlocking.
+                    conn.execute("BEGIN IMMEDIATE;")
+                    booking = BookingService._book_seats(conn, user_id, flight_id, seat_count, cabin)
+                    conn.commit()
+        except SeatMapError as e:
+            print(f"❌ {e}")
+            return None
+        except sqlite3.Error as e:
+            print(f"❌ Database error: {e}")
+            return None
 
-            cursor.execute("BEGIN TRANSACTION;")
+        if booking is None:
+            return None
+        flight_cache.invalidate_flight(flight_id, before=before)
+        print("✅ Booking created successfully.")
+        return booking
 
-            cursor.execute("""
-                INSERT INTO bookings (user_id, flight_id, seat_count, booking_date, total_price)
-                VALUES (?, ?, ?, ?, ?)
-            """, (user_id, flight_id, seat_count, booking_date, total_price))
+    @staticmethod
+    def _book_seats(conn, user_id, flight_id, seat_count, cabin=None):
+        """Reserve seats and insert the booking inside the caller's transaction."""
+        # Pick seat numbers first (read only), so a full cabin writes nothing
+        chosen = seat_map.choose(conn, flight_id, seat_count, cabin)
+        if chosen is None:
+            print(f"❌ Not enough free seats{f' in cabin {cabin}' if cabin else ''}.")
+            return None
+        seats, occupied = chosen
 
-            # Update flight seat count
-            new_available = available - seat_count
-            cursor.execute("""
-                UPDATE flights
-                SET available_seats = ?
-                WHERE flight_id = ?
-            """, (new_available, flight_id))
+        reserved = conn.execute("""
+            UPDATE flights
+            SET available_seats = available_seats - ?
+            WHERE flight_id = ? AND available_seats >= ? AND date || ' ' || time > ?
+            RETURNING price
+        """, (seat_count, flight_id, seat_count, BookingService._now())).fetchone()
 
-            conn.commit()
+        if reserved is None:
+            BookingService._report_unavailable(conn, flight_id)
+            return None
+        if occupied is not None:
+            seat_map.store(conn, flight_id, occupied)
 
-            booking_id = cursor.lastrowid
-            cursor.execute("SELECT * FROM bookings WHERE booking_id = ?", (booking_id,))
-            booking = cursor.fetchone()
+        total_price = seat_count * reserved["price"]
+        booking_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-            print("✅ Booking created successfully.")
-            return dict(booking)
+        booking = conn.execute("""
+            INSERT INTO bookings (user_id, flight_id, seat_count, booking_date, total_price, seats)
+            VALUES (?, ?, ?, ?, ?, ?)
+            RETURNING *
+        """, (user_id, flight_id, seat_count, booking_date, total_price, " ".join(seats) or None)).fetchone()
+        revenue.record(conn, flight_id, 1, seat_count, total_price)
+        return dict(booking)
 
-        except sqlite3.Error as e:
-            conn.rollback()
-            print(f"❌ Database error: {e}")
-            return None
+    @staticmethod
+    def _now():
+        """Current local time in the flights' `date || ' ' || time` form."""
+        return datetime.now().strftime("%Y-%m-%d %H:%M")
 
-        finally:
-            conn.close()
+    @staticmethod
+    def _report_unavailable(conn, flight_id):
+        """Explain why a reservation failed (only runs on the failure path)."""
+        row = conn.execute(
+            "SELECT available_seats, date || ' ' || time AS departure FROM flights WHERE flight_id = ?", (flight_id,)
+        ).fetchone()
+        if row is None:
+            print("❌ Flight not found.")
+        elif row["departure"] <= BookingService._now():
+            print("❌ Flight has already departed.")
+        elif row["available_seats"] == 0:
+            print("❌ Sold out.")
+        else:
+            print(f"❌ Not enough seats. Available: {row['available_seats']}")
 
     # --------------------------------------------------------------------------
     @staticmethod
-    def cancel_booking(booking_id):
+    def create_bookings_batch(requests, all_or_nothing=True):
         """
-        Cancel a booking and restore seat count.
+        Book many (user_id, flight_id, seat_count) requests in ONE transaction.
+        - `requests` items are dicts with those keys or 3-tuples.
+        - Seats are checked once per flight for the grouped demand.
+        - all_or_nothing=True: any failure rolls the whole batch back.
+        - all_or_nothing=False: each item is granted in order while seats last.
+        - In split mode (backend.group_commit) it runs on the writer thread.
+        Returns a list of {"status", "booking"} dicts in request order, where
+        status is "booked", "sold_out", "not_found", "departed", "invalid"
+        or "aborted".
         """
-        conn = get_connection()
-        cursor = conn.cursor()
+        items = []
+        for req in requests:
+            if isinstance(req, dict):
+                items.append((req["user_id"], req["flight_id"], req["seat_count"]))
+            else:
+                items.append(tuple(req))
+        if not items:
+            return []
 
+        before = flight_cache.write_token()
         try:
-            cursor.execute("SELECT * FROM bookings WHERE booking_id = ?", (booking_id,))
-            booking = cursor.fetchone()
+            writer = group_commit.active_writer()
+            if writer is not None:
+                results, taken = writer.execute(BookingService._book_batch, items, all_or_nothing)
+            else:
+                with pooled_connection() as conn:
+                    conn.execute("BEGIN IMMEDIATE;")
+                    results, taken = BookingService._book_batch(conn, items, all_or_nothing)
+                    conn.commit()
+        except sqlite3.Error as e:
+            print(f"❌ Database error during batch booking: {e}")
+            return [{"status": "aborted", "booking": None} for _ in items]
+
+        if taken is None:
+            print(f"❌ Batch rejected: {sum(r['status'] != 'aborted' for r in results)} item(s) failed.")
+            return results
+        flight_cache.invalidate_flights(taken, before=before)
+        booked = sum(r["status"] == "booked" for r in results)
+        print(f"✅ Batch booked {booked}/{len(items)} request(s).")
+        return results
 
-            if not booking:
-                print("❌ Booking not found.")
-                return False
+    @staticmethod
+    def _book_batch(conn, items, all_or_nothing):
+        """
+        Body of create_bookings_batch inside the caller's write transaction.
+        Returns (results, seats taken per flight), or (results, None) when an
+        all_or_nothing batch is rejected before anything was written.
+        """
+        results = [{"status": None, "booking": None} for _ in items]
+        flight_ids = sorted({flight_id for _, flight_id, _ in items})
 
-            flight_id = booking["flight_id"]
-            seat_count = booking["seat_count"]
+        # Holding the write lock, one read of every involved flight is stable.
+        placeholders = ",".join("?" * len(flight_ids))
+        inventory = {
+            row["flight_id"]: [row["available_seats"], row["price"], row["departure"]]
+            for row in conn.execute(
+                f"SELECT flight_id, available_seats, price, date || ' ' || time AS departure "
+                f"FROM flights WHERE flight_id IN ({placeholders})",
+                flight_ids,
+            )
+        }
+        now = BookingService._now()
 
-            cursor.execute("BEGIN TRANSACTION;")
+        taken = {}
+        for i, (_, flight_id, seat_count) in enumerate(items):
+            flight = inventory.get(flight_id)
+            if seat_count <= 0:
+                results[i]["status"] = "invalid"
+            elif flight is None:
+                results[i]["status"] = "not_found"
+            elif flight[2] <= now:
+                results[i]["status"] = "departed"
+            elif seat_count > flight[0]:
+                results[i]["status"] = "sold_out"
+            else:
+                flight[0] -= seat_count
+                taken[flight_id] = taken.get(flight_id, 0) + seat_count
+                results[i]["status"] = "booked"
 
-            # Restore seats
-            cursor.execute("""
-                UPDATE flights
-                SET available_seats = available_seats + ?
-                WHERE flight_id = ?
-            """, (seat_count, flight_id))
+        failed = any(r["status"] != "booked" for r in results)
+        if all_or_nothing and failed:
+            for r in results:
+                if r["status"] == "booked":
+                    r["status"] = "aborted"
+            return results, None
 
-            # Delete booking
-            cursor.execute("DELETE FROM bookings WHERE booking_id = ?", (booking_id,))
+        # One guarded decrement per flight for its whole demand
+        conn.executemany("""
+            UPDATE flights
+            SET available_seats = available_seats - ?
+            WHERE flight_id = ? AND available_seats >= ?
+        """, [(seats, flight_id, seats) for flight_id, seats in taken.items()])
 
-            conn.commit()
-            print(f"✅ Booking {booking_id} canceled successfully.")
-            return True
+        booking_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        sold = {}
+        for i, (user_id, flight_id, seat_count) in enumerate(items):
+            if results[i]["status"] != "booked":
+                continue
+            total_price = seat_count * inventory[flight_id][1]
+            chosen = seat_map.choose(conn, flight_id, seat_count)
+            if chosen is None:
+                # only if the map disagrees with available_seats
+                raise sqlite3.IntegrityError(f"Seat map of flight {flight_id} has too few free seats")
+            seats, occupied = chosen
+            if occupied is not None:
+                seat_map.store(conn, flight_id, occupied)
+            row = conn.execute("""
+                INSERT INTO bookings (user_id, flight_id, seat_count, booking_date, total_price, seats)
+                VALUES (?, ?, ?, ?, ?, ?)
+                RETURNING *
+            """, (user_id, flight_id, seat_count, booking_date, total_price, " ".join(seats) or None)).fetchone()
+            results[i]["booking"] = dict(row)
+            count, seats_sold, amount = sold.get(flight_id, (0, 0, 0.0))
+            sold[flight_id] = (count + 1, seats_sold + seat_count, amount + total_price)
+        for flight_id, (count, seats_sold, amount) in sold.items():
+            revenue.record(conn, flight_id, count, seats_sold, amount)
+        return results, taken
 
+    # --------------------------------------------------------------------------
+    @staticmethod
+    def cancel_booking(booking_id):
+        """
+        Cancel a booking and restore seat count.
+        """
+        before = flight_cache.write_token()
+        try:
+            writer = group_commit.active_writer()
+            if writer is not None:
+                flight_id = writer.execute(BookingService._release_seats, booking_id)
+            else:
+                with pooled_connection() as conn:
+                    conn.execute("BEGIN IMMEDIATE;")
+                    flight_id = BookingService._release_seats(conn, booking_id)
+                    conn.commit()
+        except SeatMapError as e:
+            # stored seats don't fit the map: the delete is rolled back with the rest
+            print(f"❌ {e}")
+            return False
         except sqlite3.Error as e:
-            conn.rollback()
             print(f"❌ Database error during cancellation: {e}")
             return False
 
-        finally:
-            conn.close()
+        if flight_id is None:
+            print("❌ Booking not found.")
+            return False
+        flight_cache.invalidate_flight(flight_id, before=before)
+        print(f"✅ Booking {booking_id} canceled successfully.")
+        return True
+
+    @staticmethod
+    def _release_seats(conn, booking_id):
+        """Delete the booking and give its seats back; returns its flight_id or None."""
+        booking = conn.execute(
+            "DELETE FROM bookings WHERE booking_id = ? RETURNING flight_id, seat_count, total_price, seats", (booking_id,)
+        ).fetchone()
+        if booking is None:
+            return None
+        revenue.record(conn, booking["flight_id"], -1, -booking["seat_count"], -booking["total_price"])
+        if booking["seats"]:
+            seat_map.release(conn, booking["flight_id"], booking["seats"].split())
+        conn.execute("""
+            UPDATE flights
+            SET available_seats = available_seats + ?
+            WHERE flight_id = ?
+        """, (booking["seat_count"], booking["flight_id"]))
+        return booking["flight_id"]
+
+    @staticmethod
+    def get_booking(booking_id):
+        """Returns the booking row as a dict, or None."""
+        with read_connection() as conn:
+            row = conn.execute("SELECT * FROM bookings WHERE booking_id = ?", (booking_id,)).fetchone()
+        return dict(row) if row else None
 
     # --------------------------------------------------------------------------
+    USER_BOOKINGS_SELECT = """
+        SELECT 
+            b.booking_id,
+            b.flight_id,
+            b.seat_count,
+            b.booking_date,
+            b.total_price,
+            b.seats,
+            f.flight_number,
+            f.origin AS from_city,
+            f.destination AS to_city,
+            f.date AS flight_date,
+            f.time AS flight_time
+        FROM bookings b
+        JOIN flights f ON b.flight_id = f.flight_id
+    """
+
+    ALL_BOOKINGS_SELECT = """
+        SELECT b.*, u.username, f.flight_number, f.origin, f.destination, f.date, f.time
+        FROM bookings b
+        JOIN users u ON b.user_id = u.user_id
+        JOIN flights f ON b.flight_id = f.flight_id
+    """
+
     @staticmethod
-    def get_user_bookings(user_id):
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT 
-                b.booking_id,
-                b.flight_id,
-                b.seat_count,
-                b.booking_date,
-                b.total_price,
-                f.flight_number,
-                f.origin AS from_city,
-                f.destination AS to_city,
-                f.date AS flight_date,
-                f.time AS flight_time
-            FROM bookings b
-            JOIN flights f ON b.flight_id = f.flight_id
-            WHERE b.user_id = ?
-            ORDER BY f.date ASC
-        """, (user_id,))
-        rows = cursor.fetchall()
-        conn.close()
-
-        bookings = []
-        for row in rows:
-            bookings.append({
-                "booking_id": row["booking_id"],
-                "flight_id": row["flight_id"],
-                "seat_count": row["seat_count"],
-                "booking_date": row["booking_date"],
-                "total_price": row["total_price"],
-                "flight_number": row["flight_number"],
-                "from_city": row["from_city"],
-                "to_city": row["to_city"],
-                "flight_date": row["flight_date"],
-                "flight_time": row["flight_time"]
-            })
-        return bookings
+    def get_user_bookings(user_id, include_archived=False):
+        """A user's bookings by flight date; include_archived adds departed flights (backend.archive)."""
+        sql = BookingService.USER_BOOKINGS_SELECT + " WHERE b.user_id = ?"
+        with read_connection() as conn:
+            if include_archived and archive.attach(conn):
+                rows = conn.execute(
+                    archive.union_archived(conn, sql) + " ORDER BY flight_date ASC", (user_id, user_id)
+                ).fetchall()
+            else:
+                rows = conn.execute(sql + " ORDER BY f.date ASC", (user_id,)).fetchall()
+        return [dict(row) for row in rows]
+
+    @staticmethod
+    def get_user_bookings_page(user_id, cursor=None, page_size=5, search=None,
+                               upcoming_only=False, with_total=False):
+        """
+        One page of a user's bookings, ordered by flight date/time.
+        Pass the returned "next_cursor"/"prev_cursor" back as `cursor` to move.
+        Returns {"items", "next_cursor", "prev_cursor", "total"}.
+        """
+        filters = ["b.user_id = ?"]
+        params = [user_id]
+        match = user_match_expression(user_id, search) if search else None
+        if match:
+            # FTS5 prefix match (see backend.text_search), not a LIKE scan. The
+            # owner term already limits it to this user, so drop the user_id
+            # filter: the plan then starts from the matches instead of walking
+            # the user's whole history.
+            filters = ["b.booking_id IN (SELECT rowid FROM bookings_fts WHERE bookings_fts MATCH ?)"]
+            params = [match]
+        if upcoming_only:
+            filters.append("f.date >= date('now', 'localtime')")
+
+        with read_connection() as conn:
+            page = fetch_keyset_page(
+                conn, BookingService.USER_BOOKINGS_SELECT, filters, params,
+                order_cols=("f.date", "f.time", "b.booking_id"),
+                row_key=lambda row: (row["flight_date"], row["flight_time"], row["booking_id"]),
+                descending=False, cursor=cursor, page_size=page_size,
+            )
+            if with_total and match and not upcoming_only:
+                page["total"] = conn.execute(
+                    "SELECT COUNT(*) FROM bookings_fts WHERE bookings_fts MATCH ?", (match,)
+                ).fetchone()[0]
+            elif with_total:
+                page["total"] = conn.execute(
+                    "SELECT COUNT(*) FROM bookings b JOIN flights f ON b.flight_id = f.flight_id WHERE "
+                    + " AND ".join(filters),
+                    params,
+                ).fetchone()[0]
+        return page
+
+    @staticmethod
+    def search_user_bookings(user_id, query, limit=50):
+        """
+        A user's bookings whose flight number, origin or destination match
+        `query` (prefix words, all required), best match first.
+        """
+        match = user_match_expression(user_id, query)
+        if match is None:
+            return []
+        weights = ", ".join(str(w) for w in BOOKING_RANK_WEIGHTS)
+        with read_connection() as conn:
+            rows = conn.execute(f"""
+                SELECT b.booking_id, b.flight_id, b.seat_count, b.booking_date, b.total_price,
+                       f.flight_number, f.origin AS from_city, f.destination AS to_city,
+                       f.date AS flight_date, f.time AS flight_time
+                FROM bookings_fts
+                JOIN bookings b ON b.booking_id = bookings_fts.rowid
+                JOIN flights f ON f.flight_id = b.flight_id
+                WHERE bookings_fts MATCH ?
+                ORDER BY bm25(bookings_fts, {weights}), f.date, f.time
+                LIMIT ?
+            """, (match, limit)).fetchall()
+        return [dict(row) for row in rows]
 
 
     # --------------------------------------------------------------------------
     @staticmethod
-    def get_all_bookings():
-        """Return all bookings (admin)."""
-        conn = get_connection()
-        cursor = conn.cursor()
-        try:
-            cursor.execute("""
-                SELECT b.*, u.username, f.flight_number, f.origin, f.destination, f.date, f.time
-                FROM bookings b
-                JOIN users u ON b.user_id = u.user_id
-                JOIN flights f ON b.flight_id = f.flight_id
-                ORDER BY b.booking_date DESC
-            """)
-            bookings = cursor.fetchall()
-            return [dict(row) for row in bookings]
-        finally:
-            conn.close()
+    def get_all_bookings(include_archived=False):
+        """Return all bookings (admin); include_archived adds departed flights (backend.archive)."""
+        sql = BookingService.ALL_BOOKINGS_SELECT
+        with read_connection() as conn:
+            if include_archived and archive.attach(conn):
+                bookings = conn.execute(
+                    archive.union_archived(conn, sql) + " ORDER BY booking_date DESC"
+                ).fetchall()
+            else:
+                bookings = conn.execute(sql + " ORDER BY b.booking_date DESC").fetchall()
+        return [dict(row) for row in bookings]
+
+    @staticmethod
+    def get_all_bookings_page(cursor=None, page_size=50, with_total=False):
+        """
+        One page of all bookings (admin), newest booking first.
+        Returns {"items", "next_cursor", "prev_cursor", "total"}.
+        """
+        with read_connection() as conn:
+            page = fetch_keyset_page(
+                conn, BookingService.ALL_BOOKINGS_SELECT, [], [],
+                order_cols=("b.booking_date", "b.booking_id"),
+                row_key=lambda row: (row["booking_date"], row["booking_id"]),
+                descending=True, cursor=cursor, page_size=page_size,
+            )
+            if with_total:
+                # Cheap count straight off the bookings table
+                page["total"] = conn.execute("SELECT COUNT(*) FROM bookings").fetchone()[0]
+        return page
+
+    @staticmethod
+    def iter_bookings(start_date=None, end_date=None, origin=None, destination=None, batch_size=1000):
+        """
+        Stream the booking ledger (as sqlite3.Row) using fetchmany batches.
+        Dates are inclusive YYYY-MM-DD bounds on booking_date; origin and
+        destination filter on the booked flight's route.
+        """
+        filters, params = [], []
+        if start_date:
+            filters.append("b.booking_date >= ?")
+            params.append(start_date)
+        if end_date:
+            filters.append("b.booking_date < date(?, '+1 day')")
+            params.append(end_date)
+        if origin:
+            filters.append("f.origin = ?")
+            params.append(origin)
+        if destination:
+            filters.append("f.destination = ?")
+            params.append(destination)
+
+        sql = """
+            SELECT b.booking_id, b.user_id, u.username, b.flight_id, f.flight_number,
+                   f.origin, f.destination, f.date, f.time,
+                   b.seat_count, b.booking_date, b.total_price
+            FROM bookings b
+            JOIN users u ON b.user_id = u.user_id
+            JOIN flights f ON b.flight_id = f.flight_id
+        """
+        if filters:
+            sql += " WHERE " + " AND ".join(filters)
+        sql += " ORDER BY b.booking_date, b.booking_id"
+
+        with read_connection() as conn:
+            cursor = conn.execute(sql, params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield from rows
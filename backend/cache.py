@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+# backend/cache.py
+"""
+Bounded LRU + TTL caches for flight lookups.
+
+`flight_cache` holds two caches:
+- search results keyed on (origin, destination, date)
+- single flights keyed on flight_id
+
+Writes made through the services invalidate exactly the affected entries.
+Writes made by other processes are detected with `PRAGMA data_version` on a
+dedicated watcher connection, which drops everything; TTL bounds staleness
+for anything that slips between the two. A service takes write_token()
+before it writes and passes it to the invalidation, so an external commit
+that landed before its own write is not mistaken for it:
+
+    before = flight_cache.write_token()
+    ... commit ...
+    flight_cache.invalidate_flight(flight_id, before=before)
+"""
+import time
+import threading
+from collections import OrderedDict
+
+from backend.database import DataVersionWatcher
+
+SEARCH_CACHE_SIZE = 2048
+FLIGHT_CACHE_SIZE = 8192
+CACHE_TTL_SECONDS = 30.0
+
+
+class LRUTTLCache:
+    """Thread-safe LRU cache whose entries also expire after `ttl` seconds."""
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = self.expirations = self.invalidations = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            if entry[0] < time.monotonic():
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key):
+        with self._lock:
+            if self._data.pop(key, None) is not None:
+                self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self.invalidations += len(self._data)
+            self._data.clear()
+
+    def keys(self):
+        with self._lock:
+            return list(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
+
+
+class FlightCache:
+    """Search + by-id caches with precise, route/flight-aware invalidation."""
+
+    def __init__(self, search_size=SEARCH_CACHE_SIZE, flight_size=FLIGHT_CACHE_SIZE, ttl=CACHE_TTL_SECONDS):
+        self.enabled = True
+        self.searches = LRUTTLCache(search_size, ttl)
+        self.flights = LRUTTLCache(flight_size, ttl)
+        self._lock = threading.Lock()
+        self._keys_by_flight = {}   # flight_id -> search keys whose result contains it
+        self._watcher = DataVersionWatcher()
+        self._data_version = None
+        self.external_changes = 0
+        # Bumped by every invalidation; a result read from the DB is only
+        # cached if no invalidation happened while it was being read.
+        self.generation = 0
+
+    # ------------------------------------------------------------------
+    # Cross-process staleness
+    # ------------------------------------------------------------------
+    def _sync(self):
+        """Drop everything if someone else committed since we last looked."""
+        with self._lock:
+            version = self._watcher.current()
+            if self._data_version is not None and version != self._data_version:
+                self.external_changes += 1
+                self._clear_locked()
+            self._data_version = version
+
+    def write_token(self):
+        """The data_version before a local write; hand it to the invalidation after the commit."""
+        with self._lock:
+            return self._watcher.current()
+
+    def note_local_write(self, before=None):
+        """
+        Accept the current data_version after a write we invalidated ourselves.
+        If it had already moved before that write (`before` differs from what
+        we last saw, or no token was given), someone else committed in between
+        and only dropping everything is safe.
+        """
+        with self._lock:
+            if self._data_version is not None and (before is None or before != self._data_version):
+                self.external_changes += 1
+                self._clear_locked()
+            self._data_version = self._watcher.current()
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+    def get_search(self, origin, destination, date):
+        if not self.enabled:
+            return None
+        self._sync()
+        return self.searches.get((origin, destination, date))
+
+    def put_search(self, origin, destination, date, flights, generation):
+        if not self.enabled:
+            return
+        key = (origin, destination, date)
+        with self._lock:
+            if generation != self.generation:
+                return
+            if len(self._keys_by_flight) > 16 * self.searches.maxsize:
+                self._prune_reverse_index()
+            for flight in flights:
+                self._keys_by_flight.setdefault(flight["flight_id"], set()).add(key)
+            self.searches.put(key, flights)
+
+    def _prune_reverse_index(self):
+        """Forget reverse entries for searches that were evicted or expired."""
+        live = set(self.searches.keys())
+        self._keys_by_flight = {
+            flight_id: keys & live
+            for flight_id, keys in self._keys_by_flight.items()
+            if keys & live
+        }
+
+    def get_flight(self, flight_id):
+        if not self.enabled:
+            return None
+        self._sync()
+        return self.flights.get(flight_id)
+
+    def put_flight(self, flight_id, flight, generation):
+        if not self.enabled:
+            return
+        with self._lock:
+            if generation == self.generation:
+                self.flights.put(flight_id, flight)
+
+    # ------------------------------------------------------------------
+    # Invalidation
+    # ------------------------------------------------------------------
+    def invalidate_flight(self, flight_id, before=None):
+        """A flight's row changed (seats, price...): drop it and searches showing it."""
+        self.invalidate_flights((flight_id,), before)
+
+    def invalidate_flights(self, flight_ids, before=None):
+        """invalidate_flight for every flight one write touched."""
+        keys = set()
+        with self._lock:
+            self.generation += 1
+            for flight_id in flight_ids:
+                self.flights.invalidate(flight_id)
+                keys.update(self._keys_by_flight.pop(flight_id, ()))
+        for key in keys:
+            self.searches.invalidate(key)
+        self.note_local_write(before)
+
+    def invalidate_route(self, origin, destination, date=None, before=None):
+        """A flight was added on a route: drop that day's and the any-date search."""
+        with self._lock:
+            self.generation += 1
+        self.searches.invalidate((origin, destination, date))
+        self.searches.invalidate((origin, destination, None))
+        self.note_local_write(before)
+
+    def _clear_locked(self):
+        self.generation += 1
+        self.searches.clear()
+        self.flights.clear()
+        self._keys_by_flight.clear()
+
+    def clear(self):
+        with self._lock:
+            self._clear_locked()
+            self._data_version = self._watcher.current()
+
+    def close(self):
+        """Drop everything and release the watcher connection (database.close_pool() does this too)."""
+        self.clear()
+        self._watcher.close()
+        with self._lock:
+            self._data_version = None
+
+    def stats(self):
+        return {
+            "enabled": self.enabled,
+            "search": self.searches.stats(),
+            "flight": self.flights.stats(),
+            "external_changes": self.external_changes,
+        }
+
+
+flight_cache = FlightCache()
+
+
+def cache_stats():
+    """Hit/miss/eviction counters for the flight caches."""
+    return flight_cache.stats()
@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+# backend/change_feed.py
+"""
+Change notifications for live views, read from `change_log`.
+
+Triggers on flights (migration 6) and bookings (migration 15) append one
+entry per written row. A ChangeFeed remembers the last change_id it has
+seen; poll() returns only what changed since then, folded to one op per row,
+plus the current flights rows for those that were inserted or updated — so a
+page patches the rows it shows instead of reloading, and the cost of a
+refresh follows the number of changes rather than the size of the tables.
+
+    feed = ChangeFeed(user_id=user["user_id"])   # bookings: this user's only
+    feed.start()
+    ...
+    changes = feed.poll()
+    # {"cursor", "reset", "flights": {id: op}, "bookings": {id: op}, "flight_rows": {id: row}}
+
+"reset" means the feed cannot describe the gap as a diff (too many changes,
+or prune() dropped entries it had not read yet): reload everything.
+prune() runs at startup and hourly from ui.change_poller.ChangePoller and
+backend.api_server.ApiServer, and after every backend.archive run, keeping
+RETENTION_HOURS of history.
+
+    python -m backend.change_feed stats
+    python -m backend.change_feed watch [--user-id 3] [--interval 1]
+    python -m backend.change_feed prune [--hours 24]
+"""
+import sys
+import time
+import argparse
+
+from backend.database import pooled_connection, read_connection, DataVersionWatcher
+
+# More pending entries than this and poll() reports a reset instead of a diff
+MAX_CHANGES = 5000
+
+# Entries older than this are dropped by prune()
+RETENTION_HOURS = 24
+
+
+# ------------------------------------------------------------------------------
+# Log position
+# ------------------------------------------------------------------------------
+def latest_change_id(conn):
+    return conn.execute("SELECT COALESCE(MAX(change_id), 0) FROM change_log").fetchone()[0]
+
+
+def pruned_past(conn, cursor):
+    """True if prune() removed entries newer than `cursor`, so a reader there missed changes."""
+    oldest = conn.execute("SELECT MIN(change_id) FROM change_log").fetchone()[0]
+    return oldest is not None and oldest > cursor + 1
+
+
+def _fold(ops, row_id, op):
+    """Merge one more op for a row: I+U is still I, I+D cancels out, D+I (reused id) is U."""
+    first = ops.get(row_id)
+    if first is None:
+        ops[row_id] = op
+    elif first == "I":
+        if op == "D":
+            del ops[row_id]
+    else:
+        ops[row_id] = "U" if op == "I" else op
+
+
+# ------------------------------------------------------------------------------
+# Feed
+# ------------------------------------------------------------------------------
+class ChangeFeed:
+    def __init__(self, user_id=None, max_changes=MAX_CHANGES):
+        self.user_id = user_id          # None: bookings of every user
+        self.max_changes = max_changes
+        self.cursor = None              # last change_id reported
+        self._watcher = DataVersionWatcher()
+        self._data_version = None
+        self.stats = {"polls": 0, "idle": 0, "entries": 0, "resets": 0, "last_poll_ms": 0.0}
+
+    def start(self):
+        """Begin at the current end of the log; only later changes are reported."""
+        version = self._watcher.current()
+        with read_connection() as conn:
+            self.cursor = latest_change_id(conn)
+        self._data_version = version
+        return self.cursor
+
+    def close(self):
+        """Release the data_version watcher connection (a later poll reopens it)."""
+        self._watcher.close()
+        self._data_version = None
+
+    def _result(self, reset=False, flights=None, bookings=None, flight_rows=None):
+        return {"cursor": self.cursor, "reset": reset, "flights": flights or {},
+                "bookings": bookings or {}, "flight_rows": flight_rows or {}}
+
+    def poll(self):
+        """What changed since the previous poll (see the module docstring)."""
+        if self.cursor is None:
+            self.start()
+            return self._result()
+        self.stats["polls"] += 1
+        version = self._watcher.current()
+        if version == self._data_version:
+            # nothing committed anywhere: no query at all
+            self.stats["idle"] += 1
+            return self._result()
+
+        started = time.perf_counter()
+        flights, bookings, flight_rows = {}, {}, {}
+        with read_connection() as conn:
+            conn.execute("BEGIN;")  # one snapshot for the entries and the rows
+            latest = latest_change_id(conn)
+            reset = latest - self.cursor > self.max_changes or pruned_past(conn, self.cursor)
+            if not reset and latest > self.cursor:
+                entries = conn.execute("""
+                    SELECT table_name, row_id, op FROM change_log
+                    WHERE change_id > ? AND change_id <= ?
+                      AND (table_name = 'flights' OR ? IS NULL OR user_id = ?)
+                    ORDER BY change_id
+                """, (self.cursor, latest, self.user_id, self.user_id)).fetchall()
+                for table_name, row_id, op in entries:
+                    _fold(flights if table_name == "flights" else bookings, row_id, op)
+                self.stats["entries"] += len(entries)
+
+                changed_ids = [flight_id for flight_id, op in flights.items() if op != "D"]
+                for start in range(0, len(changed_ids), 500):
+                    chunk = changed_ids[start:start + 500]
+                    placeholders = ",".join("?" * len(chunk))
+                    for row in conn.execute(f"SELECT * FROM flights WHERE flight_id IN ({placeholders})", chunk):
+                        flight_rows[row["flight_id"]] = dict(row)
+            conn.rollback()
+
+        self.cursor = latest
+        self._data_version = version
+        self.stats["resets"] += reset
+        self.stats["last_poll_ms"] = (time.perf_counter() - started) * 1000
+        if reset:
+            return self._result(reset=True)
+        return self._result(flights=flights, bookings=bookings, flight_rows=flight_rows)
+
+
+# ------------------------------------------------------------------------------
+# Maintenance
+# ------------------------------------------------------------------------------
+def prune(hours=RETENTION_HOURS):
+    """
+    Drop entries older than `hours` (the newest entry is always kept).
+    Readers still positioned before the cut see pruned_past() and reload.
+    Returns the number of entries removed.
+    """
+    with pooled_connection() as conn:
+        # change_id grows with changed_at: find the newest old entry from the top
+        cutoff = conn.execute("""
+            SELECT change_id FROM change_log
+            WHERE changed_at < strftime('%Y-%m-%d %H:%M:%f', 'now', ?)
+            ORDER BY change_id DESC LIMIT 1
+        """, (f"-{hours} hours",)).fetchone()
+        if cutoff is None:
+            return 0
+        removed = conn.execute("""
+            DELETE FROM change_log
+            WHERE change_id <= ? AND change_id < (SELECT MAX(change_id) FROM change_log)
+        """, (cutoff[0],)).rowcount
+        conn.commit()
+    return removed
+
+
+def stats():
+    """Entries per table and the id/time range still in the log."""
+    with read_connection() as conn:
+        row = conn.execute("""
+            SELECT COUNT(*), MIN(change_id), MAX(change_id), MIN(changed_at), MAX(changed_at) FROM change_log
+        """).fetchone()
+        tables = dict(conn.execute("SELECT table_name, COUNT(*) FROM change_log GROUP BY table_name").fetchall())
+    return {"entries": row[0], "first_id": row[1], "last_id": row[2],
+            "oldest": row[3], "newest": row[4], "tables": tables}
+
+
+# ------------------------------------------------------------------------------
+# CLI
+# ------------------------------------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Change log for live views")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("stats", help="entries still in the log")
+    watch = sub.add_parser("watch", help="print changes as they are committed")
+    watch.add_argument("--user-id", type=int, default=None)
+    watch.add_argument("--interval", type=float, default=1.0)
+    trim = sub.add_parser("prune", help="drop old entries")
+    trim.add_argument("--hours", type=float, default=RETENTION_HOURS)
+    args = parser.parse_args(argv)
+
+    if args.command == "prune":
+        print(f"🧹 Removed {prune(args.hours):,} change log entries older than {args.hours:g} h")
+        return 0
+    if args.command == "stats":
+        info = stats()
+        print(f"📜 {info['entries']:,} entries (ids {info['first_id']}–{info['last_id']}, "
+              f"{info['oldest']} → {info['newest']}): "
+              + ", ".join(f"{table} {count:,}" for table, count in info["tables"].items()))
+        return 0
+
+    feed = ChangeFeed(user_id=args.user_id)
+    print(f"👀 Watching from change {feed.start()} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(args.interval)
+            changes = feed.poll()
+            if changes["reset"]:
+                print(f"🔄 Reset at change {changes['cursor']}: reload everything")
+            for table in ("flights", "bookings"):
+                for row_id, op in changes[table].items():
+                    print(f"  {op} {table} {row_id}")
+    except KeyboardInterrupt:
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,62 +1,300 @@
 # -*- coding: utf-8 -*-
 # backend/database.py
+import os
 import sqlite3
+import weakref
+import threading
+from contextlib import contextmanager
 
 DB_NAME = "al_kawthar_flights.db"
 
-def get_connection():
-    """Create and return a new database connection."""
-    conn = sqlite3.connect(DB_NAME)
-    conn.row_factory = sqlite3.Row  # allows dictionary-like access
+# Pragmas applied once to every pooled connection.
+# WAL lets readers run while a booking is being written, NORMAL sync is
+# durable across app crashes in WAL mode, and the cache/mmap sizes keep
+# the hot pages of flights/bookings in memory.
+PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "cache_size": -16000,        # ~16 MB page cache (negative = KiB)
+    "mmap_size": 64 * 1024 * 1024,
+    "busy_timeout": 5000,        # ms to wait on a locked database
+    "temp_store": "MEMORY",
+}
+STATEMENT_CACHE_SIZE = 256     # prepared statements kept per connection
+POOL_MAX_SIZE = 8              # max open connections per process
+
+# Statement tracer installed by backend.metrics while instrumentation is on;
+# None otherwise, so an uninstrumented checkout pays one global lookup.
+connection_tracer = None
+
+# Set by backend.group_commit.enable(): read_connection() then hands out
+# query_only connections from a pool of their own, and bookings/cancellations
+# go to the single writer thread instead of the shared pool.
+split_reads = False
+
+
+def _open_tuned_connection(db_name, read_only=False):
+    """Open a connection with the production pragmas applied."""
+    conn = sqlite3.connect(
+        db_name,
+        timeout=PRAGMAS["busy_timeout"] / 1000,
+        check_same_thread=False,  # the pool hands it to one thread at a time
+        cached_statements=STATEMENT_CACHE_SIZE,
+    )
+    conn.row_factory = sqlite3.Row
+    for name, value in PRAGMAS.items():
+        conn.execute(f"PRAGMA {name} = {value}")
+    if read_only:
+        conn.execute("PRAGMA query_only = ON")
     return conn
 
 
+class ConnectionPool:
+    """
+    Keeps warm SQLite connections around instead of connecting per call.
+    - Each thread gets back the connection it used last (statement cache stays hot).
+    - Idle connections of other threads are reused before opening new ones.
+    - At most `max_size` connections are open; extra callers wait.
+    - read_only pools open query_only connections (any write raises).
+    """
+
+    def __init__(self, db_name, max_size=POOL_MAX_SIZE, read_only=False):
+        self.db_name = db_name
+        self.max_size = max_size
+        self.read_only = read_only
+        self.pid = os.getpid()
+        self._local = threading.local()
+        self._idle = []
+        self._all = []
+        self._cond = threading.Condition()
+        self._stats = {"hits": 0, "misses": 0, "waits": 0, "checkouts": 0}
+
+    def acquire(self):
+        """Check a connection out of the pool."""
+        with self._cond:
+            self._stats["checkouts"] += 1
+            conn = getattr(self._local, "conn", None)
+            if conn is not None and conn in self._idle:
+                self._idle.remove(conn)
+                self._stats["hits"] += 1
+                return conn
+
+            waited = False
+            while not self._idle and len(self._all) >= self.max_size:
+                waited = True
+                self._cond.wait()
+            if waited:
+                self._stats["waits"] += 1
+
+            if self._idle:
+                conn = self._idle.pop()
+                self._stats["hits"] += 1
+            else:
+                conn = _open_tuned_connection(self.db_name, self.read_only)
+                self._all.append(conn)
+                self._stats["misses"] += 1
+
+            self._local.conn = conn
+            return conn
+
+    def release(self, conn):
+        """Return a connection, rolling back anything left uncommitted."""
+        if conn.in_transaction:
+            conn.rollback()
+        with self._cond:
+            self._idle.append(conn)
+            self._cond.notify()
+
+    def close_all(self):
+        """Close every connection owned by this pool."""
+        with self._cond:
+            for conn in self._all:
+                try:
+                    conn.close()
+                except sqlite3.Error:
+                    pass
+            self._all.clear()
+            self._idle.clear()
+            self._local = threading.local()
+
+    def stats(self):
+        with self._cond:
+            stats = dict(self._stats)
+            stats["open"] = len(self._all)
+            stats["idle"] = len(self._idle)
+            stats["in_use"] = len(self._all) - len(self._idle)
+            stats["max_size"] = self.max_size
+            return stats
+
+
+_pool = None
+_read_pool = None
+_pool_lock = threading.Lock()
+# Every live DataVersionWatcher, so close_pool() can close their connections too
+_watchers = weakref.WeakSet()
+
+
+def _fresh(pool, read_only):
+    """`pool` if it still matches DB_NAME and this process, else a new one."""
+    if pool is None or pool.db_name != DB_NAME or pool.pid != os.getpid():
+        if pool is not None and pool.pid == os.getpid():
+            pool.close_all()
+        pool = ConnectionPool(DB_NAME, read_only=read_only)
+    return pool
+
+
+def get_pool():
+    """
+    Return the process-wide pool for DB_NAME.
+    A new pool is created after a fork or when DB_NAME is changed.
+    """
+    global _pool
+    with _pool_lock:
+        _pool = _fresh(_pool, False)
+        return _pool
+
+
+def get_read_pool():
+    """Return the process-wide query_only pool used by read_connection() in split mode."""
+    global _read_pool
+    with _pool_lock:
+        _read_pool = _fresh(_read_pool, True)
+        return _read_pool
+
+
+@contextmanager
+def _borrow(pool):
+    conn = pool.acquire()
+    tracer = connection_tracer
+    if tracer is not None:
+        tracer.attach(conn)
+    try:
+        yield conn
+    finally:
+        if tracer is not None:
+            tracer.detach(conn)
+        pool.release(conn)
+
+
+def pooled_connection():
+    """
+    Borrow a tuned connection from the pool:
+
+        with pooled_connection() as conn:
+            conn.execute(...)
+            conn.commit()
+
+    Uncommitted work is rolled back when the block exits.
+    """
+    return _borrow(get_pool())
+
+
+def read_connection():
+    """
+    Borrow a connection for statements that only read. Same as
+    pooled_connection() unless split mode is on (backend.group_commit),
+    where it comes from the query_only pool and never holds the write lock.
+    """
+    return _borrow(get_read_pool() if split_reads else get_pool())
+
+
+def pool_stats():
+    """Return hits, misses, waits and open/idle connection counts."""
+    return get_pool().stats()
+
+
+def close_pool():
+    """Close all pooled connections and watcher connections (e.g. on app exit or in tests)."""
+    global _pool, _read_pool
+    with _pool_lock:
+        for pool in (_pool, _read_pool):
+            if pool is not None and pool.pid == os.getpid():
+                pool.close_all()
+        _pool = _read_pool = None
+    for watcher in list(_watchers):
+        watcher.close()
+
+
+class DataVersionWatcher:
+    """
+    Tells whether the database changed since the last look, via
+    `PRAGMA data_version` on a private connection. Any commit made through
+    another connection (other processes or other pooled connections) moves it.
+    current() returns a token to compare; it also changes if DB_NAME does.
+    close() releases the connection; the next current() opens a new one.
+    """
+
+    def __init__(self):
+        self._conn = None
+        self._owner = None  # (db_name, pid) the private connection belongs to
+        self._lock = threading.Lock()
+        _watchers.add(self)
+
+    def current(self):
+        owner = (DB_NAME, os.getpid())
+        with self._lock:
+            if self._owner != owner:
+                if self._conn is not None and self._owner[1] == owner[1]:
+                    self._conn.close()
+                self._conn = sqlite3.connect(DB_NAME, check_same_thread=False)
+                self._owner = owner
+            return (DB_NAME, self._conn.execute("PRAGMA data_version").fetchone()[0])
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None and self._owner[1] == os.getpid():
+                self._conn.close()
+            self._conn = self._owner = None
+
+
 def initialize_database():
-    """Create tables if they don't exist."""
-    conn = get_connection()
-    cursor = conn.cursor()
-
-    # Create users table
-    cursor.execute("""
-    CREATE TABLE IF NOT EXISTS users (
-        user_id INTEGER PRIMARY KEY AUTOINCREMENT,
-        username TEXT UNIQUE NOT NULL,
-        password TEXT NOT NULL,
-        email TEXT,
-        is_admin INTEGER DEFAULT 0
-    )
-    """)
-
-    # Create flights table
-    cursor.execute("""
-    CREATE TABLE IF NOT EXISTS flights (
-        flight_id INTEGER PRIMARY KEY AUTOINCREMENT,
-        flight_number TEXT NOT NULL,
-        origin TEXT NOT NULL,
-        destination TEXT NOT NULL,
-        date TEXT NOT NULL,
-        time TEXT NOT NULL,
-        price REAL NOT NULL,
-        available_seats INTEGER NOT NULL
-    )
-    """)
-
-    # Create bookings table
-    cursor.execute("""
-    CREATE TABLE IF NOT EXISTS bookings (
-        booking_id INTEGER PRIMARY KEY AUTOINCREMENT,
-        user_id INTEGER NOT NULL,
-        flight_id INTEGER NOT NULL,
-        seat_count INTEGER NOT NULL,
-        booking_date TEXT NOT NULL,
-        total_price REAL NOT NULL,
-        FOREIGN KEY(user_id) REFERENCES users(user_id),
-        FOREIGN KEY(flight_id) REFERENCES flights(flight_id)
-    )
-    """)
+    """Create tables if they don't exist and apply pending migrations."""
+    from backend.migrations import migrate
+
+    with pooled_connection() as conn:
+        cursor = conn.cursor()
+
+        # Create users table
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS users (
+            user_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT UNIQUE NOT NULL,
+            password TEXT NOT NULL,
+            email TEXT,
+            is_admin INTEGER DEFAULT 0
+        )
+        """)
+
+        # Create flights table
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS flights (
+            flight_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            flight_number TEXT NOT NULL,
+            origin TEXT NOT NULL,
+            destination TEXT NOT NULL,
+            date TEXT NOT NULL,
+            time TEXT NOT NULL,
+            price REAL NOT NULL,
+            available_seats INTEGER NOT NULL
+        )
+        """)
+
+        # Create bookings table
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS bookings (
+            booking_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            flight_id INTEGER NOT NULL,
+            seat_count INTEGER NOT NULL,
+            booking_date TEXT NOT NULL,
+            total_price REAL NOT NULL,
+            FOREIGN KEY(user_id) REFERENCES users(user_id),
+            FOREIGN KEY(flight_id) REFERENCES flights(flight_id)
+        )
+        """)
 
-    conn.commit()
-    conn.close()
+        conn.commit()
+        migrate(conn)
     print("✅ Database initialized successfully.")
 
 
@@ -0,0 +1,257 @@
+# -*- coding: utf-8 -*-
+# backend/export.py
+"""
+Streaming export of bookings and flights.
+
+    python -m backend.export bookings --format csv --out ledger.csv.gz --gzip
+    python -m backend.export flights --format columnar --out flights.akc --from 2025-01-01
+
+Rows come from BookingService.iter_bookings / FlightService.iter_flights and
+are written as they arrive, so memory stays constant whatever the table size.
+
+The "columnar" format is a small stdlib-only binary layout:
+
+    b"AKCOL1\n"
+    uint32 header length + JSON header {"columns": [[name, type], ...], "row_group_size": N}
+    repeated row groups:
+        uint32 row count (0 ends the file)
+        per column: uint8 has_nulls, [null bitmap], uint32 payload length, payload
+            i64 -> array("q"), f64 -> array("d"),
+            str -> array("I") byte lengths followed by the UTF-8 bytes
+
+All integers are little-endian.
+"""
+import sys
+import csv
+import gzip
+import json
+import time
+import struct
+import argparse
+from array import array
+from itertools import islice
+
+from backend.booking_service import BookingService
+from backend.flight_service import FlightService
+
+COLUMNAR_MAGIC = b"AKCOL1\n"
+
+BOOKING_EXPORT_COLUMNS = [
+    ("booking_id", "i64"),
+    ("user_id", "i64"),
+    ("username", "str"),
+    ("flight_id", "i64"),
+    ("flight_number", "str"),
+    ("origin", "str"),
+    ("destination", "str"),
+    ("date", "str"),
+    ("time", "str"),
+    ("seat_count", "i64"),
+    ("booking_date", "str"),
+    ("total_price", "f64"),
+]
+
+FLIGHT_EXPORT_COLUMNS = [
+    ("flight_id", "i64"),
+    ("flight_number", "str"),
+    ("origin", "str"),
+    ("destination", "str"),
+    ("date", "str"),
+    ("time", "str"),
+    ("price", "f64"),
+    ("available_seats", "i64"),
+    ("duration_minutes", "i64"),
+]
+
+_LITTLE_ENDIAN = sys.byteorder == "little"
+
+
+def _open_output(path, use_gzip, binary):
+    opener = gzip.open if use_gzip else open
+    if binary:
+        return opener(path, "wb")
+    return opener(path, "wt", encoding="utf-8", newline="")
+
+
+# ------------------------------------------------------------------------------
+# Writers — each takes an iterable of row tuples and returns the row count
+# ------------------------------------------------------------------------------
+def write_csv(rows, columns, out):
+    writer = csv.writer(out)
+    writer.writerow([name for name, _ in columns])
+    count = 0
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+    return count
+
+
+def write_jsonl(rows, columns, out):
+    names = [name for name, _ in columns]
+    dumps = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+    count = 0
+    for row in rows:
+        out.write(dumps(dict(zip(names, row))))
+        out.write("\n")
+        count += 1
+    return count
+
+
+def _pack_array(arr):
+    if not _LITTLE_ENDIAN:
+        arr.byteswap()
+    return arr.tobytes()
+
+
+def _encode_column(values, col_type):
+    nulls = [v is None for v in values]
+    has_nulls = any(nulls)
+    parts = [struct.pack("<B", 1 if has_nulls else 0)]
+    if has_nulls:
+        bitmap = bytearray((len(values) + 7) // 8)
+        for i, is_null in enumerate(nulls):
+            if is_null:
+                bitmap[i >> 3] |= 1 << (i & 7)
+        parts.append(bytes(bitmap))
+
+    if col_type == "i64":
+        payload = _pack_array(array("q", (0 if v is None else int(v) for v in values)))
+    elif col_type == "f64":
+        payload = _pack_array(array("d", (0.0 if v is None else float(v) for v in values)))
+    else:
+        encoded = [b"" if v is None else str(v).encode("utf-8") for v in values]
+        payload = _pack_array(array("I", (len(e) for e in encoded))) + b"".join(encoded)
+
+    parts.append(struct.pack("<I", len(payload)))
+    parts.append(payload)
+    return b"".join(parts)
+
+
+def write_columnar(rows, columns, out, row_group_size=8192):
+    header = json.dumps({"columns": columns, "row_group_size": row_group_size}).encode()
+    out.write(COLUMNAR_MAGIC)
+    out.write(struct.pack("<I", len(header)))
+    out.write(header)
+
+    rows = iter(rows)
+    count = 0
+    while True:
+        group = list(islice(rows, row_group_size))
+        if not group:
+            break
+        out.write(struct.pack("<I", len(group)))
+        for index, (_, col_type) in enumerate(columns):
+            out.write(_encode_column([row[index] for row in group], col_type))
+        count += len(group)
+    out.write(struct.pack("<I", 0))
+    return count
+
+
+def _unpack_array(typecode, data):
+    arr = array(typecode)
+    arr.frombytes(data)
+    if not _LITTLE_ENDIAN:
+        arr.byteswap()
+    return arr
+
+
+def read_columnar(path):
+    """Yield dicts back out of a columnar export (gzip detected automatically)."""
+    with open(path, "rb") as probe:
+        gzipped = probe.read(2) == b"\x1f\x8b"
+    with (gzip.open(path, "rb") if gzipped else open(path, "rb")) as f:
+        if f.read(len(COLUMNAR_MAGIC)) != COLUMNAR_MAGIC:
+            raise ValueError("Not a columnar export file")
+        (header_len,) = struct.unpack("<I", f.read(4))
+        columns = json.loads(f.read(header_len))["columns"]
+
+        while True:
+            (nrows,) = struct.unpack("<I", f.read(4))
+            if nrows == 0:
+                return
+            data = []
+            for _, col_type in columns:
+                (has_nulls,) = struct.unpack("<B", f.read(1))
+                bitmap = f.read((nrows + 7) // 8) if has_nulls else None
+                (payload_len,) = struct.unpack("<I", f.read(4))
+                payload = f.read(payload_len)
+
+                if col_type == "i64":
+                    values = list(_unpack_array("q", payload))
+                elif col_type == "f64":
+                    values = list(_unpack_array("d", payload))
+                else:
+                    itemsize = array("I").itemsize
+                    lengths = _unpack_array("I", payload[:nrows * itemsize])
+                    values, offset = [], nrows * itemsize
+                    for length in lengths:
+                        values.append(payload[offset:offset + length].decode("utf-8"))
+                        offset += length
+
+                if bitmap:
+                    values = [None if bitmap[i >> 3] & (1 << (i & 7)) else v for i, v in enumerate(values)]
+                data.append(values)
+
+            names = [name for name, _ in columns]
+            for i in range(nrows):
+                yield {name: col[i] for name, col in zip(names, data)}
+
+
+WRITERS = {
+    "csv": (write_csv, False),
+    "jsonl": (write_jsonl, False),
+    "columnar": (write_columnar, True),
+}
+
+
+def export(kind, fmt, out_path, use_gzip=False, start_date=None, end_date=None,
+           origin=None, destination=None, batch_size=1000):
+    """
+    Export "bookings" or "flights" to `out_path`.
+    Returns {"rows", "seconds", "rows_per_second"}.
+    """
+    if kind == "bookings":
+        rows = BookingService.iter_bookings(start_date, end_date, origin, destination, batch_size)
+        columns = BOOKING_EXPORT_COLUMNS
+    elif kind == "flights":
+        rows = FlightService.iter_flights(start_date, end_date, origin, destination, batch_size)
+        columns = FLIGHT_EXPORT_COLUMNS
+    else:
+        raise ValueError(f"Unknown export kind: {kind!r}")
+
+    writer, binary = WRITERS[fmt]
+    names = [name for name, _ in columns]
+    tuples = (tuple(row[name] for name in names) for row in rows)
+
+    started = time.perf_counter()
+    with _open_output(out_path, use_gzip, binary) as out:
+        count = writer(tuples, columns, out)
+    seconds = time.perf_counter() - started
+    return {"rows": count, "seconds": seconds, "rows_per_second": count / seconds if seconds else 0.0}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stream bookings or flights to a file.")
+    parser.add_argument("kind", choices=["bookings", "flights"])
+    parser.add_argument("--format", choices=sorted(WRITERS), default="csv")
+    parser.add_argument("--out", required=True)
+    parser.add_argument("--gzip", action="store_true")
+    parser.add_argument("--from", dest="start_date", help="inclusive start date (YYYY-MM-DD)")
+    parser.add_argument("--to", dest="end_date", help="inclusive end date (YYYY-MM-DD)")
+    parser.add_argument("--origin")
+    parser.add_argument("--destination")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    result = export(
+        args.kind, args.format, args.out, use_gzip=args.gzip,
+        start_date=args.start_date, end_date=args.end_date,
+        origin=args.origin, destination=args.destination, batch_size=args.batch_size,
+    )
+    print(f"✅ Exported {result['rows']:,} {args.kind} to {args.out} "
+          f"in {result['seconds']:.2f}s ({result['rows_per_second']:,.0f} rows/s)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
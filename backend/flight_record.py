@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+# backend/flight_record.py
+"""
+Compact, read-only flight records for listings and detail lookups.
+
+    with read_connection() as conn:
+        cursor = conn.cursor()
+        cursor.row_factory = flight_record_factory
+        flights = cursor.execute(FLIGHT_RECORD_SELECT + " FROM flights").fetchall()
+
+The SELECT fixes the column order, so the row factory maps positions
+straight onto slots: no sqlite3.Row, no intermediate dict, no per-row key
+lookups. A FlightRecord is a Mapping, so callers keep using flight["date"],
+flight.get("departure"), dict(flight) and {**flight}; `departure` is the
+flights.origin column under the name the UI has always used.
+
+Records are immutable (assigning or deleting a field raises AttributeError):
+FlightService.get_flight_by_id hands the same cached instance to every
+caller, so a change has to go through the service and its invalidation.
+"""
+from collections.abc import Mapping
+
+FLIGHT_RECORD_FIELDS = ("flight_id", "departure", "destination", "date", "available_seats", "price")
+FLIGHT_RECORD_SELECT = "SELECT flight_id, origin, destination, date, available_seats, price"
+_FIELDS = frozenset(FLIGHT_RECORD_FIELDS)
+
+
+class FlightRecord(Mapping):
+    __slots__ = FLIGHT_RECORD_FIELDS
+
+    def __init__(self, flight_id, departure, destination, date, available_seats, price):
+        _set = object.__setattr__
+        _set(self, "flight_id", flight_id)
+        _set(self, "departure", departure)
+        _set(self, "destination", destination)
+        _set(self, "date", date)
+        _set(self, "available_seats", available_seats)
+        _set(self, "price", price)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"FlightRecord is read-only (tried to set {name!r})")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"FlightRecord is read-only (tried to delete {name!r})")
+
+    def __getitem__(self, key):
+        if key not in _FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        # Mapping.get goes through __getitem__ and a try/except; this is the hot path
+        return getattr(self, key) if key in _FIELDS else default
+
+    def __iter__(self):
+        return iter(FLIGHT_RECORD_FIELDS)
+
+    def __len__(self):
+        return len(FLIGHT_RECORD_FIELDS)
+
+    def __repr__(self):
+        return f"FlightRecord({', '.join(f'{k}={getattr(self, k)!r}' for k in FLIGHT_RECORD_FIELDS)})"
+
+    def __reduce__(self):
+        return FlightRecord, tuple(getattr(self, k) for k in FLIGHT_RECORD_FIELDS)
+
+
+def flight_record_factory(cursor, row):
+    """sqlite3 row factory for queries that start with FLIGHT_RECORD_SELECT."""
+    return FlightRecord(*row)
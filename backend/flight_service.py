@@ -1,147 +1,519 @@
 # -*- coding: utf-8 -*-
+import re
 import sqlite3
-from backend.database import get_connection
+import time as _time
+from datetime import date as _date, timedelta
+from itertools import islice
+from backend.database import pooled_connection, read_connection
+from backend.cache import flight_cache
+from backend.flight_record import FlightRecord, FLIGHT_RECORD_SELECT, flight_record_factory
+from backend.pagination import fetch_keyset_page
+from backend.text_search import match_expression, FLIGHT_RANK_WEIGHTS
+from backend import seat_map, group_commit
+from backend.seat_map import SeatMapError
 from typing import Optional, Dict, Any
 
+FLIGHT_COLUMNS = ("flight_number", "origin", "destination", "date", "time", "price", "available_seats")
+# Optional schedule columns (NULL when absent)
+OPTIONAL_FLIGHT_COLUMNS = ("duration_minutes",)
+_DATE_RE = re.compile(r"^(\d{4})-(\d{2})-(\d{2})$")
+_TIME_RE = re.compile(r"^([01]\d|2[0-3]):[0-5]\d$")
+# Sortable columns for get_flights_page -> full keyset order (flight_id breaks ties)
+FLIGHT_SORT_KEYS = {
+    "flight_id": ("flight_id",),
+    "origin": ("origin", "destination", "date", "time", "flight_id"),
+    "destination": ("destination", "date", "time", "flight_id"),
+    "date": ("date", "time", "flight_id"),
+    "price": ("price", "flight_id"),
+    "available_seats": ("available_seats", "flight_id"),
+}
+
 class FlightService:
+    # Optional backend.inventory_index.InventoryIndex serving search_flights
+    inventory_index = None
+
     @staticmethod
-    def add_flight(flight_number, origin, destination, date, time, price, available_seats):
+    def add_flight(flight_number, origin, destination, date, time, price, available_seats, duration_minutes=None):
         """
-        Add a new flight to the database.
+        Add a new flight to the database (on the writer thread in split mode,
+        see backend.group_commit).
         Returns True if added successfully, False otherwise.
         """
+        values = (flight_number, origin, destination, date, time, price, available_seats, duration_minutes)
+        before = flight_cache.write_token()
         try:
-            conn = get_connection()
-            cursor = conn.cursor()
-
-            cursor.execute("""
-                INSERT INTO flights (flight_number, origin, destination, date, time, price, available_seats)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            """, (flight_number, origin, destination, date, time, price, available_seats))
-
-            conn.commit()
-            conn.close()
+            writer = group_commit.active_writer()
+            if writer is not None:
+                writer.execute(FlightService._insert_flight, values)
+            else:
+                with pooled_connection() as conn:
+                    FlightService._insert_flight(conn, values)
+                    conn.commit()
+            flight_cache.invalidate_route(origin, destination, date, before=before)
             return True
         except Exception as e:
             print("❌ Error adding flight:", e)
             return False
 
     @staticmethod
+    def _insert_flight(conn, values):
+        conn.execute("""
+            INSERT INTO flights (flight_number, origin, destination, date, time, price, available_seats, duration_minutes)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, values)
+
+    @staticmethod
+    def validate_flight_row(row: dict) -> tuple:
+        """
+        Validate and coerce one schedule row.
+        Returns a tuple in FLIGHT_COLUMNS + OPTIONAL_FLIGHT_COLUMNS order
+        or raises ValueError.
+        """
+        missing = [c for c in FLIGHT_COLUMNS if row.get(c) in (None, "")]
+        if missing:
+            raise ValueError(f"missing {', '.join(missing)}")
+
+        flight_number = str(row["flight_number"]).strip()
+        origin = str(row["origin"]).strip()
+        destination = str(row["destination"]).strip()
+        if origin == destination:
+            raise ValueError("origin and destination are the same")
+
+        date = str(row["date"]).strip()
+        time = str(row["time"]).strip()
+        match = _DATE_RE.match(date)
+        try:
+            if not match or not _TIME_RE.match(time):
+                raise ValueError
+            _date(int(match[1]), int(match[2]), int(match[3]))
+        except ValueError:
+            raise ValueError(f"bad date/time {date!r} {time!r}")
+
+        try:
+            price = float(row["price"])
+            available_seats = int(row["available_seats"])
+        except (TypeError, ValueError):
+            raise ValueError("price/available_seats must be numeric")
+        if price < 0 or available_seats < 0:
+            raise ValueError("price/available_seats must not be negative")
+
+        duration_minutes = row.get("duration_minutes")
+        if duration_minutes in (None, ""):
+            duration_minutes = None
+        else:
+            try:
+                duration_minutes = int(duration_minutes)
+            except (TypeError, ValueError):
+                raise ValueError("duration_minutes must be an integer")
+            if duration_minutes <= 0:
+                raise ValueError("duration_minutes must be positive")
+
+        return (flight_number, origin, destination, date, time, price, available_seats, duration_minutes)
+
     @staticmethod
-    def get_all_flights() -> list[dict]:
-        """Fetch all flights with normalized field names for UI consistency."""
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM flights")
-        rows = cursor.fetchall()
-        conn.close()
-
-        flights = []
-        for row in rows:
-            flight = dict(row)
-            normalized = {
-                "flight_id": flight.get("flight_id"),
-                "departure": (
-                    flight.get("departure")
-                    or flight.get("origin")
-                    or flight.get("from_city")
-                    or flight.get("from")
-                ),
-                "destination": (
-                    flight.get("destination")
-                    or flight.get("arrival")
-                    or flight.get("to_city")
-                    or flight.get("to")
-                ),
-                "date": (
-                    flight.get("date")
-                    or flight.get("departure_time")
-                    or flight.get("flight_date")
-                ),
-                "available_seats": flight.get("available_seats") or flight.get("seats_available"),
-                "price": flight.get("price") or flight.get("ticket_price") or 0.0,
-            }
-            flights.append(normalized)
-
-        return flights
+    def bulk_import_flights(rows, chunk_size=5000, upsert=False, on_chunk=None, max_errors=100):
+        """
+        Insert many flights with executemany, one transaction per chunk.
+        - `rows` is any iterable of dicts (consumed lazily, so memory stays flat).
+        - Invalid rows are skipped and reported (first `max_errors` kept).
+        - With upsert=True, an existing (flight_number, date) is updated in place
+          (route, time and price); its available_seats are left alone because
+          bookings may already have consumed them.
+        - on_chunk(stats) is called after each committed chunk.
+        - Commits on its own even in split mode (see backend.group_commit).
+        Returns a summary dict.
+        """
+        summary = {"inserted": 0, "updated": 0, "skipped": 0, "errors": [], "chunks": 0, "seconds": 0.0}
+        started = _time.perf_counter()
+        rows = iter(rows)
+        row_number = 0
+
+        with pooled_connection() as conn:
+            if upsert:
+                conn.execute("""
+                    CREATE TEMP TABLE IF NOT EXISTS flight_import_staging (
+                        flight_number TEXT, origin TEXT, destination TEXT,
+                        date TEXT, time TEXT, price REAL, available_seats INTEGER,
+                        duration_minutes INTEGER
+                    )
+                """)
+
+            while True:
+                raw_chunk = list(islice(rows, chunk_size))
+                if not raw_chunk:
+                    break
+
+                chunk = []
+                for raw in raw_chunk:
+                    row_number += 1
+                    try:
+                        chunk.append(FlightService.validate_flight_row(raw))
+                    except ValueError as e:
+                        summary["skipped"] += 1
+                        if len(summary["errors"]) < max_errors:
+                            summary["errors"].append((row_number, str(e)))
+
+                chunk_started = _time.perf_counter()
+                inserted = updated = 0
+                try:
+                    conn.execute("BEGIN IMMEDIATE;")
+                    if upsert:
+                        inserted, updated = FlightService._upsert_chunk(conn, chunk)
+                    else:
+                        conn.executemany("""
+                            INSERT INTO flights (flight_number, origin, destination, date, time, price, available_seats, duration_minutes)
+                            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                        """, chunk)
+                        inserted = len(chunk)
+                    conn.commit()
+                except sqlite3.Error as e:
+                    conn.rollback()
+                    print(f"❌ Import failed at row {row_number}: {e}")
+                    summary["error"] = str(e)
+                    break
 
+                elapsed = _time.perf_counter() - chunk_started
+                summary["inserted"] += inserted
+                summary["updated"] += updated
+                summary["chunks"] += 1
+                if on_chunk:
+                    on_chunk({
+                        "chunk": summary["chunks"],
+                        "rows": len(chunk),
+                        "inserted": inserted,
+                        "updated": updated,
+                        "seconds": elapsed,
+                        "rows_per_second": len(chunk) / elapsed if elapsed else float("inf"),
+                    })
+
+        if summary["chunks"]:
+            flight_cache.clear()
+        summary["seconds"] = _time.perf_counter() - started
+        return summary
+
+    @staticmethod
+    def _upsert_chunk(conn, chunk):
+        """Merge a validated chunk into flights on (flight_number, date)."""
+        # Last row wins for duplicates inside the chunk
+        chunk = list({(row[0], row[3]): row for row in chunk}.values())
+
+        conn.execute("DELETE FROM flight_import_staging")
+        conn.executemany("""
+            INSERT INTO flight_import_staging (flight_number, origin, destination, date, time, price, available_seats, duration_minutes)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, chunk)
+
+        updated = conn.execute("""
+            UPDATE flights
+            SET origin = s.origin, destination = s.destination, time = s.time, price = s.price, base_price = NULL,
+                duration_minutes = COALESCE(s.duration_minutes, flights.duration_minutes)
+            FROM flight_import_staging AS s
+            WHERE flights.flight_number = s.flight_number AND flights.date = s.date
+        """).rowcount
+
+        inserted = conn.execute("""
+            INSERT INTO flights (flight_number, origin, destination, date, time, price, available_seats, duration_minutes)
+            SELECT s.flight_number, s.origin, s.destination, s.date, s.time, s.price, s.available_seats, s.duration_minutes
+            FROM flight_import_staging AS s
+            WHERE NOT EXISTS (
+                SELECT 1 FROM flights f
+                WHERE f.flight_number = s.flight_number AND f.date = s.date
+            )
+        """).rowcount
+        return inserted, updated
+
+    @staticmethod
+    @staticmethod
+    def get_all_flights() -> list[FlightRecord]:
+        """Fetch all flights as compact FlightRecords (dict-style access, see flight_record)."""
+        with read_connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = flight_record_factory
+            return cursor.execute(FLIGHT_RECORD_SELECT + " FROM flights").fetchall()
+
+    @staticmethod
+    def iter_flights(start_date=None, end_date=None, origin=None, destination=None, batch_size=1000):
+        """
+        Stream flights (as sqlite3.Row) ordered by date/time using fetchmany,
+        so callers never hold the whole table in memory.
+        Dates are inclusive YYYY-MM-DD bounds on the flight date.
+        """
+        filters, params = [], []
+        if start_date:
+            filters.append("date >= ?")
+            params.append(start_date)
+        if end_date:
+            filters.append("date <= ?")
+            params.append(end_date)
+        if origin:
+            filters.append("origin = ?")
+            params.append(origin)
+        if destination:
+            filters.append("destination = ?")
+            params.append(destination)
+
+        sql = "SELECT * FROM flights"
+        if filters:
+            sql += " WHERE " + " AND ".join(filters)
+        sql += " ORDER BY date, time, flight_id"
+
+        with read_connection() as conn:
+            cursor = conn.execute(sql, params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield from rows
+
+    @staticmethod
+    def get_flights_page(sort_by="date", descending=False, cursor=None, page_size=200, with_total=False):
+        """
+        One page of flights sorted in SQL (see FLIGHT_SORT_KEYS).
+        Pass the returned "next_cursor" back as `cursor` for the following page.
+        Returns {"items", "next_cursor", "prev_cursor", "total"}.
+        """
+        order_cols = FLIGHT_SORT_KEYS.get(sort_by)
+        if order_cols is None:
+            raise ValueError(f"Cannot sort flights by {sort_by!r}")
+        with read_connection() as conn:
+            page = fetch_keyset_page(
+                conn, "SELECT * FROM flights", [], [],
+                order_cols=order_cols,
+                row_key=lambda row: tuple(row[col] for col in order_cols),
+                descending=descending, cursor=cursor, page_size=page_size,
+            )
+            if with_total:
+                page["total"] = conn.execute("SELECT COUNT(*) FROM flights").fetchone()[0]
+        return page
+
+    @staticmethod
+    def search_flights_text(query, limit=50):
+        """
+        Flights whose number, origin or destination match `query` (prefix
+        words, all required), best match first, then by departure.
+        """
+        match = match_expression(query)
+        if match is None:
+            return []
+        weights = ", ".join(str(w) for w in FLIGHT_RANK_WEIGHTS)
+        with read_connection() as conn:
+            rows = conn.execute(f"""
+                SELECT f.*
+                FROM flights_fts
+                JOIN flights f ON f.flight_id = flights_fts.rowid
+                WHERE flights_fts MATCH ?
+                ORDER BY bm25(flights_fts, {weights}), f.date, f.time
+                LIMIT ?
+            """, (match, limit)).fetchall()
+        return [dict(row) for row in rows]
 
     @staticmethod
     def search_flights(origin, destination, date=None):
         """
         Search flights by origin, destination, and optional date.
+        Served from the in-memory inventory index when one is attached,
+        otherwise from flight_cache when possible.
         """
-        conn = get_connection()
-        cursor = conn.cursor()
+        date = date or None
+        index = FlightService.inventory_index
+        if index is not None:
+            index.refresh()
+            return index.search(origin, destination, date)
 
-        if date:
-            cursor.execute("""
-                SELECT * FROM flights
-                WHERE origin = ? AND destination = ? AND date = ?
-                ORDER BY time
-            """, (origin, destination, date))
-        else:
-            cursor.execute("""
-                SELECT * FROM flights
-                WHERE origin = ? AND destination = ?
-                ORDER BY date, time
-            """, (origin, destination))
-
-        flights = cursor.fetchall()
-        conn.close()
+        cached = flight_cache.get_search(origin, destination, date)
+        if cached is not None:
+            return [dict(f) for f in cached]
+
+        generation = flight_cache.generation
+        with read_connection() as conn:
+            if date:
+                flights = conn.execute("""
+                    SELECT * FROM flights
+                    WHERE origin = ? AND destination = ? AND date = ?
+                    ORDER BY time
+                """, (origin, destination, date)).fetchall()
+            else:
+                flights = conn.execute("""
+                    SELECT * FROM flights
+                    WHERE origin = ? AND destination = ?
+                    ORDER BY date, time
+                """, (origin, destination)).fetchall()
+
+        flights = [dict(f) for f in flights]
+        flight_cache.put_search(origin, destination, date, flights, generation)
         return [dict(f) for f in flights]
 
     @staticmethod
+    def get_price_calendar(origin, destination, date, days=3, min_seats=1):
+        """
+        Cheapest fare and remaining seats per day for date ± `days`.
+        One grouped query on the route/date index, or a range read of
+        route_day_fares when the route is hot (see mark_hot_route).
+        Returns one dict per day: {"date", "min_price", "seats", "flights"};
+        days without bookable flights have min_price None.
+        """
+        center = _date.fromisoformat(date)
+        window = [(center + timedelta(days=offset)).isoformat() for offset in range(-days, days + 1)]
+
+        with read_connection() as conn:
+            hot = min_seats <= 1 and conn.execute(
+                "SELECT 1 FROM hot_routes WHERE origin = ? AND destination = ?", (origin, destination)
+            ).fetchone()
+            if hot:
+                rows = conn.execute("""
+                    SELECT date, min_price, seats, flights FROM route_day_fares
+                    WHERE origin = ? AND destination = ? AND date BETWEEN ? AND ?
+                """, (origin, destination, window[0], window[-1])).fetchall()
+            else:
+                rows = conn.execute("""
+                    SELECT date, MIN(price) AS min_price, SUM(available_seats) AS seats, COUNT(*) AS flights
+                    FROM flights
+                    WHERE origin = ? AND destination = ? AND date BETWEEN ? AND ?
+                      AND available_seats >= ?
+                    GROUP BY date
+                """, (origin, destination, window[0], window[-1], max(min_seats, 1))).fetchall()
+
+        by_day = {row["date"]: row for row in rows}
+        calendar = []
+        for day in window:
+            row = by_day.get(day)
+            calendar.append({
+                "date": day,
+                "min_price": row["min_price"] if row else None,
+                "seats": row["seats"] if row else 0,
+                "flights": row["flights"] if row else 0,
+            })
+        return calendar
+
     @staticmethod
-    def get_flight_by_id(flight_id: int) -> dict | None:
-        """Fetch a single flight by ID, normalized for consistent UI access."""
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM flights WHERE flight_id = ?", (flight_id,))
-        row = cursor.fetchone()
-        conn.close()
+    def mark_hot_route(origin, destination):
+        """Materialize per-day fares for a route; triggers keep them current."""
+        group_commit.run_write(FlightService._mark_hot_route, origin, destination)
 
-        if not row:
-            return None
+    @staticmethod
+    def _mark_hot_route(conn, origin, destination):
+        conn.execute("INSERT OR IGNORE INTO hot_routes (origin, destination) VALUES (?, ?)", (origin, destination))
+        conn.execute("DELETE FROM route_day_fares WHERE origin = ? AND destination = ?", (origin, destination))
+        conn.execute("""
+            INSERT INTO route_day_fares (origin, destination, date, min_price, seats, flights)
+            SELECT origin, destination, date, MIN(price), SUM(available_seats), COUNT(*)
+            FROM flights
+            WHERE origin = ? AND destination = ? AND available_seats > 0
+            GROUP BY origin, destination, date
+        """, (origin, destination))
 
-        # Convert sqlite3.Row to dict
-        flight = dict(row)
+    @staticmethod
+    def unmark_hot_route(origin, destination):
+        group_commit.run_write(FlightService._unmark_hot_route, origin, destination)
 
-        # Normalize key names
-        normalized = {
-            "flight_id": flight.get("flight_id"),
-            "departure": (
-                flight.get("departure")
-                or flight.get("origin")
-                or flight.get("from_city")
-                or flight.get("from")
-            ),
-            "destination": (
-                flight.get("destination")
-                or flight.get("arrival")
-                or flight.get("to_city")
-                or flight.get("to")
-            ),
-            "date": (
-                flight.get("date")
-                or flight.get("departure_time")
-                or flight.get("flight_date")
-            ),
-            "available_seats": flight.get("available_seats") or flight.get("seats_available"),
-            "price": flight.get("price") or flight.get("ticket_price") or 0.0,
-        }
+    @staticmethod
+    def _unmark_hot_route(conn, origin, destination):
+        conn.execute("DELETE FROM hot_routes WHERE origin = ? AND destination = ?", (origin, destination))
+        conn.execute("DELETE FROM route_day_fares WHERE origin = ? AND destination = ?", (origin, destination))
 
-        return normalized
+    @staticmethod
+    def search_connections(origin, destination, date, max_stops=1, sort_by="price", limit=10,
+                           min_layover=None, max_layover=None, seats=1):
+        """
+        Direct and connecting itineraries leaving on `date`, ranked by total
+        price or arrival time. See backend.itinerary_search.
+        """
+        from backend import itinerary_search
 
+        graph = itinerary_search.get_route_graph(date)
+        return itinerary_search.find_itineraries(
+            graph, origin, destination, date,
+            max_stops=max_stops, sort_by=sort_by, limit=limit, seats=seats,
+            min_layover=itinerary_search.MIN_LAYOVER_MINUTES if min_layover is None else min_layover,
+            max_layover=itinerary_search.MAX_LAYOVER_MINUTES if max_layover is None else max_layover,
+        )
+
+    @staticmethod
+    @staticmethod
+    def get_flight_by_id(flight_id: int) -> FlightRecord | None:
+        """Fetch a single flight by ID as a FlightRecord (read-only, so cached records are shared)."""
+        cached = flight_cache.get_flight(flight_id)
+        if cached is not None:
+            return cached
+
+        generation = flight_cache.generation
+        with read_connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = flight_record_factory
+            flight = cursor.execute(FLIGHT_RECORD_SELECT + " FROM flights WHERE flight_id = ?", (flight_id,)).fetchone()
+
+        if flight is None:
+            return None
+        flight_cache.put_flight(flight_id, flight, generation)
+        return flight
+
+    @staticmethod
+    def get_flight_details(flight_id):
+        """
+        Every column of one flight as a dict (plus `departure`, the record
+        name for origin), or None. Uncached: for detail views and the API.
+        """
+        with read_connection() as conn:
+            row = conn.execute("SELECT * FROM flights WHERE flight_id = ?", (flight_id,)).fetchone()
+        if row is None:
+            return None
+        flight = dict(row)
+        flight["departure"] = flight["origin"]
+        return flight
 
     @staticmethod
     def update_available_seats(flight_id, new_count):
         """Update available seats for a flight."""
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
+        before = flight_cache.write_token()
+        group_commit.run_write(FlightService._set_available_seats, flight_id, new_count)
+        flight_cache.invalidate_flight(flight_id, before=before)
+
+    @staticmethod
+    def _set_available_seats(conn, flight_id, new_count):
+        conn.execute("""
             UPDATE flights SET available_seats = ?
             WHERE flight_id = ?
         """, (new_count, flight_id))
-        conn.commit()
-        conn.close()
+
+    # --------------------------------------------------------------------------
+    @staticmethod
+    def set_seat_layout(flight_id, layout_name):
+        """
+        Give a flight a seat map with the named layout (see backend.seat_map).
+        Existing bookings get seats; available_seats is reset to what is left.
+        Returns True on success.
+        """
+        before = flight_cache.write_token()
+        try:
+            group_commit.run_write(FlightService._create_seat_map, flight_id, layout_name)
+        except (sqlite3.Error, SeatMapError) as e:
+            print(f"❌ Could not set seat layout: {e}")
+            return False
+        flight_cache.invalidate_flight(flight_id, before=before)
+        return True
+
+    @staticmethod
+    def _create_seat_map(conn, flight_id, layout_name):
+        if conn.execute("SELECT 1 FROM flights WHERE flight_id = ?", (flight_id,)).fetchone() is None:
+            raise SeatMapError(f"Flight {flight_id} not found")
+        seat_map.create(conn, flight_id, layout_name)
+
+    @staticmethod
+    def get_seat_map(flight_id):
+        """
+        Returns {"layout", "capacity", "free", "cabins": {code: free seats},
+        "occupied": [labels]} or None when the flight has no seat map.
+        """
+        with read_connection() as conn:
+            name = conn.execute("SELECT layout FROM seat_maps WHERE flight_id = ?", (flight_id,)).fetchone()
+            loaded = seat_map.load(conn, flight_id)
+        if loaded is None:
+            return None
+        layout, occupied = loaded
+        return {
+            "layout": name[0],
+            "capacity": layout.capacity,
+            "free": layout.capacity - occupied.bit_count(),
+            "cabins": {code: (mask & ~occupied).bit_count() for code, mask in layout.cabins.items()},
+            "occupied": [label for i, label in enumerate(layout.labels) if occupied >> i & 1],
+        }
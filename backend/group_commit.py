@@ -0,0 +1,258 @@
+# -*- coding: utf-8 -*-
+# backend/group_commit.py
+"""
+Read/write split: query_only readers and one group-committing writer.
+
+    from backend import group_commit
+    group_commit.enable()
+    ...
+    group_commit.disable()
+
+While enabled:
+- read_connection() (searches, listings, lookups, login) borrows from a
+  separate pool of query_only connections, so readers never queue behind
+  a writer for a pooled connection;
+- BookingService.create_booking / create_bookings_batch / cancel_booking,
+  FlightService.add_flight / update_available_seats / set_seat_layout /
+  mark_hot_route / unmark_hot_route and UserService.register_user hand
+  their transaction body to a single writer thread (run_write() picks the
+  writer or a pooled connection) instead of committing on their own.
+
+The writer takes everything queued (up to max_batch), runs each body under
+its own SAVEPOINT inside one BEGIN IMMEDIATE transaction, and commits once
+with synchronous=FULL. N concurrent bookings then cost one lock handoff and
+one fsync instead of N. Each caller gets its own result (or exception), and
+only after the commit holding its work is on disk. A body that raises is
+rolled back to its savepoint; the rest of the batch still commits.
+
+Callers wait at most WRITE_TIMEOUT seconds. If the writer thread has died
+(or the wait runs out) they get WriterUnavailable, an sqlite3.OperationalError,
+so the services report it like any other database failure; the next
+active_writer() call starts a fresh writer.
+
+Exceptions: bulk and maintenance jobs — FlightService.bulk_import_flights,
+pricing.write_prices, archive.archive_departed, revenue.rebuild,
+change_feed.prune — still open their own BEGIN IMMEDIATE transactions.
+They run rarely and hold the lock for whole chunks; queued on the writer
+they would stall every booking behind them. SQLite's write lock (and
+busy_timeout) serializes them with the writer's batches.
+"""
+import os
+import time
+import queue
+import sqlite3
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+
+from backend import database
+
+MAX_BATCH = 64
+WRITER_SYNCHRONOUS = "FULL"   # a result is only returned once it survives power loss
+WRITE_TIMEOUT = 30.0          # seconds a caller waits for its commit
+_ALIVE_CHECK = 0.5            # seconds between checks that the writer is still running
+
+
+class WriterUnavailable(sqlite3.OperationalError):
+    """The writer thread is gone or did not commit in time."""
+
+
+class GroupCommitWriter:
+    """One thread, one connection, one commit per batch of queued writes."""
+
+    def __init__(self, db_name, max_batch=MAX_BATCH, synchronous=WRITER_SYNCHRONOUS):
+        self.db_name = db_name
+        self.pid = os.getpid()
+        self.max_batch = max_batch
+        self.synchronous = synchronous
+        self.stats = {"batches": 0, "writes": 0, "largest_batch": 0, "failed_batches": 0}
+        self._queue = queue.SimpleQueue()
+        self._stopped = False
+        self._error = None
+        self._thread = threading.Thread(target=self._run, name="group-commit-writer", daemon=True)
+        self._thread.start()
+
+    def is_alive(self):
+        return self._thread.is_alive()
+
+    def submit(self, fn, *args):
+        """Queue fn(conn, *args) for the next batch; returns a Future."""
+        if self._stopped or not self.is_alive():
+            raise WriterUnavailable(f"group-commit writer is not running ({self._error or 'stopped'})")
+        future = Future()
+        self._queue.put((fn, args, future))
+        return future
+
+    def execute(self, fn, *args, timeout=WRITE_TIMEOUT):
+        """
+        Run fn(conn, *args) in the writer and wait until it is committed.
+        Raises WriterUnavailable if the writer dies or `timeout` seconds pass
+        (after a timeout the write may still commit later).
+        """
+        future = self.submit(fn, *args)
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                return future.result(timeout=min(_ALIVE_CHECK, max(deadline - time.monotonic(), 0)))
+            except FutureTimeout:
+                pass
+            if future.done():
+                return future.result()
+            if not self.is_alive():
+                raise WriterUnavailable(f"group-commit writer died ({self._error or 'unknown error'})")
+            if time.monotonic() >= deadline:
+                raise WriterUnavailable(f"group-commit writer did not commit within {timeout:g} s")
+
+    def stop(self):
+        """Finish what is queued, then close the connection and the thread."""
+        self._stopped = True
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        batch, conn = [], None
+        try:
+            conn = database._open_tuned_connection(self.db_name)
+            conn.execute(f"PRAGMA synchronous = {self.synchronous}")
+            stopping = False
+            while not stopping:
+                item = self._queue.get()
+                if item is None:
+                    break
+                batch = [item]
+                while len(batch) < self.max_batch:
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is None:
+                        stopping = True
+                        break
+                    batch.append(item)
+                self._commit(conn, batch)
+            conn.close()
+        except BaseException as e:
+            # release the write lock, fail everything in hand and still queued, then die
+            self._error = repr(e)
+            self._stopped = True
+            if conn is not None:
+                conn.close()  # rolls back an open transaction
+            error = WriterUnavailable(f"group-commit writer died ({self._error})")
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not None:
+                    batch.append(item)
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+            raise
+
+    def _commit(self, conn, batch):
+        # traced per batch, like a pool checkout, so split-mode writes show up in backend.metrics
+        tracer = database.connection_tracer
+        if tracer is not None:
+            tracer.attach(conn)
+        try:
+            self._commit_batch(conn, batch)
+        finally:
+            if tracer is not None:
+                tracer.detach(conn)
+
+    def _commit_batch(self, conn, batch):
+        outcomes = []
+        try:
+            conn.execute("BEGIN IMMEDIATE;")
+            for fn, args, future in batch:
+                conn.execute("SAVEPOINT item;")
+                try:
+                    outcomes.append((future, fn(conn, *args), None))
+                    conn.execute("RELEASE item;")
+                except Exception as e:
+                    conn.execute("ROLLBACK TO item;")
+                    conn.execute("RELEASE item;")
+                    outcomes.append((future, None, e))
+            conn.commit()
+        except sqlite3.Error as e:
+            if conn.in_transaction:
+                conn.rollback()
+            self.stats["failed_batches"] += 1
+            for _, _, future in batch:
+                future.set_exception(e)
+            return
+
+        self.stats["batches"] += 1
+        self.stats["writes"] += len(batch)
+        self.stats["largest_batch"] = max(self.stats["largest_batch"], len(batch))
+        for future, result, error in outcomes:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+
+_writer = None
+_lock = threading.Lock()
+_settings = {"max_batch": MAX_BATCH, "synchronous": WRITER_SYNCHRONOUS}
+
+
+def enable(max_batch=MAX_BATCH, synchronous=WRITER_SYNCHRONOUS):
+    """Switch to split mode (query_only reads, group-committed writes)."""
+    _settings.update(max_batch=max_batch, synchronous=synchronous)
+    database.split_reads = True
+    active_writer()
+
+
+def disable():
+    """Back to shared mode; waits for queued writes to commit."""
+    global _writer
+    with _lock:
+        database.split_reads = False
+        if _writer is not None:
+            if _writer.pid == os.getpid():
+                _writer.stop()
+            _writer = None
+
+
+def is_enabled():
+    return database.split_reads
+
+
+def active_writer():
+    """
+    The writer for the current DB_NAME, or None when split mode is off.
+    Restarted after a fork or when DB_NAME changes, like the pools.
+    """
+    global _writer
+    if not database.split_reads:
+        return None
+    with _lock:
+        if (_writer is None or _writer.db_name != database.DB_NAME or _writer.pid != os.getpid()
+                or not _writer.is_alive()):
+            if _writer is not None and _writer.pid == os.getpid() and _writer.is_alive():
+                _writer.stop()
+            _writer = GroupCommitWriter(database.DB_NAME, **_settings)
+        return _writer
+
+
+def run_write(fn, *args):
+    """
+    Run fn(conn, *args) as one write transaction and return its result: on
+    the writer in split mode, else under BEGIN IMMEDIATE on a pooled
+    connection (rolled back if fn raises).
+    """
+    writer = active_writer()
+    if writer is not None:
+        return writer.execute(fn, *args)
+    with database.pooled_connection() as conn:
+        conn.execute("BEGIN IMMEDIATE;")
+        result = fn(conn, *args)
+        conn.commit()
+    return result
+
+
+def writer_stats():
+    """Batches committed, writes, largest batch; None when split mode is off."""
+    writer = active_writer()
+    return dict(writer.stats) if writer else None
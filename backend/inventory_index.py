@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+# backend/inventory_index.py
+"""
+In-memory route/date inventory index over the flights table.
+
+(origin, destination) maps to two parallel lists sorted by departure:
+"YYYY-MM-DD HH:MM" keys and flight tuples, so a date window is two bisects.
+refresh() is cheap when nothing changed (one PRAGMA data_version) and
+otherwise reloads only the flights named in change_log since the last refresh.
+
+    index = InventoryIndex()
+    index.build()
+    FlightService.inventory_index = index   # search_flights now serves from it
+"""
+import sys
+import time
+import threading
+from bisect import bisect_left, bisect_right
+
+from backend.database import pooled_connection, DataVersionWatcher
+from backend.change_feed import pruned_past
+
+# Tuple layout of an indexed flight (same order as the flights table)
+FLIGHT_FIELDS = ("flight_id", "flight_number", "origin", "destination", "date", "time", "price",
+                 "available_seats", "duration_minutes", "base_price")
+_SELECT_FLIGHTS = "SELECT " + ", ".join(FLIGHT_FIELDS) + " FROM flights"
+
+# Fall back to a full rebuild when this share of the index changed at once
+REBUILD_RATIO = 0.25
+
+
+class _Route:
+    __slots__ = ("keys", "flights")
+
+    def __init__(self):
+        self.keys = []     # sorted "date time" strings
+        self.flights = []  # flight tuples, parallel to keys
+
+
+class InventoryIndex:
+    def __init__(self):
+        self._routes = {}      # (origin, destination) -> _Route
+        self._by_id = {}       # flight_id -> (route key, departure key)
+        self._lock = threading.RLock()
+        self._watcher = DataVersionWatcher()
+        self._data_version = None
+        self._last_change_id = 0
+        self.stats = {"builds": 0, "refreshes": 0, "rows_reloaded": 0, "last_refresh_ms": 0.0}
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def close(self):
+        """Drop the index and its data_version watcher connection."""
+        with self._lock:
+            self._routes, self._by_id = {}, {}
+            self._data_version = None
+            self._watcher.close()
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+    def build(self):
+        """(Re)load every flight. Returns the number of flights indexed."""
+        with self._lock, pooled_connection() as conn:
+            version = self._watcher.current()
+            conn.execute("BEGIN;")  # one snapshot for the rows and the log position
+            last_change_id = conn.execute("SELECT COALESCE(MAX(change_id), 0) FROM change_log").fetchone()[0]
+
+            grouped = {}
+            cursor = conn.execute(_SELECT_FLIGHTS)
+            while True:
+                rows = cursor.fetchmany(10000)
+                if not rows:
+                    break
+                for row in rows:
+                    flight = self._intern(tuple(row))
+                    grouped.setdefault((flight[2], flight[3]), []).append(flight)
+            conn.rollback()
+
+            routes, by_id = {}, {}
+            for route_key, flights in grouped.items():
+                flights.sort(key=lambda f: (f[4], f[5], f[0]))
+                route = _Route()
+                route.flights = flights
+                route.keys = [self._departure(f) for f in flights]
+                routes[route_key] = route
+                for flight, key in zip(flights, route.keys):
+                    by_id[flight[0]] = (route_key, key)
+
+            self._routes, self._by_id = routes, by_id
+            self._last_change_id = last_change_id
+            self._data_version = version
+            self.stats["builds"] += 1
+            return len(by_id)
+
+    def refresh(self):
+        """
+        Apply changes made since the last build/refresh.
+        Returns the number of flights reloaded (0 if nothing changed).
+        """
+        with self._lock:
+            version = self._watcher.current()
+            if version == self._data_version:
+                return 0
+
+            started = time.perf_counter()
+            with pooled_connection() as conn:
+                conn.execute("BEGIN;")
+                changes = conn.execute("""
+                    SELECT row_id, MAX(change_id) FROM change_log
+                    WHERE table_name = 'flights' AND change_id > ?
+                    GROUP BY row_id
+                """, (self._last_change_id,)).fetchall()
+                rebuild = (len(changes) > max(1000, REBUILD_RATIO * len(self._by_id))
+                           or pruned_past(conn, self._last_change_id))
+
+                changed_ids = [] if rebuild else [row[0] for row in changes]
+                fresh = {}
+                for start in range(0, len(changed_ids), 500):
+                    chunk = changed_ids[start:start + 500]
+                    placeholders = ",".join("?" * len(chunk))
+                    for row in conn.execute(f"{_SELECT_FLIGHTS} WHERE flight_id IN ({placeholders})", chunk):
+                        fresh[row[0]] = self._intern(tuple(row))
+                conn.rollback()
+
+            if rebuild:
+                return self.build()
+
+            for flight_id in changed_ids:
+                self._remove(flight_id)
+                if flight_id in fresh:
+                    self._insert(fresh[flight_id])
+
+            if changes:
+                self._last_change_id = max(self._last_change_id, max(row[1] for row in changes))
+            self._data_version = version
+            self.stats["refreshes"] += 1
+            self.stats["rows_reloaded"] += len(changed_ids)
+            self.stats["last_refresh_ms"] = (time.perf_counter() - started) * 1000
+            return len(changed_ids)
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+    def search(self, origin, destination, date=None, start_date=None, end_date=None):
+        """
+        Flights on a route as dicts (same keys as a flights row), ordered by
+        date/time. `date` picks one day; start_date/end_date an inclusive window.
+        """
+        if date:
+            start_date = end_date = date
+        with self._lock:
+            route = self._routes.get((origin, destination))
+            if route is None:
+                return []
+            lo = bisect_left(route.keys, start_date) if start_date else 0
+            hi = bisect_right(route.keys, end_date + "\uffff") if end_date else len(route.keys)
+            flights = route.flights[lo:hi]
+        return [dict(zip(FLIGHT_FIELDS, f)) for f in flights]
+
+    def routes(self):
+        with self._lock:
+            return list(self._routes)
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _intern(flight):
+        # Cities, dates and times repeat across thousands of rows: share them.
+        fid, number, origin, destination, date, time_, price, seats, duration, base_price = flight
+        return (fid, number, sys.intern(origin), sys.intern(destination),
+                sys.intern(date), sys.intern(time_), price, seats, duration, base_price)
+
+    @staticmethod
+    def _departure(flight):
+        return sys.intern(f"{flight[4]} {flight[5]}")
+
+    def _insert(self, flight):
+        route_key = (flight[2], flight[3])
+        route = self._routes.get(route_key)
+        if route is None:
+            route = self._routes[route_key] = _Route()
+        key = self._departure(flight)
+        pos = bisect_right(route.keys, key)
+        # keep flight_id order among flights leaving at the same minute
+        while pos > 0 and route.keys[pos - 1] == key and route.flights[pos - 1][0] > flight[0]:
+            pos -= 1
+        route.keys.insert(pos, key)
+        route.flights.insert(pos, flight)
+        self._by_id[flight[0]] = (route_key, key)
+
+    def _remove(self, flight_id):
+        located = self._by_id.pop(flight_id, None)
+        if located is None:
+            return
+        route_key, key = located
+        route = self._routes[route_key]
+        lo, hi = bisect_left(route.keys, key), bisect_right(route.keys, key)
+        for pos in range(lo, hi):
+            if route.flights[pos][0] == flight_id:
+                del route.keys[pos]
+                del route.flights[pos]
+                break
+        if not route.keys:
+            del self._routes[route_key]
@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+# backend/itinerary_search.py
+"""
+Connecting-itinerary search over a precomputed route graph.
+
+RouteGraph loads every flight departing in a date window once and keeps,
+per (origin, destination) pair, departures sorted by time. find_itineraries
+then runs a best-first (A*/time-dependent Dijkstra style) search from the
+origin's departures on the requested day:
+
+- layovers must fall within [min_layover, max_layover] minutes;
+- a leg is only expanded if its arrival airport can still reach the
+  destination within the remaining stops (airport-level BFS);
+- in price mode the heuristic is the cheapest leg into the destination;
+- a partial path is dropped once `limit` settled paths reached the same
+  airport with as many legs no later and no dearer; a cheap arrival too
+  late to connect never shuts out a dearer one that still can.
+
+Results come out in ranking order, so the search stops after `limit` hits.
+"""
+import time
+import heapq
+import threading
+from bisect import bisect_left
+from collections import deque
+from datetime import date as _date, timedelta
+
+from backend.database import pooled_connection, DataVersionWatcher
+
+LEG_FIELDS = ("flight_id", "flight_number", "origin", "destination", "date", "time", "price",
+              "available_seats", "duration_minutes")
+DEFAULT_BLOCK_MINUTES = 120   # used when a flight has no duration_minutes
+MIN_LAYOVER_MINUTES = 45
+MAX_LAYOVER_MINUTES = 6 * 60
+MAX_JOURNEY_DAYS = 2          # how far past the travel date a graph must reach
+GRAPH_MAX_AGE_SECONDS = 30    # a changed graph is rebuilt at most this often
+
+
+def _minutes(day_ordinal, time_str):
+    return day_ordinal * 1440 + int(time_str[:2]) * 60 + int(time_str[3:5])
+
+
+def _format_minutes(minutes):
+    day, rest = divmod(minutes, 1440)
+    return f"{_date.fromordinal(day).isoformat()} {rest // 60:02d}:{rest % 60:02d}"
+
+
+class RouteGraph:
+    """Flights departing between start_date and end_date, grouped by route."""
+
+    def __init__(self, start_date, end_date):
+        self.start_date = start_date
+        self.end_date = end_date
+        self.routes = {}        # (origin, destination) -> (dep_minutes list, legs list)
+        self.out_edges = {}     # airport -> set of airports reachable in one leg
+        self.in_edges = {}      # airport -> set of airports with a leg into it
+        self.min_price_in = {}  # airport -> cheapest leg arriving there
+        self.flight_count = 0
+        self._hops_cache = {}
+        self._watcher = DataVersionWatcher()
+        self.data_version = None
+        self.built_at = 0.0
+        self.build()
+
+    def build(self):
+        self.data_version = self._watcher.current()
+        self.built_at = time.monotonic()
+        ordinals = {}
+        grouped = {}
+        with pooled_connection() as conn:
+            cursor = conn.execute(
+                f"SELECT {', '.join(LEG_FIELDS)} FROM flights WHERE date BETWEEN ? AND ?",
+                (self.start_date, self.end_date),
+            )
+            while True:
+                rows = cursor.fetchmany(10000)
+                if not rows:
+                    break
+                for row in rows:
+                    flight = tuple(row)
+                    day = ordinals.get(flight[4])
+                    if day is None:
+                        day = ordinals[flight[4]] = _date.fromisoformat(flight[4]).toordinal()
+                    dep = _minutes(day, flight[5])
+                    arr = dep + (flight[8] or DEFAULT_BLOCK_MINUTES)
+                    grouped.setdefault((flight[2], flight[3]), []).append((dep, arr, flight))
+
+        self.routes, self.out_edges, self.in_edges, self.min_price_in = {}, {}, {}, {}
+        for (origin, destination), legs in grouped.items():
+            legs.sort(key=lambda leg: leg[0])
+            self.routes[(origin, destination)] = ([leg[0] for leg in legs], legs)
+            self.out_edges.setdefault(origin, set()).add(destination)
+            self.in_edges.setdefault(destination, set()).add(origin)
+            cheapest = min(leg[2][6] for leg in legs)
+            if cheapest < self.min_price_in.get(destination, float("inf")):
+                self.min_price_in[destination] = cheapest
+        self.flight_count = sum(len(legs) for _, legs in self.routes.values())
+        self._hops_cache = {}
+
+    def is_stale(self):
+        """
+        Changed since built and older than GRAPH_MAX_AGE_SECONDS. Seat counts
+        may lag by that much; create_booking re-checks seats atomically anyway.
+        """
+        if time.monotonic() - self.built_at < GRAPH_MAX_AGE_SECONDS:
+            return False
+        return self._watcher.current() != self.data_version
+
+    def hops_to(self, destination, max_legs):
+        """Fewest legs from each airport to `destination` (airport-level BFS)."""
+        key = (destination, max_legs)
+        hops = self._hops_cache.get(key)
+        if hops is None:
+            hops = {destination: 0}
+            queue = deque([destination])
+            while queue:
+                airport = queue.popleft()
+                if hops[airport] >= max_legs:
+                    continue
+                for previous in self.in_edges.get(airport, ()):
+                    if previous not in hops:
+                        hops[previous] = hops[airport] + 1
+                        queue.append(previous)
+            self._hops_cache[key] = hops
+        return hops
+
+
+def find_itineraries(graph, origin, destination, date, max_stops=1, sort_by="price", limit=10,
+                     min_layover=MIN_LAYOVER_MINUTES, max_layover=MAX_LAYOVER_MINUTES, seats=1):
+    """
+    Itineraries from origin to destination leaving on `date`, ranked by total
+    price ("price") or arrival time ("arrival"). Returns a list of dicts.
+    """
+    if sort_by not in ("price", "arrival"):
+        raise ValueError("sort_by must be 'price' or 'arrival'")
+    if origin == destination:
+        return []
+
+    max_legs = max_stops + 1
+    hops = graph.hops_to(destination, max_legs)
+    if hops.get(origin, max_legs + 1) > max_legs:
+        return []
+
+    by_price = sort_by == "price"
+    cheapest_last_leg = graph.min_price_in.get(destination, 0.0)
+    day_start = _date.fromisoformat(date).toordinal() * 1440
+    day_end = day_start + 1440
+
+    heap = []
+    counter = 0
+    # entry: (priority, counter, price, arrival, airport, legs)
+    for nxt in graph.out_edges.get(origin, ()):
+        if hops.get(nxt, max_legs + 1) > max_legs - 1:
+            continue
+        deps, legs = graph.routes[(origin, nxt)]
+        for i in range(bisect_left(deps, day_start), bisect_left(deps, day_end)):
+            dep, arr, flight = legs[i]
+            if flight[7] < seats:
+                continue
+            price = flight[6]
+            h = 0.0 if nxt == destination else cheapest_last_leg
+            priority = price + h if by_price else arr
+            counter += 1
+            heapq.heappush(heap, (priority, counter, price, arr, nxt, (legs[i],)))
+
+    results = []
+    settled = {}
+    while heap and len(results) < limit:
+        _, _, price, arr, airport, path = heapq.heappop(heap)
+        if airport == destination:
+            results.append(_itinerary(path, price))
+            continue
+
+        seen = settled.setdefault((airport, len(path)), [])
+        if sum(seen_arr <= arr and seen_price <= price for seen_arr, seen_price in seen) >= limit:
+            continue
+        seen.append((arr, price))
+
+        remaining = max_legs - len(path)
+        visited = {leg[2][2] for leg in path}
+        earliest, latest = arr + min_layover, arr + max_layover
+        for nxt in graph.out_edges.get(airport, ()):
+            if nxt in visited or hops.get(nxt, max_legs + 1) > remaining - 1:
+                continue
+            deps, legs = graph.routes[(airport, nxt)]
+            i = bisect_left(deps, earliest)
+            while i < len(deps) and deps[i] <= latest:
+                dep, leg_arr, flight = legs[i]
+                i += 1
+                if flight[7] < seats:
+                    continue
+                total = price + flight[6]
+                h = 0.0 if nxt == destination else cheapest_last_leg
+                priority = total + h if by_price else leg_arr
+                counter += 1
+                heapq.heappush(heap, (priority, counter, total, leg_arr, nxt, path + (legs[i - 1],)))
+
+    return results
+
+
+def _itinerary(path, price):
+    departure, arrival = path[0][0], path[-1][1]
+    return {
+        "legs": [dict(zip(LEG_FIELDS, leg[2])) for leg in path],
+        "stops": len(path) - 1,
+        "total_price": round(price, 2),
+        "departure": _format_minutes(departure),
+        "arrival": _format_minutes(arrival),
+        "total_minutes": arrival - departure,
+        "layovers": [path[i + 1][0] - path[i][1] for i in range(len(path) - 1)],
+    }
+
+
+# ------------------------------------------------------------------------------
+# Shared graphs, rebuilt when the flights table changes
+# ------------------------------------------------------------------------------
+_graphs = {}
+_graphs_lock = threading.Lock()
+
+
+def get_route_graph(date):
+    """A fresh RouteGraph covering `date` .. `date` + MAX_JOURNEY_DAYS."""
+    end_date = (_date.fromisoformat(date) + timedelta(days=MAX_JOURNEY_DAYS)).isoformat()
+    with _graphs_lock:
+        graph = _graphs.get(date)
+        if graph is None or graph.is_stale():
+            graph = RouteGraph(date, end_date)
+            _graphs[date] = graph
+            # keep only a handful of windows around
+            while len(_graphs) > 8:
+                _graphs.pop(next(iter(_graphs)))
+        return graph
@@ -0,0 +1,338 @@
+# -*- coding: utf-8 -*-
+# backend/metrics.py
+"""
+Latency instrumentation for the services and their SQL.
+
+    from backend import metrics
+    metrics.enable(slow_query_ms=50)
+    ...
+    snap = metrics.snapshot()   # {"services": {...}, "sql": {...}, "slow_queries": [...]}
+    metrics.report()            # same, printed
+    metrics.disable()
+
+While enabled:
+- every public FlightService / BookingService / UserService method is
+  wrapped to record its latency and the rows it returned;
+- every pooled connection (and the group-commit writer's, per batch) gets
+  a sqlite3 trace callback. SQLite reports when a statement starts, so a
+  statement's time runs until the next one starts on that connection or
+  the connection goes back to the pool (fetching its rows included). Trigger bodies count towards the statement
+  that fired them. Statements are grouped with their literals replaced by ?.
+- statements slower than slow_query_ms are kept with their plan.
+
+Disabled (the default), the wrappers are removed and the pool skips the
+tracer, so the cost is one global lookup per checkout.
+"""
+import re
+import math
+import time
+import sqlite3
+import inspect
+import functools
+import threading
+from collections import deque
+
+from backend import database
+
+SLOW_QUERY_MS = 100.0
+SLOW_QUERY_LOG_SIZE = 50
+
+# Histogram buckets grow by 10%: percentiles are within ~10% of exact.
+_GROWTH = 1.1
+_LOG_GROWTH = math.log(_GROWTH)
+
+
+class Histogram:
+    """Log-bucketed latency histogram (microseconds) with row counts."""
+
+    __slots__ = ("count", "errors", "total", "max", "rows", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.rows = 0
+        self.buckets = {}
+
+    def add(self, seconds, rows=None, error=False):
+        us = seconds * 1e6
+        bucket = int(math.log(us) / _LOG_GROWTH) + 1 if us >= 1 else 0
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total += us
+        if us > self.max:
+            self.max = us
+        if rows:
+            self.rows += rows
+        if error:
+            self.errors += 1
+
+    def percentile(self, q):
+        """Upper bound of the bucket holding the q-th percentile, in ms."""
+        if not self.count:
+            return 0.0
+        rank = q / 100 * self.count
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                return min(_GROWTH ** bucket, self.max) / 1000
+        return self.max / 1000
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "p50_ms": round(self.percentile(50), 3),
+            "p95_ms": round(self.percentile(95), 3),
+            "p99_ms": round(self.percentile(99), 3),
+            "max_ms": round(self.max / 1000, 3),
+            "mean_ms": round(self.total / self.count / 1000, 3) if self.count else 0.0,
+            "total_ms": round(self.total / 1000, 1),
+            "rows": self.rows,
+        }
+
+
+# ------------------------------------------------------------------------------
+# SQL normalization
+# ------------------------------------------------------------------------------
+# string literals, and numbers that are not part of an identifier
+_LITERAL_RE = re.compile(r"'[^']*'|(?<![\w.])\d[\d.]*")
+
+
+def normalize_sql(sql):
+    """Statement shape: literals -> ?, whitespace collapsed."""
+    return " ".join(_LITERAL_RE.sub("?", sql).split())
+
+
+# ------------------------------------------------------------------------------
+# Registry
+# ------------------------------------------------------------------------------
+class _Registry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.services = {}
+        self.sql = {}
+        self.slow = deque(maxlen=SLOW_QUERY_LOG_SIZE)
+        self.slow_query_seconds = SLOW_QUERY_MS / 1000
+        self.enabled_at = None
+
+    def record_service(self, name, seconds, rows, error=False):
+        with self.lock:
+            hist = self.services.get(name)
+            if hist is None:
+                hist = self.services[name] = Histogram()
+            hist.add(seconds, rows, error)
+
+    def record_sql(self, sql, seconds, db_name):
+        shape = normalize_sql(sql)
+        with self.lock:
+            hist = self.sql.get(shape)
+            if hist is None:
+                hist = self.sql[shape] = Histogram()
+            hist.add(seconds)
+            if seconds >= self.slow_query_seconds:
+                self.slow.append({
+                    "sql": sql, "shape": shape, "ms": round(seconds * 1000, 2),
+                    "at": time.strftime("%Y-%m-%d %H:%M:%S"), "db": db_name, "plan": None,
+                })
+
+    def reset(self):
+        with self.lock:
+            self.services.clear()
+            self.sql.clear()
+            self.slow.clear()
+
+
+_registry = _Registry()
+
+
+# ------------------------------------------------------------------------------
+# SQL tracing (installed as database.connection_tracer)
+# ------------------------------------------------------------------------------
+class _StatementClock:
+    """Trace callback for one connection: times statement start to start."""
+
+    __slots__ = ("db_name", "sql", "started")
+
+    def __init__(self, db_name):
+        self.db_name = db_name
+        self.sql = None
+        self.started = 0.0
+
+    def __call__(self, sql):
+        # Trigger sub-programs are reported with the parent's text again.
+        if sql == self.sql:
+            return
+        now = time.perf_counter()
+        if self.sql is not None:
+            _registry.record_sql(self.sql, now - self.started, self.db_name)
+        self.sql, self.started = sql, now
+
+    def finish(self):
+        if self.sql is not None:
+            _registry.record_sql(self.sql, time.perf_counter() - self.started, self.db_name)
+            self.sql = None
+
+
+class _Tracer:
+    """Gives each checked-out connection its own statement clock."""
+
+    def __init__(self):
+        self._clocks = {}   # id(conn) -> _StatementClock while checked out
+
+    def attach(self, conn):
+        clock = self._clocks[id(conn)] = _StatementClock(database.DB_NAME)
+        conn.set_trace_callback(clock)
+
+    def detach(self, conn):
+        conn.set_trace_callback(None)
+        clock = self._clocks.pop(id(conn), None)
+        if clock is not None:
+            clock.finish()
+
+
+_tracer = _Tracer()
+
+
+# ------------------------------------------------------------------------------
+# Service method timing
+# ------------------------------------------------------------------------------
+_originals = {}   # (class, attribute) -> original staticmethod
+
+
+def _row_count(result):
+    if result is None or isinstance(result, bool):
+        return None
+    if isinstance(result, (list, tuple)):
+        return len(result)
+    if isinstance(result, dict):
+        items = result.get("items")
+        return len(items) if isinstance(items, list) else 1
+    return None
+
+
+def _timed(name, fn):
+    @functools.wraps(fn)
+    def timed(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException:
+            _registry.record_service(name, time.perf_counter() - started, None, error=True)
+            raise
+        _registry.record_service(name, time.perf_counter() - started, _row_count(result))
+        return result
+    return timed
+
+
+def _service_classes():
+    from backend.flight_service import FlightService
+    from backend.booking_service import BookingService
+    from backend.user_service import UserService
+    return (FlightService, BookingService, UserService)
+
+
+def _instrument(classes):
+    for cls in classes:
+        for attr, value in list(vars(cls).items()):
+            if attr.startswith("_") or not isinstance(value, staticmethod):
+                continue
+            fn = value.__func__
+            # generators return before doing any work; timing them would lie
+            if inspect.isgeneratorfunction(inspect.unwrap(fn)):
+                continue
+            _originals[(cls, attr)] = value
+            setattr(cls, attr, staticmethod(_timed(f"{cls.__name__}.{attr}", fn)))
+
+
+def _uninstrument():
+    for (cls, attr), value in _originals.items():
+        setattr(cls, attr, value)
+    _originals.clear()
+
+
+# ------------------------------------------------------------------------------
+# Public API
+# ------------------------------------------------------------------------------
+def enable(slow_query_ms=SLOW_QUERY_MS):
+    """Start timing service methods and SQL."""
+    _registry.slow_query_seconds = slow_query_ms / 1000
+    if database.connection_tracer is _tracer:
+        return
+    _instrument(_service_classes())
+    database.connection_tracer = _tracer
+    _registry.enabled_at = time.time()
+
+
+def disable():
+    """Stop timing; collected numbers are kept until reset()."""
+    if database.connection_tracer is not _tracer:
+        return
+    database.connection_tracer = None
+    _uninstrument()
+    _registry.enabled_at = None
+
+
+def is_enabled():
+    return database.connection_tracer is _tracer
+
+
+def reset():
+    _registry.reset()
+
+
+def _plan(entry):
+    """EXPLAIN QUERY PLAN for a logged slow statement, on a private connection."""
+    head = entry["sql"].lstrip().split(None, 1)[0].upper() if entry["sql"].strip() else ""
+    if head not in ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE", "REPLACE"):
+        return []
+    try:
+        conn = sqlite3.connect(entry["db"])
+        try:
+            return [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + entry["sql"])]
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        return [f"(no plan: {e})"]
+
+
+def slow_queries():
+    """Logged slow statements, newest first, each with its query plan."""
+    with _registry.lock:
+        entries = list(_registry.slow)
+    for entry in entries:
+        if entry["plan"] is None:
+            entry["plan"] = _plan(entry)
+    return [dict(entry) for entry in reversed(entries)]
+
+
+def snapshot():
+    """Summaries for every service method and statement shape seen so far."""
+    with _registry.lock:
+        services = {name: hist.summary() for name, hist in _registry.services.items()}
+        sql = {shape: hist.summary() for shape, hist in _registry.sql.items()}
+    return {
+        "enabled": is_enabled(),
+        "services": dict(sorted(services.items(), key=lambda kv: -kv[1]["total_ms"])),
+        "sql": dict(sorted(sql.items(), key=lambda kv: -kv[1]["total_ms"])),
+        "slow_queries": slow_queries(),
+    }
+
+
+def report(top=15):
+    """Print the busiest service methods and statements."""
+    snap = snapshot()
+    print(f"📊 Instrumentation {'on' if snap['enabled'] else 'off'}")
+    print("🧩 Services (by total time):")
+    for name, s in list(snap["services"].items())[:top]:
+        print(f"   {name:<42} n={s['count']:<7} p50={s['p50_ms']:.2f} p95={s['p95_ms']:.2f} "
+              f"p99={s['p99_ms']:.2f} ms rows={s['rows']}")
+    print("🗄️ SQL (by total time):")
+    for shape, s in list(snap["sql"].items())[:top]:
+        print(f"   {shape[:70]:<70} n={s['count']:<7} p50={s['p50_ms']:.2f} p99={s['p99_ms']:.2f} ms")
+    for entry in snap["slow_queries"][:top]:
+        print(f"🐢 {entry['ms']:.1f} ms at {entry['at']}: {entry['shape'][:90]}")
+        for line in entry["plan"]:
+            print(f"      {line}")
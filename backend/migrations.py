@@ -0,0 +1,641 @@
+# -*- coding: utf-8 -*-
+# backend/migrations.py
+"""
+Versioned schema migrations keyed on `PRAGMA user_version`.
+
+Each migration is (version, description, steps) where a step is either a SQL
+string or a callable taking the connection. Pending migrations are applied in
+order, each in its own transaction, and recorded in `schema_migrations`
+together with how long they took.
+"""
+import time
+import sqlite3
+from datetime import datetime
+
+
+def _add_column(table, column, decl):
+    """Step that adds a column unless it already exists (ALTER has no IF NOT EXISTS)."""
+    def step(conn):
+        columns = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+        if column not in columns:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {decl}")
+    return step
+
+
+def _seed_seat_layouts(conn):
+    from backend.seat_map import BUILTIN_LAYOUTS
+    conn.executemany("INSERT OR IGNORE INTO seat_layouts (name, spec) VALUES (?, ?)", BUILTIN_LAYOUTS.items())
+
+
+def _rebuild_revenue(conn):
+    from backend.revenue import rebuild_tables
+    rebuild_tables(conn)
+
+
+MIGRATIONS = [
+    (1, "Covering index for route/date flight search", [
+        """
+        CREATE INDEX IF NOT EXISTS idx_flights_route_date
+        ON flights (origin, destination, date, time, flight_number, price, available_seats)
+        """,
+    ]),
+    (2, "Covering index for bookings by user", [
+        """
+        CREATE INDEX IF NOT EXISTS idx_bookings_user
+        ON bookings (user_id, flight_id, seat_count, booking_date, total_price)
+        """,
+    ]),
+    (3, "Index for bookings by flight", [
+        """
+        CREATE INDEX IF NOT EXISTS idx_bookings_flight
+        ON bookings (flight_id, seat_count)
+        """,
+    ]),
+    (4, "Index for schedule upserts on (flight_number, date)", [
+        """
+        CREATE INDEX IF NOT EXISTS idx_flights_number_date
+        ON flights (flight_number, date)
+        """,
+    ]),
+    (5, "Index for admin bookings listing by booking date", [
+        """
+        CREATE INDEX IF NOT EXISTS idx_bookings_booking_date
+        ON bookings (booking_date)
+        """,
+    ]),
+    (6, "Change log fed by triggers on flights", [
+        """
+        CREATE TABLE IF NOT EXISTS change_log (
+            change_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            table_name TEXT NOT NULL,
+            row_id INTEGER NOT NULL,
+            op TEXT NOT NULL,
+            changed_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now'))
+        )
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_flights_log_insert AFTER INSERT ON flights
+        BEGIN
+            INSERT INTO change_log (table_name, row_id, op) VALUES ('flights', NEW.flight_id, 'I');
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_flights_log_update AFTER UPDATE ON flights
+        BEGIN
+            INSERT INTO change_log (table_name, row_id, op) VALUES ('flights', NEW.flight_id, 'U');
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_flights_log_delete AFTER DELETE ON flights
+        BEGIN
+            INSERT INTO change_log (table_name, row_id, op) VALUES ('flights', OLD.flight_id, 'D');
+        END
+        """,
+    ]),
+    (7, "Optional block time on flights for connection search", [
+        _add_column("flights", "duration_minutes", "INTEGER"),
+        # keep the route/date index covering for SELECT *
+        "DROP INDEX IF EXISTS idx_flights_route_date",
+        """
+        CREATE INDEX idx_flights_route_date
+        ON flights (origin, destination, date, time, flight_number, price, available_seats, duration_minutes)
+        """,
+    ]),
+    (8, "Index for departures by date (route graph loading)", [
+        """
+        CREATE INDEX IF NOT EXISTS idx_flights_date
+        ON flights (date, time)
+        """,
+    ]),
+    (9, "Materialized per-day fares for hot routes", [
+        """
+        CREATE TABLE IF NOT EXISTS hot_routes (
+            origin TEXT NOT NULL,
+            destination TEXT NOT NULL,
+            PRIMARY KEY (origin, destination)
+        ) WITHOUT ROWID
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS route_day_fares (
+            origin TEXT NOT NULL,
+            destination TEXT NOT NULL,
+            date TEXT NOT NULL,
+            min_price REAL NOT NULL,
+            seats INTEGER NOT NULL,
+            flights INTEGER NOT NULL,
+            PRIMARY KEY (origin, destination, date)
+        ) WITHOUT ROWID
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_flights_fares_insert AFTER INSERT ON flights
+        WHEN EXISTS (SELECT 1 FROM hot_routes h WHERE h.origin = NEW.origin AND h.destination = NEW.destination)
+        BEGIN
+            DELETE FROM route_day_fares
+            WHERE origin = NEW.origin AND destination = NEW.destination AND date = NEW.date;
+            INSERT INTO route_day_fares (origin, destination, date, min_price, seats, flights)
+            SELECT origin, destination, date, MIN(price), SUM(available_seats), COUNT(*)
+            FROM flights
+            WHERE origin = NEW.origin AND destination = NEW.destination AND date = NEW.date
+              AND available_seats > 0
+            GROUP BY origin, destination, date;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_flights_fares_update
+        AFTER UPDATE OF origin, destination, date, price, available_seats ON flights
+        WHEN EXISTS (SELECT 1 FROM hot_routes h WHERE h.origin = NEW.origin AND h.destination = NEW.destination)
+        BEGIN
+            DELETE FROM route_day_fares
+            WHERE origin = NEW.origin AND destination = NEW.destination AND date = NEW.date;
+            INSERT INTO route_day_fares (origin, destination, date, min_price, seats, flights)
+            SELECT origin, destination, date, MIN(price), SUM(available_seats), COUNT(*)
+            FROM flights
+            WHERE origin = NEW.origin AND destination = NEW.destination AND date = NEW.date
+              AND available_seats > 0
+            GROUP BY origin, destination, date;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_flights_fares_move
+        AFTER UPDATE OF origin, destination, date ON flights
+        WHEN (OLD.origin, OLD.destination, OLD.date) IS NOT (NEW.origin, NEW.destination, NEW.date)
+         AND EXISTS (SELECT 1 FROM hot_routes h WHERE h.origin = OLD.origin AND h.destination = OLD.destination)
+        BEGIN
+            DELETE FROM route_day_fares
+            WHERE origin = OLD.origin AND destination = OLD.destination AND date = OLD.date;
+            INSERT INTO route_day_fares (origin, destination, date, min_price, seats, flights)
+            SELECT origin, destination, date, MIN(price), SUM(available_seats), COUNT(*)
+            FROM flights
+            WHERE origin = OLD.origin AND destination = OLD.destination AND date = OLD.date
+              AND available_seats > 0
+            GROUP BY origin, destination, date;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_flights_fares_delete AFTER DELETE ON flights
+        WHEN EXISTS (SELECT 1 FROM hot_routes h WHERE h.origin = OLD.origin AND h.destination = OLD.destination)
+        BEGIN
+            DELETE FROM route_day_fares
+            WHERE origin = OLD.origin AND destination = OLD.destination AND date = OLD.date;
+            INSERT INTO route_day_fares (origin, destination, date, min_price, seats, flights)
+            SELECT origin, destination, date, MIN(price), SUM(available_seats), COUNT(*)
+            FROM flights
+            WHERE origin = OLD.origin AND destination = OLD.destination AND date = OLD.date
+              AND available_seats > 0
+            GROUP BY origin, destination, date;
+        END
+        """,
+    ]),
+    (10, "Index for the flights table sorted by price", [
+        """
+        CREATE INDEX IF NOT EXISTS idx_flights_price
+        ON flights (price)
+        """,
+    ]),
+    (11, "FTS5 search index over flights and bookings", [
+        # Flights: external-content index over the flights table itself
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS flights_fts USING fts5(
+            flight_number, origin, destination,
+            content = 'flights', content_rowid = 'flight_id',
+            tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3'
+        )
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_flights_fts_insert AFTER INSERT ON flights BEGIN
+            INSERT INTO flights_fts (rowid, flight_number, origin, destination)
+            VALUES (NEW.flight_id, NEW.flight_number, NEW.origin, NEW.destination);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_flights_fts_delete AFTER DELETE ON flights BEGIN
+            INSERT INTO flights_fts (flights_fts, rowid, flight_number, origin, destination)
+            VALUES ('delete', OLD.flight_id, OLD.flight_number, OLD.origin, OLD.destination);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_flights_fts_update
+        AFTER UPDATE OF flight_number, origin, destination ON flights BEGIN
+            INSERT INTO flights_fts (flights_fts, rowid, flight_number, origin, destination)
+            VALUES ('delete', OLD.flight_id, OLD.flight_number, OLD.origin, OLD.destination);
+            INSERT INTO flights_fts (rowid, flight_number, origin, destination)
+            VALUES (NEW.flight_id, NEW.flight_number, NEW.origin, NEW.destination);
+            UPDATE bookings_fts
+            SET flight_number = NEW.flight_number, origin = NEW.origin, destination = NEW.destination
+            WHERE rowid IN (SELECT booking_id FROM bookings WHERE flight_id = NEW.flight_id);
+        END
+        """,
+        "INSERT INTO flights_fts (flights_fts) VALUES ('rebuild')",
+        # Bookings: one document per booking; the owner token ("u<user_id>")
+        # lets a per-user search intersect posting lists inside FTS.
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS bookings_fts USING fts5(
+            owner, flight_number, origin, destination,
+            tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3'
+        )
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_bookings_fts_insert AFTER INSERT ON bookings BEGIN
+            INSERT INTO bookings_fts (rowid, owner, flight_number, origin, destination)
+            SELECT NEW.booking_id, 'u' || NEW.user_id, f.flight_number, f.origin, f.destination
+            FROM flights f WHERE f.flight_id = NEW.flight_id;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_bookings_fts_delete AFTER DELETE ON bookings BEGIN
+            DELETE FROM bookings_fts WHERE rowid = OLD.booking_id;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_bookings_fts_update
+        AFTER UPDATE OF user_id, flight_id ON bookings BEGIN
+            DELETE FROM bookings_fts WHERE rowid = OLD.booking_id;
+            INSERT INTO bookings_fts (rowid, owner, flight_number, origin, destination)
+            SELECT NEW.booking_id, 'u' || NEW.user_id, f.flight_number, f.origin, f.destination
+            FROM flights f WHERE f.flight_id = NEW.flight_id;
+        END
+        """,
+        """
+        INSERT INTO bookings_fts (rowid, owner, flight_number, origin, destination)
+        SELECT b.booking_id, 'u' || b.user_id, f.flight_number, f.origin, f.destination
+        FROM bookings b JOIN flights f ON f.flight_id = b.flight_id
+        """,
+    ]),
+    (12, "Bitmap seat maps per flight and seat numbers on bookings", [
+        """
+        CREATE TABLE IF NOT EXISTS seat_layouts (
+            name TEXT PRIMARY KEY,
+            spec TEXT NOT NULL
+        )
+        """,
+        # occupied: one bit per seat of the layout, 1 = taken (backend.seat_map)
+        """
+        CREATE TABLE IF NOT EXISTS seat_maps (
+            flight_id INTEGER PRIMARY KEY REFERENCES flights(flight_id) ON DELETE CASCADE,
+            layout TEXT NOT NULL REFERENCES seat_layouts(name),
+            occupied BLOB NOT NULL
+        )
+        """,
+        _add_column("bookings", "seats", "TEXT"),
+        _seed_seat_layouts,
+    ]),
+    # NULL base_price = the published fare is flights.price (backend.pricing)
+    (13, "Base fare column for dynamic pricing", [
+        _add_column("flights", "base_price", "REAL"),
+    ]),
+    # Bookings columns are maintained by BookingService (backend.revenue.record);
+    # flights/seats_available by the triggers below, for every flights writer.
+    (14, "Revenue and load-factor summaries per flight, route and day", [
+        """
+        CREATE TABLE IF NOT EXISTS revenue_by_flight (
+            flight_id INTEGER PRIMARY KEY,
+            bookings INTEGER NOT NULL DEFAULT 0,
+            seats_sold INTEGER NOT NULL DEFAULT 0,
+            revenue REAL NOT NULL DEFAULT 0
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS revenue_by_route (
+            origin TEXT NOT NULL,
+            destination TEXT NOT NULL,
+            flights INTEGER NOT NULL DEFAULT 0,
+            seats_available INTEGER NOT NULL DEFAULT 0,
+            bookings INTEGER NOT NULL DEFAULT 0,
+            seats_sold INTEGER NOT NULL DEFAULT 0,
+            revenue REAL NOT NULL DEFAULT 0,
+            PRIMARY KEY (origin, destination)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS revenue_by_day (
+            date TEXT PRIMARY KEY,
+            flights INTEGER NOT NULL DEFAULT 0,
+            seats_available INTEGER NOT NULL DEFAULT 0,
+            bookings INTEGER NOT NULL DEFAULT 0,
+            seats_sold INTEGER NOT NULL DEFAULT 0,
+            revenue REAL NOT NULL DEFAULT 0
+        )
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_flights_revenue_insert AFTER INSERT ON flights BEGIN
+            INSERT INTO revenue_by_route (origin, destination, flights, seats_available)
+            VALUES (NEW.origin, NEW.destination, 1, NEW.available_seats)
+            ON CONFLICT (origin, destination) DO UPDATE
+            SET flights = flights + 1, seats_available = seats_available + excluded.seats_available;
+            INSERT INTO revenue_by_day (date, flights, seats_available)
+            VALUES (NEW.date, 1, NEW.available_seats)
+            ON CONFLICT (date) DO UPDATE
+            SET flights = flights + 1, seats_available = seats_available + excluded.seats_available;
+        END
+        """,
+        # Same route and day: only the seat count moved (bookings, admin edits)
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_flights_revenue_seats AFTER UPDATE OF available_seats ON flights
+        WHEN OLD.available_seats <> NEW.available_seats
+         AND OLD.origin = NEW.origin AND OLD.destination = NEW.destination AND OLD.date = NEW.date
+        BEGIN
+            UPDATE revenue_by_route SET seats_available = seats_available + NEW.available_seats - OLD.available_seats
+            WHERE origin = NEW.origin AND destination = NEW.destination;
+            UPDATE revenue_by_day SET seats_available = seats_available + NEW.available_seats - OLD.available_seats
+            WHERE date = NEW.date;
+        END
+        """,
+        # Route or day changed: move the whole flight, bookings included
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_flights_revenue_move AFTER UPDATE OF origin, destination, date ON flights
+        WHEN OLD.origin <> NEW.origin OR OLD.destination <> NEW.destination OR OLD.date <> NEW.date
+        BEGIN
+            UPDATE revenue_by_route
+            SET flights = flights - 1, seats_available = seats_available - OLD.available_seats,
+                bookings = bookings - COALESCE((SELECT bookings FROM revenue_by_flight WHERE flight_id = OLD.flight_id), 0),
+                seats_sold = seats_sold - COALESCE((SELECT seats_sold FROM revenue_by_flight WHERE flight_id = OLD.flight_id), 0),
+                revenue = revenue - COALESCE((SELECT revenue FROM revenue_by_flight WHERE flight_id = OLD.flight_id), 0)
+            WHERE origin = OLD.origin AND destination = OLD.destination;
+            UPDATE revenue_by_day
+            SET flights = flights - 1, seats_available = seats_available - OLD.available_seats,
+                bookings = bookings - COALESCE((SELECT bookings FROM revenue_by_flight WHERE flight_id = OLD.flight_id), 0),
+                seats_sold = seats_sold - COALESCE((SELECT seats_sold FROM revenue_by_flight WHERE flight_id = OLD.flight_id), 0),
+                revenue = revenue - COALESCE((SELECT revenue FROM revenue_by_flight WHERE flight_id = OLD.flight_id), 0)
+            WHERE date = OLD.date;
+            DELETE FROM revenue_by_route WHERE origin = OLD.origin AND destination = OLD.destination AND flights = 0;
+            DELETE FROM revenue_by_day WHERE date = OLD.date AND flights = 0;
+            INSERT INTO revenue_by_route (origin, destination, flights, seats_available, bookings, seats_sold, revenue)
+            SELECT NEW.origin, NEW.destination, 1, NEW.available_seats,
+                   COALESCE(r.bookings, 0), COALESCE(r.seats_sold, 0), COALESCE(r.revenue, 0)
+            FROM (SELECT NEW.flight_id AS flight_id) f LEFT JOIN revenue_by_flight r ON r.flight_id = f.flight_id
+            WHERE true
+            ON CONFLICT (origin, destination) DO UPDATE
+            SET flights = flights + 1, seats_available = seats_available + excluded.seats_available,
+                bookings = bookings + excluded.bookings, seats_sold = seats_sold + excluded.seats_sold,
+                revenue = revenue + excluded.revenue;
+            INSERT INTO revenue_by_day (date, flights, seats_available, bookings, seats_sold, revenue)
+            SELECT NEW.date, 1, NEW.available_seats,
+                   COALESCE(r.bookings, 0), COALESCE(r.seats_sold, 0), COALESCE(r.revenue, 0)
+            FROM (SELECT NEW.flight_id AS flight_id) f LEFT JOIN revenue_by_flight r ON r.flight_id = f.flight_id
+            WHERE true
+            ON CONFLICT (date) DO UPDATE
+            SET flights = flights + 1, seats_available = seats_available + excluded.seats_available,
+                bookings = bookings + excluded.bookings, seats_sold = seats_sold + excluded.seats_sold,
+                revenue = revenue + excluded.revenue;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_flights_revenue_delete AFTER DELETE ON flights BEGIN
+            UPDATE revenue_by_route
+            SET flights = flights - 1, seats_available = seats_available - OLD.available_seats,
+                bookings = bookings - COALESCE((SELECT bookings FROM revenue_by_flight WHERE flight_id = OLD.flight_id), 0),
+                seats_sold = seats_sold - COALESCE((SELECT seats_sold FROM revenue_by_flight WHERE flight_id = OLD.flight_id), 0),
+                revenue = revenue - COALESCE((SELECT revenue FROM revenue_by_flight WHERE flight_id = OLD.flight_id), 0)
+            WHERE origin = OLD.origin AND destination = OLD.destination;
+            UPDATE revenue_by_day
+            SET flights = flights - 1, seats_available = seats_available - OLD.available_seats,
+                bookings = bookings - COALESCE((SELECT bookings FROM revenue_by_flight WHERE flight_id = OLD.flight_id), 0),
+                seats_sold = seats_sold - COALESCE((SELECT seats_sold FROM revenue_by_flight WHERE flight_id = OLD.flight_id), 0),
+                revenue = revenue - COALESCE((SELECT revenue FROM revenue_by_flight WHERE flight_id = OLD.flight_id), 0)
+            WHERE date = OLD.date;
+            DELETE FROM revenue_by_route WHERE origin = OLD.origin AND destination = OLD.destination AND flights = 0;
+            DELETE FROM revenue_by_day WHERE date = OLD.date AND flights = 0;
+            DELETE FROM revenue_by_flight WHERE flight_id = OLD.flight_id;
+        END
+        """,
+        _rebuild_revenue,
+    ]),
+    (15, "Change log entries for bookings (live UI refresh)", [
+        # owning user of a bookings entry, so a user's pages skip everyone else's
+        _add_column("change_log", "user_id", "INTEGER"),
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_bookings_log_insert AFTER INSERT ON bookings
+        BEGIN
+            INSERT INTO change_log (table_name, row_id, op, user_id) VALUES ('bookings', NEW.booking_id, 'I', NEW.user_id);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_bookings_log_update AFTER UPDATE ON bookings
+        BEGIN
+            INSERT INTO change_log (table_name, row_id, op, user_id) VALUES ('bookings', NEW.booking_id, 'U', NEW.user_id);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_bookings_log_delete AFTER DELETE ON bookings
+        BEGIN
+            INSERT INTO change_log (table_name, row_id, op, user_id) VALUES ('bookings', OLD.booking_id, 'D', OLD.user_id);
+        END
+        """,
+    ]),
+    (16, "Indexes for the flights table sorted by destination or seats", [
+        # flight_id is the rowid, so it already ends every index as the tie-breaker
+        """
+        CREATE INDEX IF NOT EXISTS idx_flights_destination
+        ON flights (destination, date, time)
+        """,
+        """
+        CREATE INDEX IF NOT EXISTS idx_flights_seats
+        ON flights (available_seats)
+        """,
+    ]),
+]
+
+# Hot queries and the index each one must use.
+HOT_QUERIES = [
+    (
+        "search_flights (with date)",
+        "SELECT * FROM flights WHERE origin = ? AND destination = ? AND date = ? ORDER BY time",
+        ("Cairo", "Paris", "2025-10-25"),
+        "idx_flights_route_date",
+    ),
+    (
+        "search_flights (any date)",
+        "SELECT * FROM flights WHERE origin = ? AND destination = ? ORDER BY date, time",
+        ("Cairo", "Paris"),
+        "idx_flights_route_date",
+    ),
+    (
+        "get_user_bookings",
+        """
+        SELECT b.booking_id, b.flight_id, b.seat_count, b.booking_date, b.total_price,
+               f.flight_number, f.origin, f.destination, f.date, f.time
+        FROM bookings b
+        JOIN flights f ON b.flight_id = f.flight_id
+        WHERE b.user_id = ?
+        ORDER BY f.date ASC
+        """,
+        (1,),
+        "idx_bookings_user",
+    ),
+    (
+        "get_all_bookings_page",
+        """
+        SELECT b.*, u.username, f.flight_number, f.origin, f.destination, f.date, f.time
+        FROM bookings b
+        JOIN users u ON b.user_id = u.user_id
+        JOIN flights f ON b.flight_id = f.flight_id
+        WHERE (b.booking_date, b.booking_id) < (?, ?)
+        ORDER BY b.booking_date DESC, b.booking_id DESC
+        LIMIT 51
+        """,
+        ("2025-10-16 02:51:18", 4),
+        "idx_bookings_booking_date",
+    ),
+    (
+        "get_price_calendar",
+        """
+        SELECT date, MIN(price), SUM(available_seats), COUNT(*)
+        FROM flights
+        WHERE origin = ? AND destination = ? AND date BETWEEN ? AND ? AND available_seats >= ?
+        GROUP BY date
+        """,
+        ("Cairo", "Paris", "2025-10-22", "2025-10-28", 1),
+        "idx_flights_route_date",
+    ),
+    (
+        "get_flights_page (by date)",
+        """
+        SELECT * FROM flights
+        WHERE (date, time, flight_id) > (?, ?, ?)
+        ORDER BY date ASC, time ASC, flight_id ASC
+        LIMIT 201
+        """,
+        ("2025-10-25", "10:00", 1),
+        "idx_flights_date",
+    ),
+    (
+        "get_flights_page (by price)",
+        """
+        SELECT * FROM flights
+        WHERE (price, flight_id) > (?, ?)
+        ORDER BY price ASC, flight_id ASC
+        LIMIT 201
+        """,
+        (300.0, 1),
+        "idx_flights_price",
+    ),
+    (
+        "get_flights_page (by destination)",
+        """
+        SELECT * FROM flights
+        WHERE (destination, date, time, flight_id) > (?, ?, ?, ?)
+        ORDER BY destination ASC, date ASC, time ASC, flight_id ASC
+        LIMIT 201
+        """,
+        ("Paris", "2025-10-25", "10:00", 1),
+        "idx_flights_destination",
+    ),
+    (
+        "get_flights_page (by available seats)",
+        """
+        SELECT * FROM flights
+        WHERE (available_seats, flight_id) > (?, ?)
+        ORDER BY available_seats ASC, flight_id ASC
+        LIMIT 201
+        """,
+        (10, 1),
+        "idx_flights_seats",
+    ),
+    (
+        "bookings by flight",
+        "SELECT SUM(seat_count) FROM bookings WHERE flight_id = ?",
+        (1,),
+        "idx_bookings_flight",
+    ),
+]
+
+
+def current_version(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def latest_version():
+    return MIGRATIONS[-1][0] if MIGRATIONS else 0
+
+
+def migrate(conn, verbose=True):
+    """
+    Apply every pending migration to `conn`.
+    Returns a list of (version, description, duration_ms) that were applied.
+    """
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INTEGER PRIMARY KEY,
+            description TEXT NOT NULL,
+            applied_at TEXT NOT NULL,
+            duration_ms REAL NOT NULL
+        )
+    """)
+    conn.commit()
+
+    applied = []
+    version = current_version(conn)
+    for target, description, steps in MIGRATIONS:
+        if target <= version:
+            continue
+
+        started = time.perf_counter()
+        try:
+            conn.execute("BEGIN IMMEDIATE;")
+            for step in steps:
+                if callable(step):
+                    step(conn)
+                else:
+                    conn.execute(step)
+            duration_ms = (time.perf_counter() - started) * 1000
+            conn.execute("""
+                INSERT OR REPLACE INTO schema_migrations (version, description, applied_at, duration_ms)
+                VALUES (?, ?, ?, ?)
+            """, (target, description, datetime.now().strftime("%Y-%m-%d %H:%M:%S"), duration_ms))
+            conn.execute(f"PRAGMA user_version = {int(target)}")
+            conn.commit()
+        except sqlite3.Error:
+            conn.rollback()
+            raise
+
+        version = target
+        applied.append((target, description, duration_ms))
+        if verbose:
+            print(f"🛠️ Migration {target}: {description} ({duration_ms:.1f} ms)")
+
+    if applied:
+        conn.execute("PRAGMA optimize")
+    return applied
+
+
+def migration_history(conn):
+    """Return the recorded migrations, oldest first."""
+    rows = conn.execute(
+        "SELECT version, description, applied_at, duration_ms FROM schema_migrations ORDER BY version"
+    ).fetchall()
+    return [dict(row) for row in rows]
+
+
+def explain(conn, sql, params=()):
+    """Return the EXPLAIN QUERY PLAN detail lines for `sql`."""
+    rows = conn.execute("EXPLAIN QUERY PLAN " + sql, params).fetchall()
+    return [row[3] for row in rows]
+
+
+def check_query_plans(conn):
+    """
+    Check that each hot query is served by its index.
+    Returns a list of (name, ok, plan_lines).
+    """
+    results = []
+    for name, sql, params, index in HOT_QUERIES:
+        plan = explain(conn, sql, params)
+        ok = any(index in line for line in plan)
+        results.append((name, ok, plan))
+    return results
+
+
+if __name__ == "__main__":
+    from backend.database import initialize_database, pooled_connection
+
+    initialize_database()
+    with pooled_connection() as conn:
+        print(f"📦 Schema version: {current_version(conn)} (latest {latest_version()})")
+        for entry in migration_history(conn):
+            print(f"   v{entry['version']} {entry['description']} — {entry['duration_ms']:.1f} ms at {entry['applied_at']}")
+        failed = False
+        for name, ok, plan in check_query_plans(conn):
+            print(f"{'✅' if ok else '❌'} {name}: {' | '.join(plan)}")
+            failed = failed or not ok
+    if failed:
+        raise SystemExit(1)
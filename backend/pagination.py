@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+# backend/pagination.py
+"""
+Keyset pagination shared by the services.
+
+A page is {"items", "next_cursor", "prev_cursor", "total"}; cursors are
+opaque base64 JSON holding the direction and the sort key of the edge row.
+"""
+import json
+import base64
+
+
+def encode_cursor(direction, key):
+    payload = json.dumps({"d": direction, "k": list(key)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return payload["d"], tuple(payload["k"])
+    except (ValueError, KeyError, TypeError):
+        raise ValueError("Invalid page cursor")
+
+
+def fetch_keyset_page(conn, select_sql, filters, params, order_cols, row_key,
+                      descending, cursor, page_size):
+    """
+    Keyset pagination: seek past the cursor's sort key instead of OFFSET,
+    so every page costs the same no matter how deep the user scrolls.
+    """
+    direction, key = ("next", None)
+    if cursor:
+        direction, key = decode_cursor(cursor)
+    backwards = direction == "prev"
+
+    # Going backwards walks the natural order in reverse, then flips the page.
+    scan_desc = descending != backwards
+    where = list(filters)
+    args = list(params)
+    if key is not None:
+        where.append(f"({', '.join(order_cols)}) {'<' if scan_desc else '>'} ({', '.join('?' * len(key))})")
+        args += list(key)
+
+    sql = select_sql
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY " + ", ".join(f"{col} {'DESC' if scan_desc else 'ASC'}" for col in order_cols)
+    sql += " LIMIT ?"
+    args.append(page_size + 1)
+
+    rows = conn.execute(sql, args).fetchall()
+    has_more = len(rows) > page_size
+    items = [dict(row) for row in rows[:page_size]]
+    if backwards:
+        items.reverse()
+
+    next_cursor = prev_cursor = None
+    if items:
+        first = encode_cursor("prev", row_key(items[0]))
+        last = encode_cursor("next", row_key(items[-1]))
+        if backwards:
+            prev_cursor = first if has_more else None
+            next_cursor = last
+        else:
+            next_cursor = last if has_more else None
+            prev_cursor = first if key is not None else None
+
+    return {"items": items, "next_cursor": next_cursor, "prev_cursor": prev_cursor, "total": None}
@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+# backend/pricing.py
+"""
+Dynamic pricing over the whole flights table.
+
+    python -m backend.pricing [--dry-run] [--today 2030-01-15] [--python]
+
+    from backend import pricing
+    report = pricing.reprice()      # {"repriced": ..., "phases_ms": {...}, ...}
+
+Each upcoming flight's fare is recomputed from its base fare
+(flights.base_price, or price while no reprice has run):
+
+    price = base * load_factor_multiplier * days_out_multiplier
+
+clipped to [floor, ceiling] x base and rounded to `round_to`. The load
+factor is sold / (sold + available) with sold summed from bookings.
+
+Phases:
+- load: one query into column arrays (NumPy when installed);
+- compute: the fare rules as whole-array operations (tier lookups are
+  searchsorted over the rule thresholds); a plain Python loop with the
+  same rules when NumPy is missing;
+- write: only changed prices, staged into a temp table and applied with one
+  UPDATE ... FROM in a single transaction.
+"""
+import sys
+import time
+import bisect
+import sqlite3
+import argparse
+from datetime import date as _date
+
+from backend.database import pooled_connection, read_connection
+from backend.cache import flight_cache
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+DEFAULT_FARE_RULES = {
+    # (minimum load factor, multiplier)
+    "load_factor": [(0.0, 0.90), (0.50, 1.00), (0.75, 1.15), (0.90, 1.35)],
+    # (minimum days to departure, multiplier)
+    "days_out": [(0, 1.30), (3, 1.15), (7, 1.05), (21, 1.00), (60, 0.95)],
+    "floor": 0.60,       # never below 60% of the base fare
+    "ceiling": 2.50,     # never above 250% of the base fare
+    "round_to": 1.0,
+}
+
+_LOAD_SQL = """
+    SELECT f.flight_id, COALESCE(f.base_price, f.price), f.price, f.available_seats,
+           COALESCE(s.sold, 0), f.date
+    FROM flights f
+    LEFT JOIN (
+        SELECT flight_id, SUM(seat_count) AS sold FROM bookings GROUP BY flight_id
+    ) s ON s.flight_id = f.flight_id
+    WHERE f.date >= ?
+"""
+
+
+def _tiers(rules, name):
+    tiers = sorted(rules[name])
+    if not tiers:
+        raise ValueError(f"Fare rule '{name}' needs at least one tier")
+    return [t for t, _ in tiers], [m for _, m in tiers]
+
+
+# ------------------------------------------------------------------------------
+# Phases
+# ------------------------------------------------------------------------------
+def load_inventory(today):
+    """Upcoming flights as columns: ids, base, price, available, sold, date."""
+    with read_connection() as conn:
+        cursor = conn.cursor()
+        cursor.row_factory = None   # plain tuples: no per-row Row objects
+        rows = cursor.execute(_LOAD_SQL, (today,)).fetchall()
+    if not rows:
+        return None
+    ids, base, price, available, sold, dates = zip(*rows)
+    if np is None:
+        return {"ids": ids, "base": base, "price": price, "available": available, "sold": sold, "date": dates}
+    return {
+        "ids": np.array(ids, dtype=np.int64),
+        "base": np.array(base, dtype=np.float64),
+        "price": np.array(price, dtype=np.float64),
+        "available": np.array(available, dtype=np.float64),
+        "sold": np.array(sold, dtype=np.float64),
+        "date": np.array(dates, dtype="datetime64[D]"),
+    }
+
+
+def compute_prices(columns, today, rules):
+    """New price per flight (same order as columns["ids"])."""
+    lf_at, lf_mult = _tiers(rules, "load_factor")
+    days_at, days_mult = _tiers(rules, "days_out")
+    floor, ceiling, step = rules["floor"], rules["ceiling"], rules["round_to"]
+
+    if np is not None:
+        capacity = np.maximum(columns["sold"] + columns["available"], 1.0)
+        load_factor = columns["sold"] / capacity
+        days_out = (columns["date"] - np.datetime64(today, "D")).astype(np.int64)
+        # index of the last tier whose threshold is <= value (clamped to the first)
+        lf_idx = np.maximum(np.searchsorted(lf_at, load_factor, side="right") - 1, 0)
+        days_idx = np.maximum(np.searchsorted(days_at, days_out, side="right") - 1, 0)
+        base = columns["base"]
+        prices = base * np.asarray(lf_mult)[lf_idx] * np.asarray(days_mult)[days_idx]
+        prices = np.clip(prices, base * floor, base * ceiling)
+        return np.round(prices / step) * step
+
+    today_ordinal = _date.fromisoformat(today).toordinal()
+    prices = []
+    for base, available, sold, day in zip(columns["base"], columns["available"], columns["sold"], columns["date"]):
+        load_factor = sold / max(sold + available, 1)
+        days_out = _date.fromisoformat(day).toordinal() - today_ordinal
+        price = (base * lf_mult[max(bisect.bisect_right(lf_at, load_factor) - 1, 0)]
+                 * days_mult[max(bisect.bisect_right(days_at, days_out) - 1, 0)])
+        price = min(max(price, base * floor), base * ceiling)
+        prices.append(round(price / step) * step)
+    return prices
+
+
+def changed_prices(columns, prices):
+    """((flight_id, new price) pairs that differ from the stored price, how many went up)."""
+    if np is not None:
+        changed = np.abs(prices - columns["price"]) >= 0.005
+        raised = int(np.count_nonzero(prices[changed] > columns["price"][changed]))
+        return list(zip(columns["ids"][changed].tolist(), prices[changed].tolist())), raised
+    changes, raised = [], 0
+    for fid, old, new in zip(columns["ids"], columns["price"], prices):
+        if abs(new - old) >= 0.005:
+            changes.append((fid, new))
+            raised += new > old
+    return changes, raised
+
+
+def write_prices(changes):
+    """
+    Apply (flight_id, price) pairs in one transaction; base_price is kept/initialized.
+    Commits on its own even in split mode (see backend.group_commit).
+    """
+    with pooled_connection() as conn:
+        conn.execute("""
+            CREATE TEMP TABLE IF NOT EXISTS flight_reprice_staging (
+                flight_id INTEGER PRIMARY KEY, price REAL NOT NULL
+            )
+        """)
+        try:
+            conn.execute("BEGIN IMMEDIATE;")
+            conn.execute("DELETE FROM flight_reprice_staging")
+            conn.executemany("INSERT INTO flight_reprice_staging (flight_id, price) VALUES (?, ?)", changes)
+            updated = conn.execute("""
+                UPDATE flights
+                SET base_price = COALESCE(flights.base_price, flights.price), price = s.price
+                FROM flight_reprice_staging AS s
+                WHERE flights.flight_id = s.flight_id
+            """).rowcount
+            conn.commit()
+        except sqlite3.Error:
+            conn.rollback()
+            raise
+    flight_cache.clear()
+    return updated
+
+
+# ------------------------------------------------------------------------------
+# Entry points
+# ------------------------------------------------------------------------------
+def reprice(rules=None, today=None, dry_run=False):
+    """
+    Reprice every flight departing today or later.
+    Returns {"engine", "flights", "repriced", "up", "down", "phases_ms", "total_ms"}.
+    """
+    rules = {**DEFAULT_FARE_RULES, **(rules or {})}
+    today = today or _date.today().isoformat()
+    report = {"engine": "numpy" if np is not None else "python", "flights": 0,
+              "repriced": 0, "up": 0, "down": 0, "phases_ms": {}}
+    started = time.perf_counter()
+
+    t0 = time.perf_counter()
+    columns = load_inventory(today)
+    report["phases_ms"]["load"] = (time.perf_counter() - t0) * 1000
+    if columns is not None:
+        t0 = time.perf_counter()
+        prices = compute_prices(columns, today, rules)
+        changes, raised = changed_prices(columns, prices)
+        report["phases_ms"]["compute"] = (time.perf_counter() - t0) * 1000
+        report["flights"] = len(columns["ids"])
+        report["up"], report["down"] = raised, len(changes) - raised
+
+        t0 = time.perf_counter()
+        report["repriced"] = write_prices(changes) if changes and not dry_run else len(changes)
+        report["phases_ms"]["write"] = (time.perf_counter() - t0) * 1000
+
+    report["total_ms"] = (time.perf_counter() - started) * 1000
+    return report
+
+
+def print_report(report, dry_run=False):
+    phases = " | ".join(f"{name} {ms:,.1f} ms" for name, ms in report["phases_ms"].items())
+    verb = "would reprice" if dry_run else "repriced"
+    print(f"💹 [{report['engine']}] {verb} {report['repriced']:,} of {report['flights']:,} flights "
+          f"(⬆️ {report['up']:,} ⬇️ {report['down']:,}) in {report['total_ms']:,.1f} ms — {phases}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Reprice upcoming flights")
+    parser.add_argument("--today", help="reprice as of this date (YYYY-MM-DD)")
+    parser.add_argument("--dry-run", action="store_true", help="compute and report, write nothing")
+    parser.add_argument("--python", action="store_true", help="use the pure-Python path even if NumPy is installed")
+    args = parser.parse_args(argv)
+
+    global np
+    if args.python:
+        np = None
+    report = reprice(today=args.today, dry_run=args.dry_run)
+    print_report(report, args.dry_run)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
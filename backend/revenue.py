@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+# backend/revenue.py
+"""
+Revenue, seats sold and load factor per flight, per route and per
+departure day, kept in summary tables so admin reports never re-aggregate
+bookings x flights.
+
+    python -m backend.revenue report [--by route|day|flight] [--limit 20]
+    python -m backend.revenue check
+    python -m backend.revenue rebuild
+
+Who maintains what (migration 14):
+- bookings / seats_sold / revenue: BookingService calls record() inside the
+  booking or cancellation transaction (direct, batch and group-commit paths);
+- flights / seats_available: triggers on flights, so admin edits, schedule
+  imports and bookings alike keep the per-route and per-day capacity right.
+
+load_factor = seats_sold / (seats_sold + seats_available).
+rebuild() recomputes everything from the raw tables; check() compares the
+summaries with a fresh aggregation and lists the differences.
+"""
+import sys
+import time
+import sqlite3
+import argparse
+
+from backend.database import pooled_connection, read_connection
+
+# Fresh aggregations from the raw tables (rebuild and check)
+_FLIGHT_TOTALS = """
+    SELECT b.flight_id, COUNT(*) AS bookings, SUM(b.seat_count) AS seats_sold, SUM(b.total_price) AS revenue
+    FROM bookings b JOIN flights f ON f.flight_id = b.flight_id
+    GROUP BY b.flight_id
+"""
+_GROUPED_TOTALS = """
+    SELECT {keys}, COUNT(*) AS flights, SUM(f.available_seats) AS seats_available,
+           COALESCE(SUM(s.bookings), 0) AS bookings, COALESCE(SUM(s.seats_sold), 0) AS seats_sold,
+           COALESCE(SUM(s.revenue), 0) AS revenue
+    FROM flights f LEFT JOIN ({flight_totals}) s ON s.flight_id = f.flight_id
+    GROUP BY {keys}
+"""
+_GROUPED_COLUMNS = ("flights", "seats_available", "bookings", "seats_sold", "revenue")
+SUMMARIES = {
+    # table: (key columns, value columns, aggregation)
+    "revenue_by_flight": (("flight_id",), ("bookings", "seats_sold", "revenue"), _FLIGHT_TOTALS),
+    "revenue_by_route": (("origin", "destination"), _GROUPED_COLUMNS, _GROUPED_TOTALS.format(
+        keys="f.origin, f.destination", flight_totals=_FLIGHT_TOTALS)),
+    "revenue_by_day": (("date",), _GROUPED_COLUMNS, _GROUPED_TOTALS.format(
+        keys="f.date", flight_totals=_FLIGHT_TOTALS)),
+}
+REVENUE_TOLERANCE = 0.005
+
+
+# ------------------------------------------------------------------------------
+# Incremental maintenance (callers own the transaction)
+# ------------------------------------------------------------------------------
+def record(conn, flight_id, bookings, seats, revenue):
+    """Add a booking (+1, +seats, +price) or a cancellation (-1, -seats, -price)."""
+    conn.execute("""
+        INSERT INTO revenue_by_flight (flight_id, bookings, seats_sold, revenue) VALUES (?, ?, ?, ?)
+        ON CONFLICT (flight_id) DO UPDATE
+        SET bookings = bookings + excluded.bookings, seats_sold = seats_sold + excluded.seats_sold,
+            revenue = revenue + excluded.revenue
+    """, (flight_id, bookings, seats, revenue))
+    flight = conn.execute(
+        "SELECT origin, destination, date FROM flights WHERE flight_id = ?", (flight_id,)
+    ).fetchone()
+    conn.execute("""
+        UPDATE revenue_by_route
+        SET bookings = bookings + ?, seats_sold = seats_sold + ?, revenue = revenue + ?
+        WHERE origin = ? AND destination = ?
+    """, (bookings, seats, revenue, flight[0], flight[1]))
+    conn.execute("""
+        UPDATE revenue_by_day
+        SET bookings = bookings + ?, seats_sold = seats_sold + ?, revenue = revenue + ?
+        WHERE date = ?
+    """, (bookings, seats, revenue, flight[2]))
+
+
+def rebuild_tables(conn):
+    """Replace every summary with a fresh aggregation; returns rows per table."""
+    counts = {}
+    for table, (keys, values, query) in SUMMARIES.items():
+        conn.execute(f"DELETE FROM {table}")
+        columns = ", ".join(keys + values)
+        counts[table] = conn.execute(f"INSERT INTO {table} ({columns}) SELECT {columns} FROM ({query})").rowcount
+    return counts
+
+
+# ------------------------------------------------------------------------------
+# Admin entry points
+# ------------------------------------------------------------------------------
+def rebuild():
+    """Recompute all summaries in one transaction. Returns {"rows": {...}, "ms": ...}."""
+    started = time.perf_counter()
+    with pooled_connection() as conn:
+        try:
+            conn.execute("BEGIN IMMEDIATE;")
+            counts = rebuild_tables(conn)
+            conn.commit()
+        except sqlite3.Error:
+            conn.rollback()
+            raise
+    return {"rows": counts, "ms": (time.perf_counter() - started) * 1000}
+
+
+def check(limit=20):
+    """
+    Compare the summaries with the raw tables (one consistent snapshot).
+    Returns {"ok", "mismatches": {table: count}, "examples": [...], "ms"}.
+    """
+    started = time.perf_counter()
+    mismatches, examples = {}, []
+    with read_connection() as conn:
+        conn.execute("BEGIN;")
+        try:
+            for table, (keys, _, query) in SUMMARIES.items():
+                expected = {tuple(r[k] for k in keys): dict(r) for r in conn.execute(query)}
+                actual = {tuple(r[k] for k in keys): dict(r) for r in conn.execute(f"SELECT * FROM {table}")}
+                bad = 0
+                for key in expected.keys() | actual.keys():
+                    want, have = expected.get(key), actual.get(key)
+                    if _same(want, have):
+                        continue
+                    bad += 1
+                    if len(examples) < limit:
+                        examples.append({"table": table, "key": key, "expected": want, "actual": have})
+                mismatches[table] = bad
+        finally:
+            conn.rollback()
+    return {"ok": not any(mismatches.values()), "mismatches": mismatches, "examples": examples,
+            "ms": (time.perf_counter() - started) * 1000}
+
+
+def _same(want, have):
+    if want is None or have is None:
+        # a flight with no bookings has no per-flight row; an all-zero row is the same
+        row = want or have
+        return all(not row[c] for c in ("bookings", "seats_sold", "revenue")) and "flights" not in row
+    return all(
+        abs(want[c] - have[c]) <= REVENUE_TOLERANCE if c == "revenue" else want[c] == have[c]
+        for c in want
+    )
+
+
+def _with_load_factor(row):
+    row = dict(row)
+    capacity = row["seats_sold"] + row["seats_available"]
+    row["load_factor"] = row["seats_sold"] / capacity if capacity else 0.0
+    return row
+
+
+_ORDERS = {"revenue": "revenue DESC", "seats": "seats_sold DESC", "load_factor": "load_factor DESC"}
+_LOAD_FACTOR_SQL = "CAST(seats_sold AS REAL) / MAX(seats_sold + seats_available, 1)"
+
+
+def route_report(order_by="revenue", limit=50):
+    """Routes with flights, bookings, seats_sold, revenue and load_factor."""
+    with read_connection() as conn:
+        rows = conn.execute(f"""
+            SELECT *, {_LOAD_FACTOR_SQL} AS load_factor FROM revenue_by_route
+            ORDER BY {_ORDERS[order_by]} LIMIT ?
+        """, (limit,)).fetchall()
+    return [_with_load_factor(r) for r in rows]
+
+
+def daily_report(start_date=None, end_date=None):
+    """One row per departure day in [start_date, end_date], oldest first."""
+    with read_connection() as conn:
+        rows = conn.execute("""
+            SELECT * FROM revenue_by_day
+            WHERE date >= COALESCE(?, date) AND date <= COALESCE(?, date)
+            ORDER BY date
+        """, (start_date, end_date)).fetchall()
+    return [_with_load_factor(r) for r in rows]
+
+
+def flight_report(order_by="revenue", limit=50):
+    """Top flights (by revenue, seats or load factor) that have bookings."""
+    with read_connection() as conn:
+        rows = conn.execute(f"""
+            SELECT r.*, f.flight_number, f.origin, f.destination, f.date, f.available_seats AS seats_available,
+                   CAST(r.seats_sold AS REAL) / MAX(r.seats_sold + f.available_seats, 1) AS load_factor
+            FROM revenue_by_flight r JOIN flights f ON f.flight_id = r.flight_id
+            WHERE r.bookings > 0
+            ORDER BY {_ORDERS[order_by]} LIMIT ?
+        """, (limit,)).fetchall()
+    return [_with_load_factor(r) for r in rows]
+
+
+def totals():
+    """Network-wide totals (summed over the per-day summary)."""
+    with read_connection() as conn:
+        row = conn.execute("""
+            SELECT COALESCE(SUM(flights), 0) AS flights, COALESCE(SUM(seats_available), 0) AS seats_available,
+                   COALESCE(SUM(bookings), 0) AS bookings, COALESCE(SUM(seats_sold), 0) AS seats_sold,
+                   COALESCE(SUM(revenue), 0) AS revenue
+            FROM revenue_by_day
+        """).fetchone()
+    return _with_load_factor(row)
+
+
+# ------------------------------------------------------------------------------
+# CLI
+# ------------------------------------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Revenue and load-factor summaries")
+    sub = parser.add_subparsers(dest="command", required=True)
+    report = sub.add_parser("report", help="print a summary report")
+    report.add_argument("--by", choices=["route", "day", "flight"], default="route")
+    report.add_argument("--order", choices=sorted(_ORDERS), default="revenue")
+    report.add_argument("--limit", type=int, default=20)
+    sub.add_parser("check", help="compare the summaries with bookings and flights")
+    sub.add_parser("rebuild", help="recompute the summaries from scratch")
+    args = parser.parse_args(argv)
+
+    if args.command == "rebuild":
+        result = rebuild()
+        print(f"🔄 Rebuilt revenue summaries in {result['ms']:,.1f} ms: "
+              + ", ".join(f"{table} {rows:,}" for table, rows in result["rows"].items()))
+        return 0
+    if args.command == "check":
+        result = check()
+        for example in result["examples"]:
+            print(f"⚠️ {example['table']} {example['key']}: expected {example['expected']}, found {example['actual']}")
+        status = "✅ Summaries match the raw tables" if result["ok"] else "❌ Summaries differ from the raw tables"
+        print(f"{status} ({result['ms']:,.1f} ms): "
+              + ", ".join(f"{table} {count}" for table, count in result["mismatches"].items()))
+        return 0 if result["ok"] else 1
+
+    total = totals()
+    print(f"💰 {total['revenue']:,.2f} from {total['bookings']:,} bookings, {total['seats_sold']:,} seats "
+          f"on {total['flights']:,} flights (load factor {total['load_factor']:.1%})")
+    if args.by == "day":
+        rows = daily_report()[-args.limit:]
+    elif args.by == "flight":
+        rows = flight_report(args.order, args.limit)
+    else:
+        rows = route_report(args.order, args.limit)
+    for row in rows:
+        label = {"day": lambda r: r["date"],
+                 "flight": lambda r: f"{r['flight_number']} {r['origin']}→{r['destination']} {r['date']}",
+                 "route": lambda r: f"{r['origin']}→{r['destination']}"}[args.by](row)
+        print(f"  {label:<40} {row['revenue']:>12,.2f} | {row['seats_sold']:>6,} seats | "
+              f"{row['bookings']:>5,} bookings | LF {row['load_factor']:6.1%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+# backend/schedule_import.py
+"""
+Stream a flight schedule (CSV or JSONL) into the flights table.
+
+    python -m backend.schedule_import schedule.csv --chunk-size 5000 --upsert
+
+Rows are read lazily and handed to FlightService.bulk_import_flights, which
+inserts them with executemany in one transaction per chunk.
+"""
+import os
+import csv
+import json
+import argparse
+
+from backend.database import initialize_database
+from backend.flight_service import FlightService
+
+
+def iter_csv(path):
+    """Yield one dict per CSV row (header row required)."""
+    with open(path, newline="", encoding="utf-8") as f:
+        yield from csv.DictReader(f)
+
+
+def iter_jsonl(path):
+    """Yield one dict per non-empty JSONL line; bad JSON becomes an empty row."""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                yield {}  # reported as missing fields by the validator
+
+
+def iter_schedule(path, fmt=None):
+    """Pick a reader by `fmt` ("csv"/"jsonl") or by file extension."""
+    fmt = fmt or os.path.splitext(path)[1].lstrip(".").lower()
+    if fmt == "csv":
+        return iter_csv(path)
+    if fmt in ("jsonl", "ndjson", "json"):
+        return iter_jsonl(path)
+    raise ValueError(f"Unsupported schedule format: {fmt!r}")
+
+
+def import_schedule(path, fmt=None, chunk_size=5000, upsert=False, on_chunk=None):
+    """Import a schedule file; returns the bulk import summary."""
+    return FlightService.bulk_import_flights(
+        iter_schedule(path, fmt), chunk_size=chunk_size, upsert=upsert, on_chunk=on_chunk
+    )
+
+
+def _print_chunk(stats):
+    print(
+        f"📦 Chunk {stats['chunk']}: {stats['rows']} rows "
+        f"(+{stats['inserted']} / ~{stats['updated']}) in {stats['seconds'] * 1000:.0f} ms "
+        f"— {stats['rows_per_second']:,.0f} rows/s"
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk import a flight schedule (CSV/JSONL).")
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=["csv", "jsonl"], default=None)
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    parser.add_argument("--upsert", action="store_true", help="update existing (flight_number, date) rows")
+    parser.add_argument("--quiet", action="store_true", help="don't print per-chunk throughput")
+    args = parser.parse_args(argv)
+
+    initialize_database()
+    summary = import_schedule(
+        args.path,
+        fmt=args.format,
+        chunk_size=args.chunk_size,
+        upsert=args.upsert,
+        on_chunk=None if args.quiet else _print_chunk,
+    )
+
+    total = summary["inserted"] + summary["updated"]
+    rate = total / summary["seconds"] if summary["seconds"] else 0
+    print(
+        f"✅ Imported {summary['inserted']} new, updated {summary['updated']}, "
+        f"skipped {summary['skipped']} in {summary['seconds']:.2f}s ({rate:,.0f} rows/s)"
+    )
+    for row_number, error in summary["errors"]:
+        print(f"⚠️ Row {row_number}: {error}")
+    return 1 if "error" in summary else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
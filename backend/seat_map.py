@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+# backend/seat_map.py
+"""
+Per-flight seat maps stored as bitmaps.
+
+A layout is a compact spec of cabins, rows and seat blocks between aisles:
+
+    "J:1-3:AC DF;Y:4-30:ABC DEF"     (cabin:first-last row:blocks)
+
+Seats are numbered row by row, left to right; seat i is bit i of the
+flight's `seat_maps.occupied` blob (1 = taken). An A380 (554 seats) is a
+70-byte blob plus the layout name.
+
+Allocation runs on the whole map at once as a Python int: the free bits,
+ANDed with themselves shifted n-1 times, leave a bit at every seat that
+starts n free seats in a row; masking with the precomputed valid starts for
+n (runs that do not cross an aisle or a row end) and taking the lowest set
+bit gives the frontmost group. When no group fits, the party gets the n
+frontmost free seats instead.
+
+Only flights with a seat map get seat numbers; others keep count-only
+inventory in flights.available_seats.
+"""
+import functools
+
+# Built-in layouts, copied into seat_layouts by migration 12.
+BUILTIN_LAYOUTS = {
+    "A320": "J:1-3:AC DF;Y:4-30:ABC DEF",
+    "B777": "J:1-8:AC DG HK;Y:10-45:ABC DEFG HJK",
+    "A380": "F:1-3:A DG K;J:4-15:AC DG HK;Y:20-66:ABC DEFG HJK",
+}
+
+
+class SeatMapError(ValueError):
+    """Unknown layout, bad seat label, or a map that does not fit the flight."""
+
+
+class CabinLayout:
+    """Parsed layout: seat labels, block positions and allocation masks."""
+
+    def __init__(self, spec):
+        self.spec = spec
+        self.labels = []        # bit index -> "12A"
+        self.cabins = {}        # cabin code -> mask of its seats
+        self.blocks = []        # (cabin, first bit, length)
+        try:
+            for part in spec.split(";"):
+                cabin, rows, blocks = part.split(":")
+                first, last = (int(r) for r in rows.split("-"))
+                for row in range(first, last + 1):
+                    for block in blocks.split():
+                        self.blocks.append((cabin, len(self.labels), len(block)))
+                        self.labels.extend(f"{row}{letter}" for letter in block)
+        except ValueError:
+            raise SeatMapError(f"Invalid seat layout spec: {spec!r}")
+        for cabin, start, length in self.blocks:
+            self.cabins[cabin] = self.cabins.get(cabin, 0) | (((1 << length) - 1) << start)
+        self.index = {label: i for i, label in enumerate(self.labels)}
+        self.capacity = len(self.labels)
+        self.all_seats = (1 << self.capacity) - 1
+        self.blob_size = (self.capacity + 7) // 8
+        self._valid_starts = {}
+
+    def valid_starts(self, n):
+        """Mask of seats that begin n seats in one block."""
+        mask = self._valid_starts.get(n)
+        if mask is None:
+            mask = 0
+            for _, start, length in self.blocks:
+                if length >= n:
+                    mask |= ((1 << (length - n + 1)) - 1) << start
+            self._valid_starts[n] = mask
+        return mask
+
+    def allocate(self, occupied, n, cabin=None):
+        """
+        Pick n free seats: the frontmost group of n adjacent ones, else the
+        n frontmost free seats. Returns the bit indexes, or None if fewer
+        than n are free (in `cabin`, when given).
+        """
+        free = ~occupied & (self.cabins[cabin] if cabin else self.all_seats)
+        if n <= 0 or free.bit_count() < n:
+            return None
+        run = free
+        for _ in range(n - 1):
+            run &= run >> 1
+            if not run:
+                break
+        run &= self.valid_starts(n)
+        if run:
+            first = (run & -run).bit_length() - 1
+            return list(range(first, first + n))
+        seats = []
+        while len(seats) < n:
+            low = free & -free
+            seats.append(low.bit_length() - 1)
+            free ^= low
+        return seats
+
+    def mask(self, seats):
+        bits = 0
+        for i in seats:
+            bits |= 1 << i
+        return bits
+
+    def to_blob(self, occupied):
+        return occupied.to_bytes(self.blob_size, "little")
+
+    def from_blob(self, blob):
+        return int.from_bytes(blob, "little")
+
+
+@functools.lru_cache(maxsize=64)
+def parse_layout(spec):
+    return CabinLayout(spec)
+
+
+# ------------------------------------------------------------------------------
+# Storage (all take a connection; callers own the transaction)
+# ------------------------------------------------------------------------------
+def load_layout(conn, name):
+    row = conn.execute("SELECT spec FROM seat_layouts WHERE name = ?", (name,)).fetchone()
+    if row is None:
+        raise SeatMapError(f"Unknown seat layout: {name}")
+    return parse_layout(row[0])
+
+
+def load(conn, flight_id):
+    """(layout, occupied bits) for a flight, or None if it has no seat map."""
+    row = conn.execute("""
+        SELECT l.spec, m.occupied FROM seat_maps m JOIN seat_layouts l ON l.name = m.layout
+        WHERE m.flight_id = ?
+    """, (flight_id,)).fetchone()
+    if row is None:
+        return None
+    layout = parse_layout(row[0])
+    return layout, layout.from_blob(row[1])
+
+
+def create(conn, flight_id, layout_name):
+    """
+    Give a flight a seat map. Existing bookings get seats (oldest first) and
+    available_seats becomes the layout capacity minus the seats they hold.
+    """
+    layout = load_layout(conn, layout_name)
+    bookings = conn.execute(
+        "SELECT booking_id, seat_count FROM bookings WHERE flight_id = ? ORDER BY booking_id", (flight_id,)
+    ).fetchall()
+    occupied = 0
+    for booking_id, seat_count in bookings:
+        seats = layout.allocate(occupied, seat_count)
+        if seats is None:
+            raise SeatMapError(f"Layout {layout_name} has too few seats for flight {flight_id}'s bookings")
+        occupied |= layout.mask(seats)
+        conn.execute("UPDATE bookings SET seats = ? WHERE booking_id = ?",
+                     (" ".join(layout.labels[i] for i in seats), booking_id))
+    conn.execute("INSERT OR REPLACE INTO seat_maps (flight_id, layout, occupied) VALUES (?, ?, ?)",
+                 (flight_id, layout_name, layout.to_blob(occupied)))
+    conn.execute("UPDATE flights SET available_seats = ? WHERE flight_id = ?",
+                 (layout.capacity - occupied.bit_count(), flight_id))
+    return layout
+
+
+def choose(conn, flight_id, seat_count, cabin=None):
+    """
+    Seats a booking would get, as (labels, new occupied blob); nothing is
+    written until store(). ([], None) when the flight has no seat map, None
+    when the map (or the cabin) has too few free seats.
+    """
+    loaded = load(conn, flight_id)
+    if loaded is None:
+        return [], None
+    layout, occupied = loaded
+    if cabin and cabin not in layout.cabins:
+        raise SeatMapError(f"No cabin {cabin!r} on this flight")
+    seats = layout.allocate(occupied, seat_count, cabin)
+    if seats is None:
+        return None
+    return [layout.labels[i] for i in seats], layout.to_blob(occupied | layout.mask(seats))
+
+
+def store(conn, flight_id, blob):
+    conn.execute("UPDATE seat_maps SET occupied = ? WHERE flight_id = ?", (blob, flight_id))
+
+
+def release(conn, flight_id, labels):
+    """Free the given seats on a flight's map."""
+    loaded = load(conn, flight_id)
+    if loaded is None or not labels:
+        return
+    layout, occupied = loaded
+    try:
+        bits = layout.mask(layout.index[label] for label in labels)
+    except KeyError as e:
+        raise SeatMapError(f"Unknown seat {e.args[0]} for this layout")
+    store(conn, flight_id, layout.to_blob(occupied & ~bits))
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+# backend/text_search.py
+"""
+Turn what a user types into an FTS5 MATCH expression.
+
+Every word becomes a quoted prefix term and all of them must match, so
+"cai par" finds Cairo → Paris and "ak10" finds AK101, AK102, ...
+Quoting each term keeps FTS5 operators (AND, NEAR, "-", ":") typed by the
+user from being interpreted.
+"""
+import re
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+# Column weights for bm25(): a flight number hit ranks above a city hit
+FLIGHT_RANK_WEIGHTS = (10.0, 4.0, 4.0)           # flight_number, origin, destination
+BOOKING_RANK_WEIGHTS = (0.0, 10.0, 4.0, 4.0)     # owner, flight_number, origin, destination
+
+
+def match_expression(text, columns=None):
+    """
+    MATCH expression for `text`, optionally restricted to `columns`.
+    Returns None when there is nothing searchable in it.
+    """
+    words = _WORD_RE.findall(text or "")
+    if not words:
+        return None
+    expression = " AND ".join(f'"{word}"*' for word in words)
+    if columns:
+        expression = "{" + " ".join(columns) + "} : (" + expression + ")"
+    return expression
+
+
+def user_match_expression(user_id, text):
+    """MATCH expression over bookings_fts limited to one user's bookings."""
+    expression = match_expression(text, columns=("flight_number", "origin", "destination"))
+    if expression is None:
+        return None
+    return f'owner : "u{int(user_id)}" AND {expression}'
@@ -2,7 +2,8 @@
 # backend/user_service.py
 import sqlite3
 import hashlib
-from backend.database import get_connection
+from backend.database import read_connection
+from backend import group_commit
 
 class UserService:
     @staticmethod
@@ -16,22 +17,19 @@ class UserService:
         Register a new user.
         Returns True if successful, False if username already exists.
         """
-        conn = get_connection()
-        cursor = conn.cursor()
+        hashed_pw = UserService.hash_password(password)
+        return group_commit.run_write(UserService._insert_user, username, hashed_pw, email, is_admin)
 
+    @staticmethod
+    def _insert_user(conn, username, hashed_pw, email, is_admin):
         # Check if username already exists
-        cursor.execute("SELECT * FROM users WHERE username = ?", (username,))
-        if cursor.fetchone():
-            conn.close()
+        if conn.execute("SELECT 1 FROM users WHERE username = ?", (username,)).fetchone():
             return False  # Username already exists
 
-        hashed_pw = UserService.hash_password(password)
-        cursor.execute("""
+        conn.execute("""
             INSERT INTO users (username, password, email, is_admin)
             VALUES (?, ?, ?, ?)
         """, (username, hashed_pw, email, is_admin))
-        conn.commit()
-        conn.close()
         return True
 
     @staticmethod
@@ -40,16 +38,11 @@ class UserService:
         Validate login credentials.
         Returns a dict of user info if successful, otherwise None.
         """
-        conn = get_connection()
-        cursor = conn.cursor()
-
         hashed_pw = UserService.hash_password(password)
-        cursor.execute("""
-            SELECT * FROM users WHERE username = ? AND password = ?
-        """, (username, hashed_pw))
-
-        user = cursor.fetchone()
-        conn.close()
+        with read_connection() as conn:
+            user = conn.execute("""
+                SELECT * FROM users WHERE username = ? AND password = ?
+            """, (username, hashed_pw)).fetchone()
 
         if user:
             return {
@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+# benchmarks/api_load.py
+#
+# Load generator for backend.api_server: N keep-alive clients issue a mix of
+# searches, flight lookups, booking listings and book+cancel pairs for a
+# fixed time; reports requests/s, latency percentiles per endpoint, and the
+# server's own queue/db split from the Server-Timing header.
+#
+#   python benchmarks/api_load.py --concurrency 1 16 64 --duration 10
+#   python benchmarks/api_load.py --url http://127.0.0.1:8080 --username hamdi --password ...
+#
+# Without --url, a server is started as a subprocess over a generated
+# database (benchmarks.common.generate_database).
+import sys, os
+import re
+import json
+import time
+import random
+import asyncio
+import argparse
+import subprocess
+from urllib.parse import urlsplit
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import generate_database, quiet
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# share of requests per operation; "book" is a POST followed by a DELETE
+MIX = {"search": 0.55, "details": 0.25, "bookings": 0.12, "book": 0.08}
+_TIMING_RE = re.compile(r"(\w+);dur=([\d.]+)")
+
+
+class Client:
+    """Minimal keep-alive HTTP/1.1 JSON client on asyncio streams."""
+
+    def __init__(self, host, port):
+        self.host, self.port = host, port
+        self.reader = self.writer = None
+        self.token = None
+
+    async def connect(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+    async def close(self):
+        if self.writer:
+            self.writer.close()
+            await self.writer.wait_closed()
+
+    async def request(self, method, path, body=None):
+        data = json.dumps(body).encode() if body is not None else b""
+        head = [f"{method} {path} HTTP/1.1", f"Host: {self.host}", f"Content-Length: {len(data)}"]
+        if data:
+            head.append("Content-Type: application/json")
+        if self.token:
+            head.append(f"Authorization: Bearer {self.token}")
+        self.writer.write(("\r\n".join(head) + "\r\n\r\n").encode() + data)
+        await self.writer.drain()
+
+        raw = (await self.reader.readuntil(b"\r\n\r\n")).decode("latin-1").split("\r\n")
+        status = int(raw[0].split(" ")[1])
+        headers = {}
+        for line in raw[1:]:
+            if line:
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+        payload = json.loads(await self.reader.readexactly(int(headers.get("content-length", 0))) or b"null")
+        return status, headers, payload
+
+
+class Stats:
+    def __init__(self):
+        self.latencies = {}     # op -> [seconds]
+        self.statuses = {}      # status -> count
+        self.server = {"queue": 0.0, "db": 0.0, "n": 0}
+
+    def record(self, op, seconds, status, headers):
+        self.latencies.setdefault(op, []).append(seconds)
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        timing = dict(_TIMING_RE.findall(headers.get("server-timing", "")))
+        if timing:
+            self.server["queue"] += float(timing.get("queue", 0))
+            self.server["db"] += float(timing.get("db", 0))
+            self.server["n"] += 1
+
+
+def _pct(sorted_values, q):
+    return sorted_values[min(len(sorted_values) - 1, int(q / 100 * len(sorted_values)))] * 1000
+
+
+async def client_loop(host, port, credentials, workload, deadline, stats, rng):
+    client = Client(host, port)
+    await client.connect()
+    try:
+        status, _, login = await client.request("POST", "/api/login",
+                                                {"username": credentials[0], "password": credentials[1]})
+        if status != 200:
+            raise RuntimeError(f"login failed for {credentials[0]}: {status}")
+        client.token = login["token"]
+        ops, weights = list(MIX), list(MIX.values())
+
+        async def timed(op, method, path, body=None):
+            t0 = time.perf_counter()
+            status, headers, payload = await client.request(method, path, body)
+            stats.record(op, time.perf_counter() - t0, status, headers)
+            return status, payload
+
+        while time.perf_counter() < deadline:
+            op = rng.choices(ops, weights)[0]
+            if op == "search":
+                origin, destination = rng.sample(workload["codes"], 2)
+                day = rng.choice(workload["dates"])
+                await timed(op, "GET", f"/api/flights?origin={origin}&destination={destination}&date={day}")
+            elif op == "details":
+                await timed(op, "GET", f"/api/flights/{rng.randint(1, workload['flights'])}")
+            elif op == "bookings":
+                await timed(op, "GET", "/api/bookings?page_size=20")
+            else:
+                status, booking = await timed("book", "POST", "/api/bookings",
+                                              {"flight_id": rng.randint(1, workload["flights"]), "seat_count": 1})
+                if status == 201:
+                    await timed("cancel", "DELETE", f"/api/bookings/{booking['booking_id']}")
+    finally:
+        await client.close()
+
+
+async def run_level(host, port, concurrency, duration, users, workload, seed):
+    stats = Stats()
+    deadline = time.perf_counter() + duration
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        client_loop(host, port, users[i % len(users)], workload, deadline, stats, random.Random(seed + i))
+        for i in range(concurrency)
+    ))
+    return stats, time.perf_counter() - started
+
+
+def report(concurrency, stats, elapsed):
+    total = sum(len(v) for v in stats.latencies.values())
+    everything = sorted(x for v in stats.latencies.values() for x in v)
+    errors = {s: n for s, n in stats.statuses.items() if s >= 500 or s in (400, 401, 404)}
+    n = stats.server["n"] or 1
+    print(f"🚀 {concurrency:>3} clients | {total / elapsed:>8,.0f} req/s | p50 {_pct(everything, 50):6.2f} ms "
+          f"| p95 {_pct(everything, 95):6.2f} ms | p99 {_pct(everything, 99):6.2f} ms "
+          f"| server queue {stats.server['queue'] / n:5.2f} ms, db {stats.server['db'] / n:5.2f} ms"
+          + (f" | ⚠️ {errors}" if errors else ""))
+    for op, values in sorted(stats.latencies.items()):
+        values.sort()
+        print(f"      {op:<9} n={len(values):<7,} p50 {_pct(values, 50):6.2f} | p95 {_pct(values, 95):6.2f} "
+              f"| p99 {_pct(values, 99):6.2f} | max {values[-1] * 1000:7.2f} ms")
+
+
+def start_server(db_path, port, workers, group_commit=False):
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "backend.api_server", "--db", db_path, "--port", str(port),
+         "--workers", str(workers), "--quiet"] + (["--group-commit"] if group_commit else []),
+        cwd=ROOT, stdout=subprocess.PIPE, text=True,
+    )
+    for line in proc.stdout:        # migrations, then "Serving on http://host:port ..."
+        match = re.search(r"http://([\d.]+):(\d+)", line)
+        if match:
+            return proc, match.group(1), int(match.group(2))
+    proc.kill()
+    raise RuntimeError("server exited before it started listening")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTTP API load generator")
+    parser.add_argument("--url", help="existing server (default: start one on a generated database)")
+    parser.add_argument("--username", help="login for --url")
+    parser.add_argument("--password", help="password for --url")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 16, 64])
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per concurrency level")
+    parser.add_argument("--workers", type=int, default=8, help="server worker threads (spawned server)")
+    parser.add_argument("--group-commit", action="store_true", help="start the server in split mode")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--flights", type=int, default=50_000)
+    parser.add_argument("--bookings", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    proc = None
+    if args.url:
+        parts = urlsplit(args.url)
+        host, port = parts.hostname, parts.port or 80
+        if not (args.username and args.password):
+            parser.error("--url needs --username and --password")
+        users = [(args.username, args.password)]
+        # route/date values for searches; a miss is still a realistic request
+        workload = {"codes": ["Cairo", "Paris", "London", "Jeddah", "Dubai"],
+                    "dates": ["2025-10-25", "2025-11-01"], "flights": 1000}
+    else:
+        with quiet():
+            dataset = generate_database(users=args.users, flights=args.flights,
+                                        bookings=args.bookings, seed=args.seed)
+        users = [(name, password) for _, name, password in dataset["user_rows"]]
+        workload = {"codes": dataset["airport_codes"], "flights": dataset["flights"],
+                    "dates": [f"2030-01-{d:02d}" for d in range(1, 29)]}
+        proc, host, port = start_server(dataset["path"], 0, args.workers, args.group_commit)
+        print(f"🗄️ {dataset['flights']:,} flights, {dataset['bookings']:,} bookings, {dataset['users']:,} users "
+              f"| server on {host}:{port} with {args.workers} workers")
+
+    try:
+        for concurrency in args.concurrency:
+            stats, elapsed = asyncio.run(run_level(host, port, concurrency, args.duration, users,
+                                                   workload, args.seed))
+            report(concurrency, stats, elapsed)
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+
+
+if __name__ == "__main__":
+    main()
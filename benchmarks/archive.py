@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+# benchmarks/archive.py
+#
+# Hot/cold partitioning (backend.archive) on a multi-year schedule: live
+# queries timed before and after departed flights and their bookings move
+# to the archive, the archiving run itself, and history queries that union
+# the archive back in.
+#
+#   python benchmarks/archive.py --years 4 --flights 200000 --bookings 400000
+import sys, os
+import time
+import random
+import argparse
+from datetime import date, timedelta
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import generate_database, quiet
+from backend import archive
+from backend.cache import flight_cache
+from backend.flight_service import FlightService
+from backend.booking_service import BookingService
+
+
+def timed_ms(fn, calls):
+    started = time.perf_counter()
+    for args in calls:
+        fn(*args)
+    return (time.perf_counter() - started) / len(calls) * 1000
+
+
+def live_queries(dataset, cutoff, rng, samples):
+    """(name, fn, argument tuples) for the queries users and admins run all day."""
+    days = (date.fromisoformat("2030-01-01") + timedelta(days=dataset["days"]) - date.fromisoformat(cutoff)).days
+    codes, users = dataset["airport_codes"], dataset["user_rows"]
+    upcoming = [(date.fromisoformat(cutoff) + timedelta(days=rng.randrange(max(days, 1)))).isoformat()
+                for _ in range(samples)]
+    return [
+        ("search_flights (upcoming date)", FlightService.search_flights,
+         [tuple(rng.sample(codes, 2)) + (day,) for day in upcoming]),
+        ("get_all_flights", FlightService.get_all_flights, [()] * 3),
+        ("get_flights_page + total", lambda: FlightService.get_flights_page(page_size=200, with_total=True),
+         [()] * samples),
+        ("get_user_bookings", BookingService.get_user_bookings, [(rng.choice(users)[0],) for _ in range(samples)]),
+        ("get_all_bookings_page + total", lambda: BookingService.get_all_bookings_page(with_total=True),
+         [()] * samples),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Archive (hot/cold partitioning) benchmark")
+    parser.add_argument("--years", type=int, default=4, help="schedule length; all but the last year departs")
+    parser.add_argument("--flights", type=int, default=200_000)
+    parser.add_argument("--bookings", type=int, default=400_000)
+    parser.add_argument("--batch-size", type=int, default=2000)
+    parser.add_argument("--samples", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    with quiet():
+        dataset = generate_database(users=2000, flights=args.flights, bookings=args.bookings,
+                                    days=365 * args.years, seed=args.seed)
+    flight_cache.enabled = False
+    cutoff = (date.fromisoformat("2030-01-01") + timedelta(days=365 * (args.years - 1))).isoformat()
+    print(f"🗄️ {dataset['flights']:,} flights over {args.years} years, {dataset['bookings']:,} bookings; "
+          f"archiving departures before {cutoff}")
+
+    queries = live_queries(dataset, cutoff, random.Random(args.seed), args.samples)
+    before = {name: timed_ms(fn, calls) for name, fn, calls in queries}
+
+    result = archive.archive_departed(before=cutoff, batch_size=args.batch_size)
+    print(f"📦 Archived {result['flights']:,} flights + {result['bookings']:,} bookings in {result['batches']} batches, "
+          f"{result['ms'] / 1000:,.1f} s | {archive.stats()}")
+
+    after = {name: timed_ms(fn, calls) for name, fn, calls in queries}
+    for name, _, _ in queries:
+        print(f"🔥 {name:<32} before {before[name]:9.2f} ms | after {after[name]:9.2f} ms | x{before[name] / after[name]:.1f}")
+
+    rng = random.Random(args.seed + 1)
+    users = [(rng.choice(dataset["user_rows"])[0],) for _ in range(args.samples)]
+    live = timed_ms(BookingService.get_user_bookings, users)
+    history = timed_ms(lambda user_id: BookingService.get_user_bookings(user_id, include_archived=True), users)
+    print(f"📚 get_user_bookings: live only {live:.2f} ms | with archive {history:.2f} ms")
+    with quiet():
+        admin = timed_ms(lambda: BookingService.get_all_bookings(include_archived=True), [()])
+    print(f"📚 get_all_bookings with archive: {admin:,.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
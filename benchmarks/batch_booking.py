@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+# benchmarks/batch_booking.py
+#
+# Compares BookingService.create_bookings_batch with a loop of create_booking
+# calls for an agency-style group reservation.
+#
+#   python benchmarks/batch_booking.py --flights 10 --passengers 50 --rounds 20
+import sys, os
+import time
+import argparse
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import temp_database, quiet
+from backend.database import pooled_connection
+from backend.flight_service import FlightService
+from backend.booking_service import BookingService
+from backend.user_service import UserService
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch vs per-call booking benchmark")
+    parser.add_argument("--flights", type=int, default=10)
+    parser.add_argument("--passengers", type=int, default=50, help="requests per batch")
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    temp_database("batch.db")
+    capacity = args.passengers * args.rounds * 2
+    with quiet():
+        UserService.register_user("agency", "agency")
+        user_id = UserService.login_user("agency", "agency")["user_id"]
+        for i in range(args.flights):
+            FlightService.add_flight(f"AK{500 + i}", "Cairo", "Riyadh", "2030-02-01", "10:00", 150.0, capacity)
+    with pooled_connection() as conn:
+        flight_ids = [row[0] for row in conn.execute("SELECT flight_id FROM flights")]
+
+    requests = [
+        {"user_id": user_id, "flight_id": flight_ids[i % len(flight_ids)], "seat_count": 1}
+        for i in range(args.passengers)
+    ]
+
+    with quiet():
+        started = time.perf_counter()
+        for _ in range(args.rounds):
+            for req in requests:
+                BookingService.create_booking(req["user_id"], req["flight_id"], req["seat_count"])
+        loop_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for _ in range(args.rounds):
+            results = BookingService.create_bookings_batch(requests, all_or_nothing=True)
+        batch_seconds = time.perf_counter() - started
+
+    assert all(r["status"] == "booked" for r in results)
+    total = args.rounds * args.passengers
+    print(f"🔁 Per-call loop: {loop_seconds:.3f}s ({total / loop_seconds:,.0f} bookings/s)")
+    print(f"📦 Batch:         {batch_seconds:.3f}s ({total / batch_seconds:,.0f} bookings/s)")
+    print(f"🚀 Speedup: {loop_seconds / batch_seconds:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
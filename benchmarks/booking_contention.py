@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+# benchmarks/booking_contention.py
+#
+# Hammers a single flight from several processes and checks that
+# BookingService.create_booking never oversells it.
+#
+#   python benchmarks/booking_contention.py --processes 8 --attempts 200 --seats 500
+import sys, os
+import time
+import argparse
+import multiprocessing
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import temp_database, use_database, quiet
+from backend.database import pooled_connection
+from backend.flight_service import FlightService
+from backend.booking_service import BookingService
+from backend.user_service import UserService
+
+
+def worker(db_path, flight_id, user_id, attempts, seats_per_booking, start_event, results):
+    use_database(db_path)
+    start_event.wait()
+    booked = 0
+    with quiet():
+        for _ in range(attempts):
+            if BookingService.create_booking(user_id, flight_id, seats_per_booking):
+                booked += 1
+    results.put(booked)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-process booking contention harness")
+    parser.add_argument("--processes", type=int, default=8)
+    parser.add_argument("--attempts", type=int, default=200, help="booking attempts per process")
+    parser.add_argument("--seats", type=int, default=500, help="capacity of the contended flight")
+    parser.add_argument("--seats-per-booking", type=int, default=1)
+    args = parser.parse_args()
+
+    db_path = temp_database("contention.db")
+    with quiet():
+        UserService.register_user("bench", "bench")
+        user_id = UserService.login_user("bench", "bench")["user_id"]
+        FlightService.add_flight("AK900", "Cairo", "Jeddah", "2030-01-01", "08:00", 199.0, args.seats)
+    with pooled_connection() as conn:
+        flight_id = conn.execute("SELECT MAX(flight_id) FROM flights").fetchone()[0]
+
+    start_event = multiprocessing.Event()
+    results = multiprocessing.Queue()
+    procs = [
+        multiprocessing.Process(
+            target=worker,
+            args=(db_path, flight_id, user_id, args.attempts, args.seats_per_booking, start_event, results),
+        )
+        for _ in range(args.processes)
+    ]
+    for p in procs:
+        p.start()
+
+    started = time.perf_counter()
+    start_event.set()
+    booked = sum(results.get() for _ in procs)
+    elapsed = time.perf_counter() - started
+    for p in procs:
+        p.join()
+
+    with pooled_connection() as conn:
+        remaining = conn.execute(
+            "SELECT available_seats FROM flights WHERE flight_id = ?", (flight_id,)
+        ).fetchone()[0]
+        sold = conn.execute(
+            "SELECT COALESCE(SUM(seat_count), 0) FROM bookings WHERE flight_id = ?", (flight_id,)
+        ).fetchone()[0]
+
+    attempts = args.processes * args.attempts
+    print(f"🏁 {attempts} attempts from {args.processes} processes in {elapsed:.2f}s")
+    print(f"✅ Bookings: {booked}  ({booked / elapsed:.0f} bookings/s, {attempts / elapsed:.0f} attempts/s)")
+    print(f"💺 Seats sold: {sold} / {args.seats}, remaining: {remaining}")
+
+    oversold = sold > args.seats or remaining < 0 or sold + remaining != args.seats
+    if oversold:
+        print("❌ OVERSOLD — seat accounting is inconsistent!")
+        sys.exit(1)
+    print("✅ Zero oversell.")
+
+
+if __name__ == "__main__":
+    main()
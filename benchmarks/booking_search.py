@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+# benchmarks/booking_search.py
+#
+# Booking search latency as a user's history grows: the old LIKE '%text%'
+# filter vs the FTS5 index (paged listing and ranked search). Selective
+# queries should stay flat; broad ones grow with the number of matches,
+# not with the size of the history.
+#
+#   python benchmarks/booking_search.py --sizes 1000 10000 100000
+import sys, os
+import time
+import random
+import argparse
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import temp_database, seed_flights, quiet
+from backend.database import pooled_connection
+from backend.booking_service import BookingService
+from backend.pagination import fetch_keyset_page
+
+
+def like_page(user_id, search, page_size=5):
+    """The pre-FTS filter from get_user_bookings_page."""
+    filters = ["b.user_id = ?", "(f.flight_number LIKE ? OR f.origin LIKE ? OR f.destination LIKE ?)"]
+    params = [user_id] + [f"%{search}%"] * 3
+    with pooled_connection() as conn:
+        page = fetch_keyset_page(
+            conn, BookingService.USER_BOOKINGS_SELECT, filters, params,
+            order_cols=("f.date", "f.time", "b.booking_id"),
+            row_key=lambda row: (row["flight_date"], row["flight_time"], row["booking_id"]),
+            descending=False, cursor=None, page_size=page_size,
+        )
+        page["total"] = conn.execute(
+            "SELECT COUNT(*) FROM bookings b JOIN flights f ON b.flight_id = f.flight_id WHERE "
+            + " AND ".join(filters), params,
+        ).fetchone()[0]
+    return page
+
+
+def add_bookings(user_id, count, flight_count, rng):
+    with pooled_connection() as conn:
+        conn.execute("BEGIN;")
+        conn.executemany("""
+            INSERT INTO bookings (user_id, flight_id, seat_count, booking_date, total_price)
+            VALUES (?, ?, 1, '2030-01-01 00:00:00', 100.0)
+        """, ((user_id, rng.randint(1, flight_count)) for _ in range(count)))
+        conn.commit()
+
+
+def timed_ms(fn, queries):
+    started = time.perf_counter()
+    for q in queries:
+        fn(q)
+    return (time.perf_counter() - started) / len(queries) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Booking search benchmark")
+    parser.add_argument("--flights", type=int, default=50_000)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10_000, 100_000])
+    parser.add_argument("--queries", type=int, default=50)
+    args = parser.parse_args()
+
+    temp_database("booking_search.db")
+    codes = seed_flights(args.flights, airports=200, days=365)
+    rng = random.Random(3)
+    # what people type: a flight number (selective) or a partial city code (broad).
+    # Only the longest numbers are selective: "AK12" is also a prefix of AK120..AK129.
+    with pooled_connection() as conn:
+        numbers = [row[0] for row in conn.execute("SELECT flight_number FROM flights")]
+    longest = max(map(len, numbers))
+    selective = [number for number in numbers if len(number) == longest]
+    query_sets = {
+        "flight no.": [rng.choice(selective) for _ in range(args.queries)],
+        "city prefix": [rng.choice(codes)[:3] for _ in range(args.queries)],
+    }
+
+    user_id, have = 1, 0
+    add_bookings(2, 20_000, args.flights, rng)  # other users' history in the same tables
+    for size in sorted(args.sizes):
+        add_bookings(user_id, size - have, args.flights, rng)
+        have = size
+        for label, queries in query_sets.items():
+            with quiet():
+                like_ms = timed_ms(lambda q: like_page(user_id, q), queries)
+                page_ms = timed_ms(lambda q: BookingService.get_user_bookings_page(
+                    user_id, search=q, with_total=True), queries)
+                ranked_ms = timed_ms(lambda q: BookingService.search_user_bookings(user_id, q), queries)
+            print(f"📘 {size:>7,} bookings, {label:<11} | LIKE page {like_ms:7.2f} ms | "
+                  f"FTS page {page_ms:7.2f} ms | FTS ranked {ranked_ms:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+# benchmarks/change_feed.py
+#
+# Live refresh of an open flights table after other sessions book seats:
+# reloading what the table shows (its loaded pages plus the total, as the
+# Refresh button does, or every flight as the old windows did) vs polling
+# the change feed (backend.change_feed) for just the changed rows. The
+# reload grows with the table; the poll grows with the number of changes.
+#
+#   python benchmarks/change_feed.py --sizes 20000,100000,400000 --changes 20 --loaded 1000
+import sys, os
+import time
+import random
+import argparse
+import statistics
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import generate_database, quiet
+from backend.cache import flight_cache
+from backend.change_feed import ChangeFeed
+from backend.flight_service import FlightService
+from backend.booking_service import BookingService
+
+
+def full_reload(loaded):
+    """What FlightsTableModel.reload() + fetchMore cost to get back to `loaded` rows."""
+    page = FlightService.get_flights_page(page_size=200, with_total=True)
+    rows = len(page["items"])
+    while rows < loaded and page["next_cursor"]:
+        page = FlightService.get_flights_page(page_size=200, cursor=page["next_cursor"])
+        rows += len(page["items"])
+    return rows
+
+
+def book_random(rng, flight_ids, user_ids, count):
+    with quiet():
+        for _ in range(count):
+            BookingService.create_booking(rng.choice(user_ids), rng.choice(flight_ids), 1)
+
+
+def median_ms(fn, runs):
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def poll_ms(feed, rng, flight_ids, user_ids, changes, runs):
+    """Median time of one poll() after `changes` bookings were committed."""
+    timings = []
+    for _ in range(runs):
+        book_random(rng, flight_ids, user_ids, changes)
+        started = time.perf_counter()
+        result = feed.poll()
+        timings.append((time.perf_counter() - started) * 1000)
+        assert not result["reset"] and result["flights"]
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Change feed vs full reload benchmark")
+    parser.add_argument("--sizes", default="20000,100000,400000", help="flights per database, comma separated")
+    parser.add_argument("--changes", type=int, default=20, help="bookings committed between two refreshes")
+    parser.add_argument("--loaded", type=int, default=1000, help="rows the open table has scrolled through")
+    parser.add_argument("--runs", type=int, default=15)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    flight_cache.enabled = False
+    sizes = [int(size) for size in args.sizes.split(",")]
+    for size in sizes:
+        with quiet():
+            dataset = generate_database(users=500, flights=size, bookings=size // 10, seed=args.seed)
+        rng = random.Random(args.seed)
+        flight_ids = list(range(1, size + 1))
+        user_ids = [u[0] for u in dataset["user_rows"]]
+
+        reload_ms = median_ms(lambda: full_reload(args.loaded), args.runs)
+        all_ms = median_ms(FlightService.get_all_flights, max(3, args.runs // 5))
+        feed = ChangeFeed()
+        feed.start()
+        idle_ms = median_ms(feed.poll, args.runs)
+        patch_ms = poll_ms(feed, rng, flight_ids, user_ids, args.changes, args.runs)
+        print(f"🗄️ {size:>9,} flights | reload {args.loaded:,} rows + total {reload_ms:8.2f} ms | "
+              f"get_all_flights {all_ms:9.1f} ms | poll {args.changes} changes {patch_ms:6.2f} ms | "
+              f"idle poll {idle_ms:5.3f} ms | x{reload_ms / patch_ms:.0f} vs reload")
+
+    # Same (largest) table, more and more changes between two polls
+    print(f"📈 Poll cost by number of changes ({sizes[-1]:,} flights):")
+    for changes in (1, 10, 100, 1000):
+        ms = poll_ms(feed, rng, flight_ids, user_ids, changes, max(3, args.runs // 3))
+        print(f"   {changes:>5,} changes {ms:8.2f} ms | {ms / changes * 1000:7.1f} µs per change")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+# benchmarks/common.py — shared helpers for the benchmark scripts
+import sys, os
+import io
+import tempfile
+import contextlib
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend import database, revenue
+
+
+def use_database(path):
+    """Point the backend (and its connection pool) at `path`."""
+    database.close_pool()
+    database.DB_NAME = path
+
+
+def temp_database(name="bench.db"):
+    """Create an initialized database in a fresh temp directory and use it."""
+    path = os.path.join(tempfile.mkdtemp(prefix="alkawthar-bench-"), name)
+    use_database(path)
+    with quiet():
+        database.initialize_database()
+    return path
+
+
+@contextlib.contextmanager
+def quiet():
+    """Swallow the services' print() chatter while timing."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+def seed_flights(count, airports=200, days=365, seed=42, start_date="2030-01-01", seats=180):
+    """
+    Insert `count` random flights straight through executemany (fast path
+    for benchmarks). Same seed -> same schedule. Returns the airport codes.
+    """
+    import random
+    from datetime import date, timedelta
+    from backend.database import pooled_connection
+
+    rng = random.Random(seed)
+    codes = [f"A{i:03d}" for i in range(airports)]
+    first_day = date.fromisoformat(start_date)
+    dates = [(first_day + timedelta(days=d)).isoformat() for d in range(days)]
+    times = [f"{h:02d}:{m:02d}" for h in range(24) for m in (0, 15, 30, 45)]
+
+    def rows():
+        for i in range(count):
+            origin, destination = rng.sample(codes, 2)
+            yield (f"AK{i}", origin, destination, rng.choice(dates), rng.choice(times),
+                   round(rng.uniform(80, 1200), 2), seats)
+
+    with pooled_connection() as conn:
+        conn.execute("BEGIN;")
+        conn.executemany("""
+            INSERT INTO flights (flight_number, origin, destination, date, time, price, available_seats)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, rows())
+        conn.commit()
+    return codes
+
+
+def seed_users(count, seed=42, admins=1):
+    """
+    Insert `count` users named user0..userN with password "pw<i>" (the
+    first `admins` are admins). Returns [(user_id, username, password)].
+    """
+    import random
+    import hashlib
+    from backend.database import pooled_connection
+
+    rng = random.Random(seed)
+    users = [(f"user{i}", f"pw{i}") for i in range(count)]
+    with pooled_connection() as conn:
+        conn.execute("BEGIN;")
+        first_id = (conn.execute("SELECT COALESCE(MAX(user_id), 0) FROM users").fetchone()[0]) + 1
+        conn.executemany("""
+            INSERT INTO users (username, password, email, is_admin) VALUES (?, ?, ?, ?)
+        """, (
+            (name, hashlib.sha256(password.encode()).hexdigest(),
+             f"{name}@example{rng.randint(1, 9)}.com", 1 if i < admins else 0)
+            for i, (name, password) in enumerate(users)
+        ))
+        conn.commit()
+    return [(first_id + i, name, password) for i, (name, password) in enumerate(users)]
+
+
+def seed_bookings(count, user_ids, seed=42, max_seats=3, booking_start="2029-06-01"):
+    """
+    Insert `count` bookings spread over random users and flights, taking
+    the seats off each flight so available_seats stays consistent.
+    Flights that run out are skipped. Returns the number inserted.
+    """
+    import random
+    from datetime import datetime, timedelta
+    from backend.database import pooled_connection
+
+    rng = random.Random(seed)
+    start = datetime.fromisoformat(booking_start)
+    with pooled_connection() as conn:
+        seats = dict(conn.execute("SELECT flight_id, available_seats FROM flights").fetchall())
+        prices = dict(conn.execute("SELECT flight_id, price FROM flights").fetchall())
+        flight_ids = list(seats)
+        rows, taken = [], {}
+        for _ in range(count * 2):
+            if len(rows) == count or not flight_ids:
+                break
+            flight_id = rng.choice(flight_ids)
+            n = rng.randint(1, max_seats)
+            if seats[flight_id] - taken.get(flight_id, 0) < n:
+                continue
+            taken[flight_id] = taken.get(flight_id, 0) + n
+            booked_at = start + timedelta(seconds=rng.randint(0, 180 * 86400))
+            rows.append((rng.choice(user_ids), flight_id, n,
+                         booked_at.strftime("%Y-%m-%d %H:%M:%S"), round(prices[flight_id] * n, 2)))
+
+        conn.execute("BEGIN;")
+        conn.executemany("""
+            INSERT INTO bookings (user_id, flight_id, seat_count, booking_date, total_price)
+            VALUES (?, ?, ?, ?, ?)
+        """, rows)
+        conn.executemany(
+            "UPDATE flights SET available_seats = available_seats - ? WHERE flight_id = ?",
+            ((n, flight_id) for flight_id, n in taken.items()),
+        )
+        conn.commit()
+    return len(rows)
+
+
+def generate_database(users=1000, flights=50_000, bookings=100_000, airports=200, days=365,
+                      seed=42, name="generated.db"):
+    """
+    Build a fresh database of the given size in a temp directory and point
+    the backend at it. Same arguments -> same data.
+    Returns a description of the dataset (sizes, seed, path, build time).
+    """
+    import time
+
+    started = time.perf_counter()
+    path = temp_database(name)
+    codes = seed_flights(flights, airports=airports, days=days, seed=seed)
+    user_rows = seed_users(users, seed=seed)
+    inserted = seed_bookings(bookings, [u[0] for u in user_rows], seed=seed)
+    revenue.rebuild()   # bookings were inserted directly
+    with database.pooled_connection() as conn:
+        conn.execute("ANALYZE")
+    return {
+        "path": path,
+        "seed": seed,
+        "users": users,
+        "flights": flights,
+        "bookings": inserted,
+        "airports": airports,
+        "days": days,
+        "airport_codes": codes,
+        "user_rows": user_rows,
+        "build_seconds": round(time.perf_counter() - started, 2),
+    }
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+# benchmarks/flight_records.py
+#
+# Listing every flight as compact FlightRecords (backend.flight_record) vs
+# the previous sqlite3.Row -> dict -> normalized dict conversion: time per
+# listing, peak allocation while building it and memory retained by the
+# result (tracemalloc), plus dict-style access over the result.
+#
+#   python benchmarks/flight_records.py --flights 100000
+import sys, os
+import gc
+import time
+import argparse
+import tracemalloc
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import temp_database, seed_flights, quiet
+from backend.database import read_connection
+from backend.flight_service import FlightService
+
+
+def legacy_all_flights():
+    """get_all_flights before FlightRecord: a dict per row, then a normalized dict."""
+    with read_connection() as conn:
+        rows = conn.execute("SELECT * FROM flights").fetchall()
+    flights = []
+    for row in rows:
+        flight = dict(row)
+        flights.append({
+            "flight_id": flight.get("flight_id"),
+            "departure": flight.get("departure") or flight.get("origin") or flight.get("from_city") or flight.get("from"),
+            "destination": flight.get("destination") or flight.get("arrival") or flight.get("to_city") or flight.get("to"),
+            "date": flight.get("date") or flight.get("departure_time") or flight.get("flight_date"),
+            "available_seats": flight.get("available_seats") or flight.get("seats_available"),
+            "price": flight.get("price") or flight.get("ticket_price") or 0.0,
+        })
+    return flights
+
+
+def measure(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    gc.collect()
+    tracemalloc.start()
+    result = fn()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    started = time.perf_counter()
+    seats = sum(f["available_seats"] for f in result)
+    routes = len({(f.get("departure"), f.get("destination")) for f in result})
+    access_ms = (time.perf_counter() - started) * 1000
+    return min(timings) * 1000, retained / 2**20, peak / 2**20, access_ms, (len(result), seats, routes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Flight record listing benchmark")
+    parser.add_argument("--flights", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    temp_database("flight_records.db")
+    with quiet():
+        seed_flights(args.flights)
+    print(f"🗄️ {args.flights:,} flights")
+
+    results = {}
+    for name, fn in (("dicts (legacy)", legacy_all_flights), ("FlightRecord", FlightService.get_all_flights)):
+        ms, retained, peak, access_ms, check = measure(fn, args.repeat)
+        results[name] = (ms, retained)
+        print(f"📋 {name:<15} {ms:8.1f} ms | retained {retained:7.1f} MB ({retained * 2**20 / args.flights:5.0f} B/flight) "
+              f"| peak {peak:7.1f} MB | read all {access_ms:6.1f} ms | {check}")
+    legacy, compact = results["dicts (legacy)"], results["FlightRecord"]
+    print(f"⚡ x{legacy[0] / compact[0]:.2f} faster, x{legacy[1] / compact[1]:.2f} less memory")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+# benchmarks/flights_table.py
+#
+# FlightsPage time-to-first-paint and resident memory: the old
+# QTableWidget (every flight, an item per cell, a QPushButton per row) vs
+# the paged FlightsTableModel + delegate. Each variant runs in its own
+# process so RSS numbers don't bleed into each other.
+#
+#   QT_QPA_PLATFORM=offscreen python benchmarks/flights_table.py --flights 100000
+import sys, os
+import json
+import time
+import argparse
+import subprocess
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+def rss_mb():
+    """Current resident set size (Linux /proc; falls back to peak RSS)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def legacy_page(user):
+    """The pre-model FlightsPage body: load everything, one widget per row."""
+    from PyQt5.QtWidgets import QTableWidget, QTableWidgetItem, QPushButton
+    from backend.flight_service import FlightService
+
+    table = QTableWidget()
+    table.setColumnCount(6)
+    table.setHorizontalHeaderLabels(["ID", "From", "To", "Date", "Available Seats", "Action"])
+    flights = FlightService.get_all_flights() or []
+    table.setRowCount(len(flights))
+    for row_idx, flight in enumerate(flights):
+        table.setItem(row_idx, 0, QTableWidgetItem(str(flight.get("flight_id", ""))))
+        table.setItem(row_idx, 1, QTableWidgetItem(flight.get("departure", "")))
+        table.setItem(row_idx, 2, QTableWidgetItem(flight.get("destination", "")))
+        table.setItem(row_idx, 3, QTableWidgetItem(flight.get("date", "")))
+        table.setItem(row_idx, 4, QTableWidgetItem(str(flight.get("available_seats", ""))))
+        table.setCellWidget(row_idx, 5, QPushButton("Book Now"))
+    return table
+
+
+def child(variant, db_path):
+    from PyQt5.QtCore import Qt
+    from PyQt5.QtWidgets import QApplication
+    from benchmarks.common import use_database
+
+    use_database(db_path)
+    app = QApplication(sys.argv)
+    user = {"user_id": 1, "username": "bench"}
+    baseline = rss_mb()
+
+    started = time.perf_counter()
+    if variant == "legacy":
+        widget = legacy_page(user)
+        rows = lambda: widget.rowCount()
+    else:
+        from ui.pages.flights_page import FlightsPage
+        widget = FlightsPage(user)
+        rows = lambda: widget.model.rowCount()
+    widget.resize(1000, 700)
+    widget.show()
+    while rows() == 0:
+        app.processEvents()
+        time.sleep(0.001)
+    app.processEvents()
+    widget.repaint()
+    first_paint_ms = (time.perf_counter() - started) * 1000
+
+    sort_ms = None
+    if variant == "model":
+        # header click on "Available Seats" -> ORDER BY in SQL, first page only
+        started = time.perf_counter()
+        widget.table.sortByColumn(4, Qt.DescendingOrder)
+        while widget.runner.is_busy() or widget.model.rowCount() == 0:
+            app.processEvents()
+            time.sleep(0.001)
+        sort_ms = (time.perf_counter() - started) * 1000
+
+    print(json.dumps({
+        "variant": variant,
+        "first_paint_ms": round(first_paint_ms, 1),
+        "rss_mb": round(rss_mb() - baseline, 1),
+        "rows_loaded": rows(),
+        "sort_ms": sort_ms and round(sort_ms, 1),
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Flights table TTFP/RSS benchmark")
+    parser.add_argument("--flights", type=int, default=100_000)
+    parser.add_argument("--child", choices=["legacy", "model"], help=argparse.SUPPRESS)
+    parser.add_argument("--db", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.db)
+        return
+
+    from benchmarks.common import temp_database, seed_flights
+    db_path = temp_database("flights_table.db")
+    seed_flights(args.flights, airports=200, days=365)
+
+    for variant in ("legacy", "model"):
+        out = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--child", variant, "--db", db_path],
+            capture_output=True, text=True, check=True,
+        ).stdout
+        result = json.loads(out.strip().splitlines()[-1])
+        icon = "🐢" if variant == "legacy" else "⚡"
+        line = (f"{icon} {variant:<6} first paint {result['first_paint_ms']:>9,.1f} ms | "
+                f"+{result['rss_mb']:>7,.1f} MB RSS | {result['rows_loaded']:,} rows in memory")
+        if result["sort_ms"] is not None:
+            line += f" | SQL sort {result['sort_ms']:.1f} ms"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
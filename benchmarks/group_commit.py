@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+# benchmarks/group_commit.py
+#
+# Per-call commits vs the read/write split with group commit
+# (backend.group_commit), at increasing numbers of client threads. Each
+# client mixes searches with bookings (half of which it cancels again) for
+# a fixed time. Both modes commit with the same synchronous level, so every
+# returned booking is equally durable.
+#
+#   python benchmarks/group_commit.py --clients 1 4 16 64 --duration 5
+import sys, os
+import time
+import random
+import argparse
+import threading
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import generate_database, quiet
+from backend import database, group_commit
+from backend.cache import flight_cache
+from backend.flight_service import FlightService
+from backend.booking_service import BookingService
+
+
+def client(rng, dataset, deadline, read_share, reads, writes):
+    users = dataset["user_rows"]
+    while time.perf_counter() < deadline:
+        t0 = time.perf_counter()
+        if rng.random() < read_share:
+            origin, destination = rng.sample(dataset["airport_codes"], 2)
+            FlightService.search_flights(origin, destination, f"2030-01-{rng.randint(1, 28):02d}")
+            reads.append(time.perf_counter() - t0)
+            continue
+        booking = BookingService.create_booking(rng.choice(users)[0], rng.randint(1, dataset["flights"]), 1)
+        writes.append(time.perf_counter() - t0)
+        if booking and rng.random() < 0.5:
+            t0 = time.perf_counter()
+            BookingService.cancel_booking(booking["booking_id"])
+            writes.append(time.perf_counter() - t0)
+
+
+def run(clients, dataset, duration, read_share, seed):
+    reads, writes = [], []   # list.append is atomic under the GIL
+    deadline = time.perf_counter() + duration
+    threads = [
+        threading.Thread(target=client, args=(random.Random(seed + i), dataset, deadline, read_share, reads, writes))
+        for i in range(clients)
+    ]
+    started = time.perf_counter()
+    with quiet():
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    return reads, writes, time.perf_counter() - started
+
+
+def _ms(values, q):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q / 100 * len(values)))] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Group commit throughput benchmark")
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32, 64])
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds per run")
+    parser.add_argument("--read-share", type=float, default=0.5, help="fraction of operations that are searches")
+    parser.add_argument("--synchronous", default="FULL", choices=["FULL", "NORMAL"],
+                        help="commit durability for both modes")
+    parser.add_argument("--flights", type=int, default=20_000)
+    parser.add_argument("--bookings", type=int, default=20_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    with quiet():
+        dataset = generate_database(users=500, flights=args.flights, bookings=args.bookings, seed=args.seed)
+    flight_cache.enabled = False   # searches should reach SQLite in both modes
+    database.PRAGMAS["synchronous"] = args.synchronous
+    database.close_pool()
+    print(f"🗄️ {dataset['flights']:,} flights, {dataset['bookings']:,} bookings, synchronous={args.synchronous}, "
+          f"{args.read_share:.0%} reads")
+
+    for clients in args.clients:
+        line = {}
+        for mode in ("per-call", "group"):
+            if mode == "group":
+                group_commit.enable(synchronous=args.synchronous)
+            reads, writes, elapsed = run(clients, dataset, args.duration, args.read_share, args.seed)
+            stats = group_commit.writer_stats()
+            if mode == "group":
+                group_commit.disable()
+            line[mode] = (len(writes) / elapsed, _ms(writes, 50), _ms(writes, 99), _ms(reads, 99), stats)
+
+        base, group = line["per-call"], line["group"]
+        batch = group[4]["writes"] / group[4]["batches"] if group[4]["batches"] else 0
+        print(f"👥 {clients:>2} clients | per-call {base[0]:>7,.0f} writes/s (p50 {base[1]:6.2f}, p99 {base[2]:7.2f} ms, "
+              f"read p99 {base[3]:6.2f} ms) | group {group[0]:>7,.0f} writes/s (p50 {group[1]:6.2f}, "
+              f"p99 {group[2]:7.2f} ms, read p99 {group[3]:6.2f} ms, {batch:4.1f}/commit) | x{group[0] / base[0]:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+# benchmarks/inventory_index.py
+#
+# Builds the in-memory inventory index over a large synthetic schedule,
+# checks it returns the same flights as the SQL search and compares lookup
+# and incremental refresh times.
+#
+#   python benchmarks/inventory_index.py --flights 1000000
+import sys, os
+import time
+import random
+import resource
+import argparse
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import temp_database, seed_flights, quiet
+from backend.cache import flight_cache
+from backend.flight_service import FlightService
+from backend.booking_service import BookingService
+from backend.inventory_index import InventoryIndex
+
+
+def rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def ordered(flights):
+    return sorted(flights, key=lambda f: (f["date"], f["time"], f["flight_id"]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inventory index benchmark")
+    parser.add_argument("--flights", type=int, default=1_000_000)
+    parser.add_argument("--airports", type=int, default=60)
+    parser.add_argument("--lookups", type=int, default=2000)
+    parser.add_argument("--changes", type=int, default=200)
+    args = parser.parse_args()
+
+    temp_database("inventory.db")
+    started = time.perf_counter()
+    codes = seed_flights(args.flights, airports=args.airports)
+    print(f"🧪 Seeded {args.flights:,} flights in {time.perf_counter() - started:.1f}s")
+
+    rss_before = rss_mb()
+    index = InventoryIndex()
+    started = time.perf_counter()
+    index.build()
+    print(f"🏗️ Build: {time.perf_counter() - started:.2f}s, "
+          f"{len(index.routes()):,} routes, peak RSS +{rss_mb() - rss_before:.0f} MB")
+
+    rng = random.Random(7)
+    queries = []
+    for _ in range(args.lookups):
+        origin, destination = rng.sample(codes, 2)
+        day = f"2030-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+        queries.append((origin, destination, day if rng.random() < 0.8 else None))
+
+    # Parity with the SQL path
+    flight_cache.enabled = False
+    for origin, destination, day in queries[:200]:
+        assert ordered(index.search(origin, destination, day)) == \
+            ordered(FlightService.search_flights(origin, destination, day)), (origin, destination, day)
+    print("✅ Parity with SQL search on 200 queries")
+
+    started = time.perf_counter()
+    for q in queries:
+        FlightService.search_flights(*q)
+    sql_seconds = time.perf_counter() - started
+
+    FlightService.inventory_index = index
+    started = time.perf_counter()
+    for q in queries:
+        FlightService.search_flights(*q)
+    index_seconds = time.perf_counter() - started
+    FlightService.inventory_index = None
+
+    print(f"🐢 SQL search:   {sql_seconds / args.lookups * 1e6:,.0f} µs/query")
+    print(f"⚡ Index search: {index_seconds / args.lookups * 1e6:,.0f} µs/query "
+          f"({sql_seconds / index_seconds:.1f}x)")
+
+    # Incremental refresh after a burst of bookings
+    with quiet():
+        for _ in range(args.changes):
+            BookingService.create_booking(1, rng.randint(1, args.flights), 1)
+    started = time.perf_counter()
+    reloaded = index.refresh()
+    print(f"🔁 Refresh after {args.changes} bookings: {reloaded} rows in "
+          f"{(time.perf_counter() - started) * 1000:.1f} ms")
+    for origin, destination, day in queries[:50]:
+        assert ordered(index.search(origin, destination, day)) == \
+            ordered(FlightService.search_flights(origin, destination, day))
+    print("✅ Parity after refresh")
+    index.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+# benchmarks/itinerary_search.py
+#
+# Synthetic hub-and-spoke schedule (500 airports, 12 hubs) and timing of
+# one- and two-stop connection searches over the precomputed route graph.
+#
+#   python benchmarks/itinerary_search.py --airports 500 --hubs 12 --days 7
+import sys, os
+import time
+import random
+import argparse
+from datetime import date, timedelta
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import temp_database
+from backend.database import pooled_connection
+from backend.itinerary_search import RouteGraph, find_itineraries
+
+
+def seed_hub_network(airports, hubs, days, spoke_freq, hub_freq, seed=42):
+    rng = random.Random(seed)
+    codes = [f"P{i:03d}" for i in range(airports)]
+    hub_codes, spoke_codes = codes[:hubs], codes[hubs:]
+    first_day = date(2030, 3, 1)
+
+    def rows():
+        n = 0
+        for d in range(days):
+            day = (first_day + timedelta(days=d)).isoformat()
+
+            def flight(origin, destination, base_price):
+                nonlocal n
+                n += 1
+                return (f"AK{n}", origin, destination, day,
+                        f"{rng.randint(5, 22):02d}:{rng.choice((0, 15, 30, 45)):02d}",
+                        round(base_price * rng.uniform(0.7, 1.5), 2), 180, rng.randint(50, 300))
+
+            for spoke in spoke_codes:
+                for hub in rng.sample(hub_codes, 3):
+                    for _ in range(spoke_freq):
+                        yield flight(spoke, hub, 120)
+                        yield flight(hub, spoke, 120)
+            for a in hub_codes:
+                for b in hub_codes:
+                    if a != b:
+                        for _ in range(hub_freq):
+                            yield flight(a, b, 250)
+
+    with pooled_connection() as conn:
+        conn.execute("BEGIN;")
+        conn.executemany("""
+            INSERT INTO flights (flight_number, origin, destination, date, time, price, available_seats, duration_minutes)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, rows())
+        conn.commit()
+        total = conn.execute("SELECT COUNT(*) FROM flights").fetchone()[0]
+    return hub_codes, spoke_codes, first_day, total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Connection search benchmark")
+    parser.add_argument("--airports", type=int, default=500)
+    parser.add_argument("--hubs", type=int, default=12)
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--spoke-freq", type=int, default=2, help="daily flights per spoke-hub pair, each way")
+    parser.add_argument("--hub-freq", type=int, default=6, help="daily flights per hub pair")
+    parser.add_argument("--queries", type=int, default=300)
+    args = parser.parse_args()
+
+    temp_database("itineraries.db")
+    started = time.perf_counter()
+    hubs, spokes, first_day, total = seed_hub_network(
+        args.airports, args.hubs, args.days, args.spoke_freq, args.hub_freq)
+    print(f"🧪 Seeded {total:,} flights over {args.airports} airports in {time.perf_counter() - started:.1f}s")
+
+    travel_day = (first_day + timedelta(days=1)).isoformat()
+    end_day = (first_day + timedelta(days=3)).isoformat()
+    started = time.perf_counter()
+    graph = RouteGraph(travel_day, end_day)
+    print(f"🏗️ Graph build: {(time.perf_counter() - started) * 1000:.0f} ms "
+          f"({graph.flight_count:,} flights, {len(graph.routes):,} routes)")
+
+    rng = random.Random(3)
+    for max_stops in (1, 2):
+        for sort_by in ("price", "arrival"):
+            latencies, found = [], 0
+            for _ in range(args.queries):
+                origin, destination = rng.sample(spokes, 2)
+                started = time.perf_counter()
+                results = find_itineraries(graph, origin, destination, travel_day,
+                                           max_stops=max_stops, sort_by=sort_by, limit=10)
+                latencies.append(time.perf_counter() - started)
+                found += bool(results)
+            latencies.sort()
+            p50 = latencies[len(latencies) // 2] * 1000
+            p95 = latencies[int(len(latencies) * 0.95)] * 1000
+            print(f"🔎 max_stops={max_stops} sort={sort_by:7}: p50 {p50:.2f} ms, p95 {p95:.2f} ms, "
+                  f"{found}/{args.queries} queries with results")
+
+    sample = find_itineraries(graph, spokes[0], spokes[1], travel_day, max_stops=2, limit=1)
+    if sample:
+        print("🧳 Example:", {k: sample[0][k] for k in ("stops", "total_price", "departure", "arrival", "layovers")})
+
+
+if __name__ == "__main__":
+    main()
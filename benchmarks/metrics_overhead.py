@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+# benchmarks/metrics_overhead.py
+#
+# Cost of backend.metrics: the same service calls before instrumentation was
+# ever enabled, while enabled, and after disable().
+#
+#   python benchmarks/metrics_overhead.py --calls 20000
+import sys, os
+import time
+import random
+import argparse
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import temp_database, seed_flights, quiet
+from backend import metrics
+from backend.cache import flight_cache
+from backend.flight_service import FlightService
+
+
+def workload(calls, codes, flight_count, seed=9):
+    rng = random.Random(seed)
+    started = time.perf_counter()
+    for i in range(calls):
+        if i % 2:
+            FlightService.get_flight_by_id(rng.randint(1, flight_count))
+        else:
+            origin, destination = rng.sample(codes, 2)
+            FlightService.search_flights(origin, destination, "2030-01-15")
+    return (time.perf_counter() - started) / calls * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Instrumentation overhead benchmark")
+    parser.add_argument("--flights", type=int, default=50_000)
+    parser.add_argument("--calls", type=int, default=20_000)
+    args = parser.parse_args()
+
+    temp_database("metrics.db")
+    codes = seed_flights(args.flights, airports=50, days=60)
+    flight_cache.enabled = False  # every call reaches SQLite
+
+    with quiet():
+        workload(args.calls, codes, args.flights)  # warm the pool and page cache
+        baseline = workload(args.calls, codes, args.flights)
+        metrics.enable()
+        enabled = workload(args.calls, codes, args.flights)
+        metrics.disable()
+        disabled = workload(args.calls, codes, args.flights)
+
+    print(f"⚪ Never enabled: {baseline:7.1f} µs/call")
+    print(f"🟢 Enabled:       {enabled:7.1f} µs/call ({(enabled / baseline - 1) * 100:+.1f}%)")
+    print(f"⚪ Disabled:      {disabled:7.1f} µs/call ({(disabled / baseline - 1) * 100:+.1f}%)")
+    snap = metrics.snapshot()
+    print(f"📊 Recorded {sum(s['count'] for s in snap['services'].values()):,} service calls, "
+          f"{sum(s['count'] for s in snap['sql'].values()):,} statements")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+# benchmarks/price_calendar.py
+#
+# Price calendar (cheapest fare per day over ±N days): naive per-day
+# search_flights loop vs the grouped query vs the materialized hot-route path.
+#
+#   python benchmarks/price_calendar.py --flights 200000 --days 3
+import sys, os
+import time
+import random
+import argparse
+from datetime import date, timedelta
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import temp_database, seed_flights
+from backend.cache import flight_cache
+from backend.flight_service import FlightService
+
+
+def naive_calendar(origin, destination, center, days):
+    calendar = []
+    for offset in range(-days, days + 1):
+        day = (date.fromisoformat(center) + timedelta(days=offset)).isoformat()
+        flights = [f for f in FlightService.search_flights(origin, destination, day) if f["available_seats"] > 0]
+        calendar.append({
+            "date": day,
+            "min_price": min((f["price"] for f in flights), default=None),
+            "seats": sum(f["available_seats"] for f in flights),
+            "flights": len(flights),
+        })
+    return calendar
+
+
+def timed(fn, queries):
+    started = time.perf_counter()
+    for q in queries:
+        fn(*q)
+    return (time.perf_counter() - started) / len(queries) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Price calendar benchmark")
+    parser.add_argument("--flights", type=int, default=200_000)
+    parser.add_argument("--airports", type=int, default=20)
+    parser.add_argument("--days", type=int, default=3)
+    parser.add_argument("--queries", type=int, default=500)
+    args = parser.parse_args()
+
+    temp_database("calendar.db")
+    codes = seed_flights(args.flights, airports=args.airports, days=120)
+    flight_cache.enabled = False  # measure the database paths, not the LRU
+
+    rng = random.Random(5)
+    queries = []
+    for _ in range(args.queries):
+        origin, destination = rng.sample(codes[:4], 2)  # a few hot city pairs
+        center = (date(2030, 1, 10) + timedelta(days=rng.randint(0, 90))).isoformat()
+        queries.append((origin, destination, center, args.days))
+
+    for q in queries[:50]:
+        assert naive_calendar(*q) == FlightService.get_price_calendar(*q), q
+
+    naive_us = timed(naive_calendar, queries)
+    grouped_us = timed(FlightService.get_price_calendar, queries)
+
+    for a in codes[:4]:
+        for b in codes[:4]:
+            if a != b:
+                FlightService.mark_hot_route(a, b)
+    for q in queries[:50]:
+        assert naive_calendar(*q) == FlightService.get_price_calendar(*q), q
+    materialized_us = timed(FlightService.get_price_calendar, queries)
+
+    print(f"🐢 Per-day loop:  {naive_us:,.0f} µs/calendar")
+    print(f"📊 Grouped query: {grouped_us:,.0f} µs/calendar ({naive_us / grouped_us:.1f}x)")
+    print(f"🔥 Materialized:  {materialized_us:,.0f} µs/calendar ({naive_us / materialized_us:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
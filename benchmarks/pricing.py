@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+# benchmarks/pricing.py
+#
+# Repricing the whole flights table (backend.pricing): the NumPy engine and
+# its pure-Python fallback, phase by phase, against a row-by-row loop that
+# computes each fare in Python and issues one UPDATE per flight. Every run
+# starts from the same published fares.
+#
+#   python benchmarks/pricing.py --flights 100000 --bookings 200000
+import sys, os
+import time
+import argparse
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import generate_database, quiet
+from backend import pricing
+from backend.database import pooled_connection
+
+
+def reset_prices():
+    with pooled_connection() as conn:
+        conn.execute("UPDATE flights SET price = base_price, base_price = NULL WHERE base_price IS NOT NULL")
+        conn.commit()
+
+
+def row_by_row(today):
+    """One flight at a time: read, compute, UPDATE."""
+    started = time.perf_counter()
+    repriced = 0
+    with pooled_connection() as conn:
+        ids = [r[0] for r in conn.execute("SELECT flight_id FROM flights WHERE date >= ?", (today,))]
+        conn.execute("BEGIN IMMEDIATE;")
+        for flight_id in ids:
+            fid, base, price, available, sold, day = conn.execute("""
+                SELECT flight_id, COALESCE(base_price, price), price, available_seats,
+                       (SELECT COALESCE(SUM(seat_count), 0) FROM bookings b WHERE b.flight_id = f.flight_id), date
+                FROM flights f WHERE flight_id = ?
+            """, (flight_id,)).fetchone()
+            columns = {"ids": (fid,), "base": (base,), "price": (price,), "available": (available,),
+                       "sold": (sold,), "date": (day,)}
+            new = pricing.compute_prices(columns, today, pricing.DEFAULT_FARE_RULES)[0]
+            if abs(new - price) >= 0.005:
+                conn.execute("UPDATE flights SET base_price = COALESCE(base_price, price), price = ? WHERE flight_id = ?",
+                             (new, flight_id))
+                repriced += 1
+        conn.commit()
+    return repriced, (time.perf_counter() - started) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Whole-table repricing benchmark")
+    parser.add_argument("--flights", type=int, default=50_000)
+    parser.add_argument("--bookings", type=int, default=100_000)
+    parser.add_argument("--today", default="2030-01-01", help="generated flights start on 2030-01-01")
+    parser.add_argument("--skip-row-by-row", action="store_true")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    with quiet():
+        dataset = generate_database(users=1000, flights=args.flights, bookings=args.bookings, seed=args.seed)
+    print(f"🗄️ {dataset['flights']:,} flights, {dataset['bookings']:,} bookings")
+
+    numpy_module = pricing.np
+    engines = (["numpy"] if numpy_module is not None else []) + ["python"]
+    if numpy_module is None:
+        print("⚠️ NumPy is not installed: only the pure-Python engine runs")
+    for engine in engines:
+        pricing.np = numpy_module if engine == "numpy" else None
+        reset_prices()
+        report = pricing.reprice(today=args.today)
+        pricing.print_report(report)
+    pricing.np = numpy_module
+
+    if not args.skip_row_by_row:
+        reset_prices()
+        pricing.np = None   # scalar inputs: the fallback path is the per-row computation
+        repriced, ms = row_by_row(args.today)
+        pricing.np = numpy_module
+        print(f"🐢 [row-by-row] repriced {repriced:,} flights in {ms:,.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
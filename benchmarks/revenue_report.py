@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+# benchmarks/revenue_report.py
+#
+# Admin revenue reports read from the summary tables (backend.revenue) vs
+# re-aggregating bookings x flights on every request, plus the cost of a
+# full rebuild / consistency check and of keeping the summaries current on
+# each booking and cancellation.
+#
+#   python benchmarks/revenue_report.py --flights 50000 --bookings 200000
+import sys, os
+import time
+import random
+import argparse
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import generate_database, quiet
+from backend import revenue
+from backend.database import read_connection
+from backend.booking_service import BookingService
+
+RAW_ROUTES = """
+    SELECT f.origin, f.destination, COUNT(b.booking_id), COALESCE(SUM(b.seat_count), 0), COALESCE(SUM(b.total_price), 0)
+    FROM flights f LEFT JOIN bookings b ON b.flight_id = f.flight_id
+    GROUP BY f.origin, f.destination
+    ORDER BY 5 DESC LIMIT 50
+"""
+RAW_DAYS = """
+    SELECT f.date, COUNT(b.booking_id), COALESCE(SUM(b.seat_count), 0), COALESCE(SUM(b.total_price), 0)
+    FROM flights f LEFT JOIN bookings b ON b.flight_id = f.flight_id
+    GROUP BY f.date ORDER BY f.date
+"""
+
+
+def raw(query):
+    with read_connection() as conn:
+        return conn.execute(query).fetchall()
+
+
+def timed_ms(fn, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Revenue summary benchmark")
+    parser.add_argument("--flights", type=int, default=50_000)
+    parser.add_argument("--bookings", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--writes", type=int, default=2000, help="bookings (+ cancellations) to time")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    with quiet():
+        dataset = generate_database(users=1000, flights=args.flights, bookings=args.bookings, seed=args.seed)
+    print(f"🗄️ {dataset['flights']:,} flights, {dataset['bookings']:,} bookings")
+
+    for name, summary, query in (
+        ("routes (top 50)", lambda: revenue.route_report(limit=50), RAW_ROUTES),
+        ("days", revenue.daily_report, RAW_DAYS),
+        ("totals", revenue.totals, "SELECT COUNT(*), SUM(seat_count), SUM(total_price) FROM bookings"),
+    ):
+        fast = timed_ms(summary, args.repeat)
+        slow = timed_ms(lambda: raw(query), args.repeat)
+        print(f"📊 {name:<16} summaries {fast:8.2f} ms | raw aggregation {slow:8.2f} ms | x{slow / max(fast, 1e-6):,.0f}")
+
+    rebuilt = revenue.rebuild()
+    checked = revenue.check()
+    print(f"🔄 rebuild {rebuilt['ms']:,.1f} ms | 🔎 check {checked['ms']:,.1f} ms (ok={checked['ok']})")
+
+    rng = random.Random(args.seed)
+    users = dataset["user_rows"]
+    started = time.perf_counter()
+    with quiet():
+        booked = [BookingService.create_booking(rng.choice(users)[0], rng.randint(1, dataset["flights"]), 1)
+                  for _ in range(args.writes)]
+        for booking in booked:
+            if booking:
+                BookingService.cancel_booking(booking["booking_id"])
+    per_op = (time.perf_counter() - started) / (2 * args.writes) * 1e6
+    print(f"🎫 create/cancel with summaries: {per_op:,.0f} µs per operation | still consistent: {revenue.check()['ok']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+# benchmarks/seat_map.py
+#
+# Seat allocation latency on a nearly full A380 cabin (backend.seat_map):
+# the bitmap allocator alone at several fill levels and party sizes, then
+# create_booking with and without a seat map.
+#
+#   python benchmarks/seat_map.py --fill 0.9 0.97 0.99 --trials 20000
+import sys, os
+import time
+import random
+import argparse
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import temp_database, quiet
+from backend.database import pooled_connection
+from backend.seat_map import parse_layout, BUILTIN_LAYOUTS
+from backend.flight_service import FlightService
+from backend.booking_service import BookingService
+from backend.user_service import UserService
+
+
+def fill_cabin(layout, fill, rng):
+    """Occupy seats the way bookings do (mostly 1-4 at a time) up to `fill`."""
+    occupied = 0
+    target = int(layout.capacity * fill)
+    while occupied.bit_count() < target:
+        n = min(rng.choice((1, 1, 2, 2, 3, 4)), target - occupied.bit_count())
+        seats = layout.allocate(occupied, n)
+        # start parties at random rows too, so gaps are scattered
+        if rng.random() < 0.5:
+            free = [i for i in range(layout.capacity) if not occupied >> i & 1]
+            seats = rng.sample(free, n)
+        occupied |= layout.mask(seats)
+    return occupied
+
+
+def time_allocations(layout, maps, n, trials):
+    started = time.perf_counter()
+    found = 0
+    for i in range(trials):
+        seats = layout.allocate(maps[i % len(maps)], n)
+        if seats and seats[-1] - seats[0] == n - 1:
+            found += 1
+    return (time.perf_counter() - started) / trials * 1e6, found / trials
+
+
+def time_bookings(flight_id, user_id, count):
+    started = time.perf_counter()
+    booked = 0
+    with quiet():
+        for _ in range(count):
+            if BookingService.create_booking(user_id, flight_id, 2):
+                booked += 1
+    return (time.perf_counter() - started) / max(count, 1) * 1e6, booked
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seat map allocation benchmark")
+    parser.add_argument("--fill", type=float, nargs="+", default=[0.5, 0.9, 0.97, 0.99])
+    parser.add_argument("--trials", type=int, default=20_000)
+    parser.add_argument("--maps", type=int, default=50, help="distinct random cabins per fill level")
+    parser.add_argument("--bookings", type=int, default=250)
+    args = parser.parse_args()
+
+    layout = parse_layout(BUILTIN_LAYOUTS["A380"])
+    rng = random.Random(7)
+    print(f"🛫 A380: {layout.capacity} seats in {len(layout.blocks)} blocks | "
+          f"{layout.blob_size} bytes per flight (Python int {sys.getsizeof(layout.all_seats)} bytes)")
+    for fill in args.fill:
+        maps = [fill_cabin(layout, fill, rng) for _ in range(args.maps)]
+        cells = []
+        for n in (1, 2, 3, 4):
+            us, together = time_allocations(layout, maps, n, args.trials)
+            cells.append(f"n={n} {us:5.2f} µs ({together:4.0%} adjacent)")
+        print(f"🪑 {fill:4.0%} full | " + " | ".join(cells))
+
+    # End to end: create_booking on an A380 with a seat map vs count-only
+    temp_database("seat_map.db")
+    with quiet():
+        UserService.register_user("bench", "bench")
+        user_id = UserService.login_user("bench", "bench")["user_id"]
+        FlightService.add_flight("AK380", "Dubai", "London", "2030-01-01", "02:30", 700.0, layout.capacity)
+        FlightService.add_flight("AK381", "Dubai", "London", "2030-01-01", "09:30", 700.0, layout.capacity)
+    with pooled_connection() as conn:
+        mapped, plain = [r[0] for r in conn.execute("SELECT flight_id FROM flights ORDER BY flight_id")]
+    with quiet():
+        FlightService.set_seat_layout(mapped, "A380")
+    count = min(args.bookings, layout.capacity // 2)
+    plain_us, _ = time_bookings(plain, user_id, count)
+    mapped_us, booked = time_bookings(mapped, user_id, count)
+    print(f"🎫 create_booking (2 seats, {booked} bookings up to {booked * 2 / layout.capacity:.0%} full): "
+          f"count-only {plain_us:6.1f} µs | with seat map {mapped_us:6.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+# benchmarks/startup.py
+#
+# Application startup in fresh processes: process start -> login window
+# painted, login -> dashboard painted, and the first visit to the flights
+# page. "lazy" is the app as it is (pages and their imports built on first
+# navigation, data fetched after first paint); "eager" reproduces the old
+# behaviour by importing the dashboard up front and building every page
+# before the dashboard is shown.
+#
+#   QT_QPA_PLATFORM=offscreen python benchmarks/startup.py --runs 5 --flights 50000
+import sys, os
+import json
+import time
+import argparse
+import statistics
+import subprocess
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def child(variant, db_path, launched_at):
+    """Runs in the measured process; prints one JSON line of timings (ms)."""
+    from PyQt5.QtWidgets import QApplication, QMessageBox
+    from PyQt5.QtCore import QObject, QEvent
+
+    class FirstPaint(QObject):
+        def __init__(self, widget):
+            super().__init__()
+            self.painted = False
+            widget.installEventFilter(self)
+
+        def eventFilter(self, obj, event):
+            if event.type() == QEvent.Paint:
+                self.painted = True
+            return False
+
+    def until_painted(app, widget):
+        probe = FirstPaint(widget)
+        while not probe.painted:
+            app.processEvents()
+        return probe
+
+    from benchmarks.common import use_database
+    from backend.database import initialize_database
+    if variant == "eager":
+        import ui.dashboard_window
+        for module, _ in ui.dashboard_window.PAGES.values():
+            __import__(module)
+    from ui.login_window import LoginWindow
+
+    use_database(db_path)
+    app = QApplication(sys.argv)
+    initialize_database()
+    login = LoginWindow()
+    login.show()
+    until_painted(app, login)
+    timings = {"start_to_login": (time.time() - launched_at) * 1000}
+
+    QMessageBox.information = lambda *args, **kwargs: None
+    from backend.user_service import UserService
+    user = UserService.login_user("bench", "bench")
+    started = time.perf_counter()
+    login.login_done(user)
+    dashboard = login.dashboard
+    if variant == "eager":
+        # the old constructors built both pages and started both loads at once
+        dashboard.page("flights").load_flights()
+        dashboard.page("bookings").load_bookings()
+    until_painted(app, dashboard)
+    timings["login_to_dashboard"] = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    dashboard.switch_page("flights")
+    until_painted(app, dashboard.page("flights"))
+    timings["first_flights_visit"] = (time.perf_counter() - started) * 1000
+    print(json.dumps(timings), flush=True)
+
+
+def run_child(variant, db_path):
+    launched_at = time.time()
+    out = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", variant, db_path, repr(launched_at)],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Application startup benchmark")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--flights", type=int, default=50_000)
+    parser.add_argument("--bookings", type=int, default=50_000)
+    parser.add_argument("--child", nargs=3, metavar=("VARIANT", "DB", "LAUNCHED_AT"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child[0], args.child[1], float(args.child[2]))
+        return
+
+    from benchmarks.common import generate_database, quiet
+    from backend.user_service import UserService
+    with quiet():
+        dataset = generate_database(users=200, flights=args.flights, bookings=args.bookings)
+        UserService.register_user("bench", "bench")
+    print(f"🗄️ {dataset['flights']:,} flights, {dataset['bookings']:,} bookings | median of {args.runs} runs")
+
+    results = {}
+    for variant in ("eager", "lazy"):
+        runs = [run_child(variant, dataset["path"]) for _ in range(args.runs)]
+        results[variant] = {key: statistics.median(r[key] for r in runs) for key in runs[0]}
+        print(f"🚀 {variant:<5} | start → login {results[variant]['start_to_login']:7.1f} ms | "
+              f"login → dashboard {results[variant]['login_to_dashboard']:7.1f} ms | "
+              f"first Flights visit {results[variant]['first_flights_visit']:7.1f} ms")
+    eager, lazy = results["eager"], results["lazy"]
+    print(f"⚡ start → login x{eager['start_to_login'] / lazy['start_to_login']:.2f}, "
+          f"login → dashboard x{eager['login_to_dashboard'] / lazy['login_to_dashboard']:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+# -*- coding: utf-8 -*-
+# benchmarks/suite.py
+#
+# Scenario benchmarks over a generated database, with JSON results that can
+# be compared across commits.
+#
+#   python benchmarks/suite.py --out before.json
+#   git checkout my-branch
+#   python benchmarks/suite.py --out after.json --baseline before.json   # exit 1 on regression
+#   python benchmarks/suite.py --diff before.json after.json             # compare saved runs
+#
+# Sizes, seed and iteration counts are flags; the same flags give the same
+# data and the same sequence of operations.
+import sys, os
+import json
+import time
+import random
+import sqlite3
+import argparse
+import platform
+import subprocess
+from datetime import date, timedelta
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import generate_database, quiet
+from backend.cache import flight_cache
+from backend.database import pooled_connection
+from backend.flight_service import FlightService
+from backend.booking_service import BookingService
+from backend.user_service import UserService
+
+DEFAULT_THRESHOLD = 0.15      # allowed slowdown of the compared metric
+# writes wait on fsync/WAL checkpoints and are noisier
+SCENARIO_THRESHOLDS = {"booking": 0.30, "cancellation": 0.30}
+COMPARE_METRIC = "p50_us"
+
+
+# ------------------------------------------------------------------------------
+# Scenarios — each gets (dataset, rng) and returns a zero-argument operation
+# ------------------------------------------------------------------------------
+def _search_args(dataset, rng):
+    origin, destination = rng.sample(dataset["airport_codes"], 2)
+    day = date(2030, 1, 1) + timedelta(days=rng.randrange(dataset["days"]))
+    return origin, destination, day.isoformat()
+
+
+def scenario_search(dataset, rng):
+    flight_cache.enabled = False
+    return lambda: FlightService.search_flights(*_search_args(dataset, rng))
+
+
+def scenario_search_cached(dataset, rng):
+    flight_cache.enabled = True
+    hot = [_search_args(dataset, rng) for _ in range(50)]   # a few popular searches
+    return lambda: FlightService.search_flights(*rng.choice(hot))
+
+
+def scenario_get_by_id(dataset, rng):
+    flight_cache.enabled = False
+    return lambda: FlightService.get_flight_by_id(rng.randint(1, dataset["flights"]))
+
+
+def scenario_booking(dataset, rng):
+    flight_cache.enabled = True
+    users = dataset["user_rows"]
+
+    def book():
+        booking = BookingService.create_booking(rng.choice(users)[0], rng.randint(1, dataset["flights"]), 1)
+        if booking:
+            dataset.setdefault("created_bookings", []).append(booking["booking_id"])
+    return book
+
+
+def scenario_cancellation(dataset, rng):
+    flight_cache.enabled = True
+    with pooled_connection() as conn:
+        ids = [row[0] for row in conn.execute("SELECT booking_id FROM bookings")]
+    rng.shuffle(ids)
+    return lambda: BookingService.cancel_booking(ids.pop())
+
+
+def scenario_user_bookings(dataset, rng):
+    users = dataset["user_rows"]
+    return lambda: BookingService.get_user_bookings_page(rng.choice(users)[0], page_size=20, with_total=True)
+
+
+def scenario_user_bookings_all(dataset, rng):
+    users = dataset["user_rows"]
+    return lambda: BookingService.get_user_bookings(rng.choice(users)[0])
+
+
+def scenario_admin_listing(dataset, rng):
+    state = {"cursor": None}
+
+    def page():
+        # walk forward a few pages, then start over, like an admin paging
+        result = BookingService.get_all_bookings_page(state["cursor"], page_size=50,
+                                                      with_total=state["cursor"] is None)
+        state["cursor"] = result["next_cursor"] if rng.random() < 0.8 else None
+    return page
+
+
+def scenario_login(dataset, rng):
+    users = dataset["user_rows"]
+
+    def login():
+        _, username, password = rng.choice(users)
+        assert UserService.login_user(username, password)
+    return login
+
+
+SCENARIOS = {
+    "search": scenario_search,
+    "search_cached": scenario_search_cached,
+    "get_by_id": scenario_get_by_id,
+    "booking": scenario_booking,
+    "cancellation": scenario_cancellation,
+    "user_bookings": scenario_user_bookings,
+    "user_bookings_all": scenario_user_bookings_all,
+    "admin_listing": scenario_admin_listing,
+    "login": scenario_login,
+}
+
+
+# ------------------------------------------------------------------------------
+# Running
+# ------------------------------------------------------------------------------
+def _percentile(sorted_values, q):
+    return sorted_values[min(len(sorted_values) - 1, int(q / 100 * len(sorted_values)))]
+
+
+def run_scenario(name, dataset, iterations, warmup, seed):
+    rng = random.Random(f"{seed}:{name}")
+    op = SCENARIOS[name](dataset, rng)
+    timings = []
+    with quiet():
+        for _ in range(warmup):
+            op()
+        started = time.perf_counter()
+        for _ in range(iterations):
+            t0 = time.perf_counter()
+            op()
+            timings.append(time.perf_counter() - t0)
+        elapsed = time.perf_counter() - started
+    timings.sort()
+    return {
+        "iterations": iterations,
+        "p50_us": round(_percentile(timings, 50) * 1e6, 1),
+        "p95_us": round(_percentile(timings, 95) * 1e6, 1),
+        "p99_us": round(_percentile(timings, 99) * 1e6, 1),
+        "mean_us": round(sum(timings) / len(timings) * 1e6, 1),
+        "ops_per_s": round(iterations / elapsed, 1),
+    }
+
+
+def _git_commit():
+    try:
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=root,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(users, flights, bookings, iterations, warmup, seed, only=None):
+    dataset = generate_database(users=users, flights=flights, bookings=bookings, seed=seed)
+    results = {}
+    for name in SCENARIOS:
+        if only and name not in only:
+            continue
+        results[name] = run_scenario(name, dataset, iterations, warmup, seed)
+        print(f"⏱️ {name:<18} p50 {results[name]['p50_us']:>9,.1f} µs | p99 {results[name]['p99_us']:>9,.1f} µs "
+              f"| {results[name]['ops_per_s']:>9,.0f} ops/s")
+    flight_cache.enabled = True
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "seed": seed,
+            "dataset": {k: dataset[k] for k in ("users", "flights", "bookings", "airports", "days")},
+            "build_seconds": dataset["build_seconds"],
+            "iterations": iterations,
+            "warmup": warmup,
+        },
+        "scenarios": results,
+    }
+
+
+# ------------------------------------------------------------------------------
+# Comparing
+# ------------------------------------------------------------------------------
+def compare(baseline, current, threshold=DEFAULT_THRESHOLD, metric=COMPARE_METRIC):
+    """
+    Compare two result documents. Returns [(scenario, base, now, change, limit, regressed)].
+    A scenario regresses when `metric` grew by more than its threshold.
+    """
+    rows = []
+    for name, now in current["scenarios"].items():
+        base = baseline["scenarios"].get(name)
+        if base is None:
+            continue
+        limit = SCENARIO_THRESHOLDS.get(name, threshold)
+        change = now[metric] / base[metric] - 1 if base[metric] else 0.0
+        rows.append((name, base[metric], now[metric], change, limit, change > limit))
+    return rows
+
+
+def print_comparison(rows, baseline, current, metric=COMPARE_METRIC):
+    if baseline["meta"].get("dataset") != current["meta"].get("dataset"):
+        print("⚠️ Datasets differ; numbers are not directly comparable.")
+    print(f"📊 {metric}: {baseline['meta'].get('commit')} → {current['meta'].get('commit')}")
+    for name, base, now, change, limit, regressed in rows:
+        icon = "❌" if regressed else ("✅" if change < -limit else "➖")
+        print(f"   {icon} {name:<18} {base:>9,.1f} → {now:>9,.1f} ({change:+.1%}, limit +{limit:.0%})")
+    regressions = [row[0] for row in rows if row[5]]
+    if regressions:
+        print(f"❌ Regressions: {', '.join(regressions)}")
+    else:
+        print("✅ No regressions.")
+    return not regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scenario benchmark suite")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--flights", type=int, default=50_000)
+    parser.add_argument("--bookings", type=int, default=100_000)
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--warmup", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--only", nargs="+", choices=sorted(SCENARIOS), help="run just these scenarios")
+    parser.add_argument("--out", help="write results JSON here")
+    parser.add_argument("--baseline", help="results JSON to compare this run against")
+    parser.add_argument("--diff", nargs=2, metavar=("BASELINE", "CURRENT"), help="compare two saved runs")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--metric", default=COMPARE_METRIC, choices=["p50_us", "p95_us", "p99_us", "mean_us"])
+    args = parser.parse_args()
+
+    if args.diff:
+        with open(args.diff[0]) as f:
+            baseline = json.load(f)
+        with open(args.diff[1]) as f:
+            current = json.load(f)
+        ok = print_comparison(compare(baseline, current, args.threshold, args.metric), baseline, current, args.metric)
+        return 0 if ok else 1
+
+    current = run_suite(args.users, args.flights, args.bookings, args.iterations, args.warmup, args.seed, args.only)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(current, f, indent=2)
+        print(f"💾 Results written to {args.out}")
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        ok = print_comparison(compare(baseline, current, args.threshold, args.metric), baseline, current, args.metric)
+        return 0 if ok else 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+# benchmarks/ui_latency.py
+#
+# GUI event-loop stalls while FlightsPage refreshes and books, with the
+# backend called on the GUI thread (old behaviour) vs through BackendRunner.
+# Bookings are made while another connection holds the write lock, which is
+# the lock wait that used to freeze the dashboard.
+#
+#   QT_QPA_PLATFORM=offscreen python benchmarks/ui_latency.py --flights 5000 --hold-ms 400
+import sys, os
+import time
+import sqlite3
+import argparse
+import threading
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication, QMessageBox
+
+from benchmarks.common import temp_database, seed_flights, quiet
+from backend import database
+from backend.flight_service import FlightService
+from backend.booking_service import BookingService
+from backend.user_service import UserService
+from ui.latency_probe import EventLoopProbe
+from ui.pages.flights_page import FlightsPage
+
+
+def pump(app, seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        app.processEvents()
+        time.sleep(0.001)
+
+
+def wait_idle(app, page):
+    while page.runner.is_busy():
+        app.processEvents()
+        time.sleep(0.001)
+    app.processEvents()
+
+
+def hold_write_lock(hold_ms, locked):
+    conn = sqlite3.connect(database.DB_NAME)
+    conn.execute("BEGIN IMMEDIATE;")
+    locked.set()
+    time.sleep(hold_ms / 1000)
+    conn.commit()
+    conn.close()
+
+
+def run(app, page, probe, mode, refreshes, bookings, hold_ms, flight_ids):
+    probe.start()
+    for _ in range(refreshes):
+        if mode == "blocking":
+            model = page.model
+            model.clear()
+            model.add_page(FlightService.get_flights_page(
+                model.sort_by, model.descending, page_size=model.page_size, with_total=True))
+        else:
+            page.load_flights()
+            wait_idle(app, page)
+        pump(app, 0.02)
+
+    for i in range(bookings):
+        locked = threading.Event()
+        holder = threading.Thread(target=hold_write_lock, args=(hold_ms, locked))
+        holder.start()
+        locked.wait()
+        flight_id = flight_ids[i % len(flight_ids)]
+        if mode == "blocking":
+            page.booking_done(BookingService.create_booking(page.user["user_id"], flight_id, 1))
+        else:
+            page.book_flight(flight_id)
+            wait_idle(app, page)
+        holder.join()
+        pump(app, 0.02)
+    probe.stop()
+    return probe.summary()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="UI event-loop latency benchmark")
+    parser.add_argument("--flights", type=int, default=5000)
+    parser.add_argument("--refreshes", type=int, default=10)
+    parser.add_argument("--bookings", type=int, default=5)
+    parser.add_argument("--hold-ms", type=int, default=400, help="how long another writer holds the lock")
+    args = parser.parse_args()
+
+    temp_database("ui_latency.db")
+    seed_flights(args.flights, airports=50, days=60)
+    with quiet():
+        UserService.register_user("bench", "bench", "bench@example.com")
+        user = UserService.login_user("bench", "bench")
+    flight_ids = [f["flight_id"] for f in FlightService.get_all_flights()[:args.bookings]]
+
+    app = QApplication(sys.argv)
+    # confirmation dialogs would block a headless run
+    QMessageBox.information = QMessageBox.critical = lambda *a, **k: QMessageBox.Ok
+
+    page = FlightsPage(user)
+    wait_idle(app, page)
+    probe = EventLoopProbe(interval_ms=5)
+
+    results = {}
+    with quiet():
+        for mode in ("blocking", "worker"):
+            results[mode] = run(app, page, probe, mode, args.refreshes, args.bookings, args.hold_ms, flight_ids)
+
+    for mode, summary in results.items():
+        icon = "🐢" if mode == "blocking" else "⚡"
+        print(f"{icon} {mode:<9} max {summary['max_ms']:>7.1f} ms | p99 {summary['p99_ms']:>6.1f} ms | "
+              f"stalls ≥50ms: {summary['stalls']:>3} ({summary['stalled_ms']:,.0f} ms frozen)")
+
+
+if __name__ == "__main__":
+    main()
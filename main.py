@@ -1,15 +1,26 @@
 # -*- coding: utf-8 -*-
 # main.py — App entry point
 
+import os
 import sys
 from PyQt5.QtWidgets import QApplication
 from PyQt5.QtGui import QIcon
+from backend.database import initialize_database
 from ui.login_window import LoginWindow
 
 def main():
     # Create the application instance
     app = QApplication(sys.argv)
 
+    # Create tables / apply pending schema migrations before any page loads
+    initialize_database()
+
+    # AKF_METRICS=1 records service/SQL latency from startup (admins can also
+    # toggle it on the Metrics page)
+    if os.environ.get("AKF_METRICS"):
+        from backend import metrics
+        metrics.enable()
+
     # ✅ Set global app icon (applies to all windows)
     app.setWindowIcon(QIcon("assets/icon.png"))
 
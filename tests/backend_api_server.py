@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+import sys, os
+import json
+import time
+import asyncio
+import tempfile
+import threading
+import http.client
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend import database, change_feed
+from backend.api_server import ApiServer
+from backend.user_service import UserService
+from backend.flight_service import FlightService
+
+# Use a throwaway database
+database.DB_NAME = os.path.join(tempfile.mkdtemp(), "api_test.db")
+database.initialize_database()
+FlightService.add_flight("AK101", "Cairo", "London", "2030-11-01", "09:30", 320.0, 3)
+FlightService.add_flight("AK102", "Cairo", "Paris", "2030-11-02", "14:00", 450.0, 50)
+UserService.register_user("sara", "pw", "sara@example.com")
+UserService.register_user("omar", "pw", "omar@example.com")
+with database.pooled_connection() as db:
+    db.execute("UPDATE change_log SET changed_at = '2000-01-01 00:00:00.000'")  # a day-old log
+    db.commit()
+
+# Run the server on its own loop in a background thread
+server = ApiServer(port=0, max_workers=2)
+loop = asyncio.new_event_loop()
+port = loop.run_until_complete(server.start())
+threading.Thread(target=loop.run_forever, daemon=True).start()
+for _ in range(50):
+    if change_feed.stats()["entries"] == 1:
+        break
+    time.sleep(0.05)
+print("🧹 Change log pruned at startup:", change_feed.stats()["entries"], "entry left")
+
+conn = http.client.HTTPConnection("127.0.0.1", port)   # one keep-alive connection
+
+
+def call(method, path, body=None, token=None, client=None):
+    headers = {"Content-Type": "application/json"}
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    client = client or conn
+    client.request(method, path, json.dumps(body) if body is not None else None, headers)
+    response = client.getresponse()
+    return response.status, json.loads(response.read()), response
+
+
+# 1️⃣ Public endpoints
+status, health, response = call("GET", "/api/health")
+print("💓 Health:", status, health)
+print("⏱️ Server-Timing:", response.getheader("Server-Timing"), "| Connection:", response.getheader("Connection"))
+status, found, _ = call("GET", "/api/flights?origin=Cairo&destination=Paris")
+print("✈️ Search:", status, [f["flight_number"] for f in found["items"]])
+status, found, _ = call("GET", "/api/flights?q=lon")
+print("🔤 Text search:", status, [f["flight_number"] for f in found["items"]])
+flight_id = found["items"][0]["flight_id"]
+status, flight, _ = call("GET", f"/api/flights/{flight_id}")
+print("🔎 Details:", status, flight["flight_number"], flight["departure"], "→", flight["destination"],
+      flight["date"], flight["time"], flight["available_seats"], "seats")
+print("🚫 Missing flight:", call("GET", "/api/flights/9999")[:2])
+print("🚫 Bad search:", call("GET", "/api/flights?origin=Cairo")[:2])
+print("🚫 Wrong method:", call("PUT", "/api/flights")[:2])
+
+# 2️⃣ Login and bookings
+print("🔒 Bad login:", call("POST", "/api/login", {"username": "sara", "password": "nope"})[:2])
+print("🔒 No token:", call("GET", "/api/bookings")[:2])
+_, sara, _ = call("POST", "/api/login", {"username": "sara", "password": "pw"})
+_, omar, _ = call("POST", "/api/login", {"username": "omar", "password": "pw"})
+status, booking, _ = call("POST", "/api/bookings", {"flight_id": flight_id, "seat_count": 2}, sara["token"])
+print("📘 Booked:", status, booking["seat_count"], "seats,", booking["total_price"])
+print("❌ Overbooked:", call("POST", "/api/bookings", {"flight_id": flight_id, "seat_count": 2}, sara["token"])[:2])
+status, page, _ = call("GET", "/api/bookings?page_size=5&total=1", token=sara["token"])
+print("📄 Sara's bookings:", status, page["total"], [b["flight_number"] for b in page["items"]])
+print("📄 Bad cursor:", call("GET", "/api/bookings?cursor=zzz", token=sara["token"])[:2])
+
+# 3️⃣ Cancelling: only the owner can
+print("🛑 Omar cancels Sara's:", call("DELETE", f"/api/bookings/{booking['booking_id']}", token=omar["token"])[:2])
+print("🛑 Sara cancels:", call("DELETE", f"/api/bookings/{booking['booking_id']}", token=sara["token"])[:2])
+print("🔎 Seats back:", call("GET", f"/api/flights/{flight_id}")[1]["available_seats"])
+
+# Expired sessions are swept even if their token never comes back
+
+
+async def sweep():
+    return server.sweep_sessions()
+
+
+server.sessions["stale"] = (None, time.time() - 1)
+swept = asyncio.run_coroutine_threadsafe(sweep(), loop).result()
+print("🧹 Swept sessions:", swept, "| still logged in:", call("GET", "/api/bookings", token=sara["token"])[0])
+
+# 4️⃣ Connection: close is honoured, malformed JSON is a 400
+other = http.client.HTTPConnection("127.0.0.1", port)
+other.request("GET", "/api/health", headers={"Connection": "close"})
+response = other.getresponse()
+response.read()
+print("🔌 Close requested:", response.getheader("Connection"))
+conn.request("POST", "/api/login", b"{oops", {"Content-Type": "application/json"})
+response = conn.getresponse()
+print("🧾 Bad JSON:", response.status, json.loads(response.read()))
+
+conn.close()
+asyncio.run_coroutine_threadsafe(server.close(), loop).result()
+loop.call_soon_threadsafe(loop.stop)
+print("✅ Server stopped.")
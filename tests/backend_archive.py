@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+import sys, os
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend import database, archive, revenue
+from backend.user_service import UserService
+from backend.flight_service import FlightService
+from backend.booking_service import BookingService
+
+# Use a throwaway database
+database.DB_NAME = os.path.join(tempfile.mkdtemp(), "archive_test.db")
+database.initialize_database()
+
+for number, day in (("AK700", "2029-12-30"), ("AK701", "2029-12-31"), ("AK702", "2030-01-02")):
+    FlightService.add_flight(number, "Tunis", "Rome", day, "10:00", 120.0, 30)
+UserService.register_user("yusuf", "pw")
+yusuf = UserService.login_user("yusuf", "pw")
+flights = {f["flight_number"]: f["flight_id"] for f in FlightService.search_flights("Tunis", "Rome")}
+for number in flights:
+    BookingService.create_booking(yusuf["user_id"], flights[number], 2)
+FlightService.set_seat_layout(flights["AK700"], "A320")
+
+# 1️⃣ Nothing archived yet: history is the live data
+print("🗂️ Archive file before:", os.path.exists(archive.archive_path()))
+print("📚 History (no archive):", len(BookingService.get_user_bookings(yusuf["user_id"], include_archived=True)))
+
+# 2️⃣ Move departed flights in batches of one
+result = archive.archive_departed(before="2030-01-01", batch_size=1,
+                                  on_batch=lambda r: print("   📦 batch", r["batches"], "→", r["flights"], "flights"))
+print("🗄️ Archived:", {k: result[k] for k in ("flights", "bookings", "batches", "log_pruned")}, "| stats:", archive.stats())
+print("🔥 Live search:", [f["flight_number"] for f in FlightService.search_flights("Tunis", "Rome")])
+print("🔥 Live bookings:", [b["flight_number"] for b in BookingService.get_user_bookings(yusuf["user_id"])])
+print("📚 User history:", [(b["flight_number"], b["flight_date"], b["seats"])
+                          for b in BookingService.get_user_bookings(yusuf["user_id"], include_archived=True)])
+print("📚 Admin history:", [b["flight_number"] for b in BookingService.get_all_bookings(include_archived=True)])
+print("🔎 Revenue summaries still consistent:", revenue.check()["ok"], revenue.totals()["bookings"], "live bookings")
+
+# 3️⃣ Re-running is a no-op; a crash after the copy step is finished by the next run
+print("🔁 Second run:", archive.archive_departed(before="2030-01-01")["flights"])
+with database.pooled_connection() as conn:
+    archive.attach(conn)
+    conn.execute("INSERT INTO archive.flights (flight_id, flight_number, origin, destination, date, time, price, available_seats) "
+                 "SELECT flight_id, flight_number, origin, destination, date, time, price, available_seats "
+                 "FROM main.flights WHERE flight_number = 'AK702'")
+    conn.commit()
+result = archive.archive_departed(before="2030-01-03")
+print("🩹 After interrupted copy:", result["flights"], "moved |", archive.stats())
+print("📚 No duplicates:", sorted(b["flight_number"] for b in BookingService.get_all_bookings(include_archived=True)))
+
+
+# 4️⃣ A booking committed between the copy and the delete is neither lost nor orphaned
+FlightService.add_flight("AK703", "Tunis", "Rome", "2030-01-05", "10:00", 120.0, 30)
+late_flight = [f["flight_id"] for f in FlightService.search_flights("Tunis", "Rome") if f["flight_number"] == "AK703"][0]
+early = BookingService.create_booking(yusuf["user_id"], late_flight, 1)
+
+
+class BookAfterCopy:
+    """Connection stand-in that lets another session book right after the copy commits."""
+
+    def __init__(self, conn):
+        self.conn, self.late = conn, None
+
+    def execute(self, *args):
+        return self.conn.execute(*args)
+
+    def rollback(self):
+        self.conn.rollback()
+
+    def commit(self):
+        self.conn.commit()
+        if self.late is None:
+            self.late = BookingService.create_booking(yusuf["user_id"], late_flight, 1)
+
+
+with database.pooled_connection() as conn:
+    archive.attach(conn)
+    conn.execute("CREATE TEMP TABLE IF NOT EXISTS archive_batch (flight_id INTEGER PRIMARY KEY)")
+    conn.commit()
+    interleaved = BookAfterCopy(conn)
+    moved = archive._move_batch(interleaved, "2030-01-06", 10)
+live_ids = {b["booking_id"] for b in BookingService.get_all_bookings()}
+all_ids = [b["booking_id"] for b in BookingService.get_all_bookings(include_archived=True)]
+assert interleaved.late["booking_id"] in live_ids and early["booking_id"] not in live_ids, live_ids
+assert sorted(all_ids) == sorted(set(all_ids)), all_ids
+assert [f["flight_number"] for f in FlightService.search_flights("Tunis", "Rome")] == ["AK703"]
+print("🔀 Booking during the move:", moved, "moved | late booking still live, its flight kept")
+result = archive.archive_departed(before="2030-01-06")
+assert result["flights"] == 1 and result["bookings"] == 1, result
+print("🧹 Next run finishes it:", {k: result[k] for k in ("flights", "bookings")}, "|", archive.stats())
+
+# 5️⃣ Departed flights take no new bookings
+FlightService.add_flight("AK704", "Tunis", "Rome", "2020-01-01", "10:00", 120.0, 30)
+departed = [f["flight_id"] for f in FlightService.search_flights("Tunis", "Rome") if f["flight_number"] == "AK704"][0]
+assert BookingService.create_booking(yusuf["user_id"], departed, 1) is None
+batch = BookingService.create_bookings_batch([(yusuf["user_id"], departed, 1)], all_or_nothing=False)
+assert batch[0]["status"] == "departed", batch
+print("🛬 Departed flight:", batch[0]["status"])
+
+# 6️⃣ A column migrated into main.bookings doesn't break history before the next archive run
+with database.pooled_connection() as conn:
+    conn.execute("ALTER TABLE bookings ADD COLUMN note TEXT")
+    conn.commit()
+history = BookingService.get_all_bookings(include_archived=True)
+assert len(history) == archive.stats()["archived_bookings"] + archive.stats()["hot_bookings"], history
+print("🧩 History after a new column:", len(history), "bookings, archived note:", history[-1]["note"],
+      "| user view:", len(BookingService.get_user_bookings(yusuf["user_id"], include_archived=True)))
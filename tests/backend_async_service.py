@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+import sys, os
+import time
+import asyncio
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.database import initialize_database
+from backend.async_service import AsyncServices, LatestOnly
+
+initialize_database()
+
+
+async def main():
+    services = AsyncServices(max_workers=4)
+
+    # 1️⃣ Service calls run in the pool while the event loop keeps ticking
+    ticks = 0
+
+    async def heartbeat():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.001)
+
+    beat = asyncio.ensure_future(heartbeat())
+    flights, user = await asyncio.gather(
+        services.get_all_flights(),
+        services.login_user("hamdi", "mypassword"),
+    )
+    print("✈️ Flights:", len(flights), "| 👤 User:", user and user["username"])
+    if user:
+        page = await services.get_user_bookings_page(user["user_id"], page_size=3)
+        print("📘 First bookings page:", [b["booking_id"] for b in page["items"]])
+
+    # 2️⃣ A newer request on the same key cancels the stale one
+    latest = LatestOnly()
+
+    async def slow_refresh(label):
+        await services.call(time.sleep, 0.1)
+        return label
+
+    stale = asyncio.ensure_future(latest.run("refresh", slow_refresh("stale")))
+    await asyncio.sleep(0.01)
+    fresh = await latest.run("refresh", slow_refresh("fresh"))
+    print("🔄 Latest refresh:", fresh, "| stale cancelled:", stale.cancelled())
+
+    beat.cancel()
+    print("💓 Event loop ticks while waiting:", ticks)
+    services.shutdown()
+
+
+asyncio.run(main())
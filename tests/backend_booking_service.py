@@ -19,9 +19,8 @@ if user is None:
     raise Exception("❌ User login failed.")
 
 # 2️⃣ Create a flight
-FlightService.add_flight("AK102", "Cairo", "Paris", "2025-10-25", "14:00", 450.0, 30)
-flights = FlightService.get_all_flights()
-flight = flights[0]
+FlightService.add_flight("AK102", "Cairo", "Paris", "2030-10-25", "14:00", 450.0, 30)
+flight = FlightService.search_flights("Cairo", "Paris", "2030-10-25")[0]
 
 # 3️⃣ Create a booking
 booking = BookingService.create_booking(user["user_id"], flight["flight_id"], seat_count=2)
@@ -48,3 +47,13 @@ if flight_after:
 else:
     print("⚠️ Flight not found after cancellation.")
 
+
+# 8️⃣ Group booking in one transaction (all-or-nothing)
+results = BookingService.create_bookings_batch([
+    {"user_id": user["user_id"], "flight_id": flight["flight_id"], "seat_count": 1},
+    {"user_id": user["user_id"], "flight_id": flight["flight_id"], "seat_count": 1},
+])
+print("👥 Batch results:", [r["status"] for r in results])
+for r in results:
+    if r["booking"]:
+        BookingService.cancel_booking(r["booking"]["booking_id"])
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+import sys, os
+import sqlite3
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend import database
+from backend.database import initialize_database
+from backend.cache import cache_stats
+from backend.user_service import UserService
+from backend.flight_service import FlightService
+from backend.booking_service import BookingService
+
+initialize_database()
+user = UserService.login_user("hamdi", "mypassword")
+FlightService.add_flight("AK150", "Cairo", "London", "2030-10-20", "09:30", 320.5, 50)
+
+# 1️⃣ Repeated searches hit the cache
+for _ in range(10):
+    results = FlightService.search_flights("Cairo", "London")
+print("🔍 Cached search:", len(results), "flights")
+print("📊 Search cache:", cache_stats()["search"])
+
+# 2️⃣ A booking invalidates the searches showing that flight
+flight = next(f for f in results if f["flight_number"] == "AK150")  # not departed yet
+booking = BookingService.create_booking(user["user_id"], flight["flight_id"], 1)
+after = {f["flight_id"]: f for f in FlightService.search_flights("Cairo", "London")}
+print("💺 Seats before/after booking:", flight["available_seats"], after[flight["flight_id"]]["available_seats"])
+if booking:
+    BookingService.cancel_booking(booking["booking_id"])
+
+# 3️⃣ A write from another connection is picked up via PRAGMA data_version
+FlightService.get_flight_by_id(flight["flight_id"])
+other = sqlite3.connect(database.DB_NAME)
+other.execute("UPDATE flights SET price = price + 1 WHERE flight_id = ?", (flight["flight_id"],))
+other.commit()
+print("💲 Price seen after external update:", FlightService.get_flight_by_id(flight["flight_id"])["price"])
+other.execute("UPDATE flights SET price = price - 1 WHERE flight_id = ?", (flight["flight_id"],))
+other.commit()
+other.close()
+
+print("📊 Cache stats:", cache_stats())
+
+# 4️⃣ An external write that lands just before our own is not mistaken for it
+FlightService.get_flight_by_id(flight["flight_id"])
+other = sqlite3.connect(database.DB_NAME)
+other.execute("UPDATE flights SET price = price + 5 WHERE flight_id = ?", (flight["flight_id"],))
+other.commit()
+other.close()
+neighbour = next(f for f in FlightService.get_all_flights() if f["flight_id"] != flight["flight_id"])
+FlightService.update_available_seats(neighbour["flight_id"], neighbour["available_seats"])  # our own write
+print("💲 Price seen after external + local write:", FlightService.get_flight_by_id(flight["flight_id"])["price"],
+      "| external changes:", cache_stats()["external_changes"])
+other = sqlite3.connect(database.DB_NAME)
+other.execute("UPDATE flights SET price = price - 5 WHERE flight_id = ?", (flight["flight_id"],))
+other.commit()
+other.close()
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+import sys, os
+import time
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend import database
+from backend.change_feed import ChangeFeed, prune, stats, RETENTION_HOURS
+from backend.user_service import UserService
+from backend.flight_service import FlightService
+from backend.booking_service import BookingService
+
+# Use a throwaway database
+database.DB_NAME = os.path.join(tempfile.mkdtemp(), "change_feed_test.db")
+database.initialize_database()
+
+FlightService.add_flight("AK800", "Tunis", "Rome", "2030-03-01", "10:00", 150.0, 20)
+FlightService.add_flight("AK801", "Tunis", "Rome", "2030-03-02", "10:00", 160.0, 20)
+UserService.register_user("maryam", "pw")
+UserService.register_user("omar", "pw")
+maryam = UserService.login_user("maryam", "pw")
+omar = UserService.login_user("omar", "pw")
+flights = {f["flight_number"]: f["flight_id"] for f in FlightService.search_flights("Tunis", "Rome")}
+
+feed = ChangeFeed(user_id=maryam["user_id"])
+print("▶️ Started at change:", feed.start())
+print("💤 Idle poll:", feed.poll())
+
+# 1️⃣ A booking: the flight's seat count and maryam's booking, nothing else
+booking = BookingService.create_booking(maryam["user_id"], flights["AK800"], 2)
+changes = feed.poll()
+print("✈️ Flights:", changes["flights"], "| seats now", changes["flight_rows"][flights["AK800"]]["available_seats"])
+print("📘 Bookings:", changes["bookings"])
+
+# 2️⃣ Someone else's booking only shows up as a flight change
+BookingService.create_booking(omar["user_id"], flights["AK801"], 1)
+changes = feed.poll()
+print("👥 Other user:", changes["flights"], changes["bookings"])
+
+# 3️⃣ Ops fold per row: insert + update is an insert, insert + delete is nothing
+FlightService.add_flight("AK802", "Tunis", "Rome", "2030-03-03", "10:00", 170.0, 20)
+new_id = [f["flight_id"] for f in FlightService.search_flights("Tunis", "Rome") if f["flight_number"] == "AK802"][0]
+FlightService.update_available_seats(new_id, 19)
+BookingService.cancel_booking(booking["booking_id"])
+changes = feed.poll()
+print("🧮 Folded:", changes["flights"], changes["bookings"])
+
+# 4️⃣ Too many changes, or a pruned gap, turn into a reset
+feed.max_changes = 2
+for seats in (18, 17, 16):
+    FlightService.update_available_seats(new_id, seats)
+print("🔄 Over the limit:", feed.poll()["reset"])
+feed.max_changes = 5000
+behind = ChangeFeed()
+behind.start()
+FlightService.update_available_seats(new_id, 15)
+FlightService.update_available_seats(new_id, 14)
+print("✈️ Caught up:", feed.poll()["flights"])
+time.sleep(0.01)
+print("🧹 Pruned:", prune(hours=0), "| stats:", stats()["entries"], "entry left")
+print("🔄 Reader behind the prune:", behind.poll()["reset"], "| caught-up reader:", feed.poll()["reset"])
+print("📊 Feed stats:", feed.stats)
+
+# 5️⃣ Retention: entries older than RETENTION_HOURS go, recent ones stay
+with database.pooled_connection() as conn:
+    conn.execute("UPDATE change_log SET changed_at = '2000-01-01 00:00:00.000'")
+    conn.commit()
+FlightService.update_available_seats(new_id, 13)
+FlightService.update_available_seats(new_id, 12)
+removed = prune(RETENTION_HOURS)
+left = stats()
+assert removed == 1 and left["entries"] == 2, (removed, left)
+print(f"🗓️ Retention prune: {removed} old entry removed, {left['entries']} recent kept")
+print("✈️ Caught-up reader still diffs:", feed.poll()["flights"])
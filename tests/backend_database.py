@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+import sys, os
+import threading
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.database import initialize_database, pooled_connection, pool_stats, close_pool
+from backend.cache import flight_cache
+from backend.flight_service import FlightService
+
+initialize_database()
+
+# 1️⃣ Pragmas are applied to pooled connections
+with pooled_connection() as conn:
+    print("📓 journal_mode:", conn.execute("PRAGMA journal_mode").fetchone()[0])
+    print("⏱️ busy_timeout:", conn.execute("PRAGMA busy_timeout").fetchone()[0])
+
+# 2️⃣ Repeated calls on the same thread reuse one warm connection
+for _ in range(100):
+    FlightService.get_all_flights()
+print("📊 Pool stats (single thread):", pool_stats())
+
+# 3️⃣ Several threads share the pool
+def worker():
+    for _ in range(50):
+        FlightService.search_flights("Cairo", "London")
+
+threads = [threading.Thread(target=worker) for _ in range(16)]
+for t in threads:
+    t.start()
+for t in threads:
+    t.join()
+print("📊 Pool stats (16 threads):", pool_stats())
+
+# 4️⃣ close_pool() also closes the data_version watcher connections
+watcher = flight_cache._watcher
+watcher.current()
+close_pool()
+print("🔌 Watcher connection after close_pool:", watcher._conn)
+print("🔁 Reopens on demand:", FlightService.search_flights("Cairo", "London") is not None, watcher._conn is not None)
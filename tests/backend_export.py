@@ -0,0 +1,23 @@
+# -*- coding: utf-8 -*-
+import sys, os
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.database import initialize_database
+from backend.export import export, read_columnar
+
+initialize_database()
+out_dir = tempfile.mkdtemp()
+
+# 1️⃣ Booking ledger in every format
+for fmt in ("csv", "jsonl", "columnar"):
+    path = os.path.join(out_dir, f"bookings.{fmt}.gz")
+    result = export("bookings", fmt, path, use_gzip=True)
+    print(f"📤 {fmt}: {result['rows']} rows, {os.path.getsize(path)} bytes")
+
+# 2️⃣ Columnar file reads back
+print("📥 Columnar rows:", list(read_columnar(os.path.join(out_dir, "bookings.columnar.gz")))[:2])
+
+# 3️⃣ Route filter on flights
+result = export("flights", "csv", os.path.join(out_dir, "cairo_paris.csv"), origin="Cairo", destination="Paris")
+print("✈️ Cairo → Paris flights exported:", result["rows"])
@@ -2,8 +2,11 @@
 import sys, os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from backend.database import initialize_database
 from backend.flight_service import FlightService
 
+initialize_database()
+
 # Add a sample flight
 if FlightService.add_flight("AK101", "Cairo", "London", "2025-10-20", "09:30", 320.50, 50):
     print("✅ Flight added successfully!")
@@ -11,7 +14,30 @@ if FlightService.add_flight("AK101", "Cairo", "London", "2025-10-20", "09:30", 3
 # List all flights
 flights = FlightService.get_all_flights()
 print("✈️ All Flights:", flights)
+first = flights[0]
+print("🧾 Record access:", first["departure"], first.get("destination"), first.get("flight_number", "-"), dict(first))
+
+# Records are shared through the cache, so they can't be changed in place
+shared = FlightService.get_flight_by_id(first["flight_id"])
+for change in (lambda: setattr(shared, "available_seats", 0), lambda: delattr(shared, "price")):
+    try:
+        change()
+        raise AssertionError("FlightRecord accepted a change")
+    except AttributeError as e:
+        print("🔒", e)
+assert FlightService.get_flight_by_id(first["flight_id"])["available_seats"] == first["available_seats"]
 
 # Search flights
 search_results = FlightService.search_flights("Cairo", "London")
 print("🔍 Search Results:", search_results)
+
+# Cheapest fare per day around a date
+calendar = FlightService.get_price_calendar("Cairo", "London", "2025-10-20", days=3)
+print("🗓️ Price calendar:", calendar)
+
+# Paged listing sorted in SQL, one keyset page at a time
+page = FlightService.get_flights_page(sort_by="price", page_size=2, with_total=True)
+print("📄 Cheapest flights page:", [f["price"] for f in page["items"]], "of", page["total"])
+if page["next_cursor"]:
+    page = FlightService.get_flights_page(sort_by="price", cursor=page["next_cursor"], page_size=2)
+    print("📄 Next page:", [f["price"] for f in page["items"]])
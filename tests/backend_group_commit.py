@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+import sys, os
+import time
+import sqlite3
+import tempfile
+import threading
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend import database, group_commit
+from backend.database import read_connection
+from backend.user_service import UserService
+from backend.flight_service import FlightService
+from backend.booking_service import BookingService
+
+# Use a throwaway database
+database.DB_NAME = os.path.join(tempfile.mkdtemp(), "group_commit_test.db")
+database.initialize_database()
+FlightService.add_flight("AK101", "Cairo", "London", "2030-11-01", "09:30", 100.0, 10)
+UserService.register_user("sara", "pw", "sara@example.com")
+sara = UserService.login_user("sara", "pw")
+flight_id = FlightService.search_flights("Cairo", "London")[0]["flight_id"]
+
+
+def seats_left():
+    with read_connection() as conn:
+        return conn.execute("SELECT available_seats FROM flights WHERE flight_id = ?", (flight_id,)).fetchone()[0]
+
+
+group_commit.enable()
+print("🔀 Split mode:", group_commit.is_enabled())
+
+# 1️⃣ Reads come from query_only connections
+with read_connection() as conn:
+    try:
+        conn.execute("DELETE FROM flights")
+        print("⚠️ Read connection accepted a write!")
+    except sqlite3.OperationalError as e:
+        print("🔒 Read connection refuses writes:", e)
+
+# 2️⃣ 16 concurrent bookers for 10 seats: batched, never oversold
+results = [None] * 16
+start = threading.Barrier(16)
+
+
+def book(i):
+    start.wait()
+    results[i] = BookingService.create_booking(sara["user_id"], flight_id, 1)
+
+
+threads = [threading.Thread(target=book, args=(i,)) for i in range(16)]
+for t in threads:
+    t.start()
+for t in threads:
+    t.join()
+booked = [r for r in results if r]
+print("🎫 Booked:", len(booked), "| refused:", results.count(None),
+      "| seats left:", seats_left())
+print("🧾 Distinct booking ids:", len({r["booking_id"] for r in booked}))
+stats = group_commit.writer_stats()
+print("📦 Writer:", stats["writes"], "writes in", stats["batches"], "commits, largest batch", stats["largest_batch"])
+
+# 3️⃣ A failing body is rolled back alone; its batch neighbours commit
+writer = group_commit.active_writer()
+
+
+def broken(conn):
+    conn.execute("UPDATE flights SET available_seats = 0 WHERE flight_id = ?", (flight_id,))
+    raise ValueError("boom")
+
+
+bad = writer.submit(broken)
+good = writer.submit(BookingService._release_seats, booked[0]["booking_id"])
+print("💥 Broken body:", repr(bad.exception()), "| neighbour returned flight", good.result())
+print("✈️ Seats after rollback + cancel:", seats_left())
+
+# 4️⃣ Cancellation, batch bookings and new flights go through the writer too
+print("🛑 Cancel:", BookingService.cancel_booking(booked[1]["booking_id"]))
+print("🛑 Cancel again:", BookingService.cancel_booking(booked[1]["booking_id"]))
+before = writer.stats["writes"]
+print("🛫 Flight added:", FlightService.add_flight("AK102", "Cairo", "London", "2030-11-02", "09:30", 100.0, 10))
+second_id = [f["flight_id"] for f in FlightService.search_flights("Cairo", "London", "2030-11-02")][0]
+batch = BookingService.create_bookings_batch([(sara["user_id"], second_id, 1), (sara["user_id"], second_id, 2)])
+print("👥 Batch:", [r["status"] for r in batch], "| writer writes:", writer.stats["writes"] - before)
+
+# ... and so do the admin writes and registrations
+before = writer.stats["writes"]
+FlightService.update_available_seats(second_id, 8)
+print("🪑 Seat layout:", FlightService.set_seat_layout(second_id, "A320"),
+      "| unknown flight:", FlightService.set_seat_layout(999999, "A320"))
+FlightService.mark_hot_route("Cairo", "London")
+FlightService.unmark_hot_route("Cairo", "London")
+print("👤 Register:", UserService.register_user("layla", "pw"), "| again:", UserService.register_user("layla", "pw"))
+assert writer.stats["writes"] - before == 7, writer.stats
+print("📦 Admin writes on the writer:", writer.stats["writes"] - before)
+
+# 5️⃣ A dead or stuck writer fails callers instead of hanging them
+
+
+def kill_writer(conn):
+    raise SystemExit("writer killed")
+
+
+try:
+    writer.execute(kill_writer)
+except group_commit.WriterUnavailable as e:
+    print("💀 Dead writer:", e)
+fresh = group_commit.active_writer()
+print("♻️ Restarted writer:", fresh is not writer and fresh.is_alive(),
+      "| booking:", bool(BookingService.create_booking(sara["user_id"], second_id, 1)))
+try:
+    fresh.execute(lambda conn: time.sleep(0.5), timeout=0.1)
+except group_commit.WriterUnavailable as e:
+    print("⏱️ Slow commit:", e)
+group_commit.disable()
+print("🔀 Split mode:", group_commit.is_enabled(), "| writer:", group_commit.active_writer())
+print("🎫 Shared-mode booking:", bool(BookingService.create_booking(sara["user_id"], second_id, 1)))
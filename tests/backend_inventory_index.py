@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+import sys, os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.database import initialize_database
+from backend.cache import flight_cache
+from backend.flight_service import FlightService
+from backend.inventory_index import InventoryIndex
+
+initialize_database()
+flight_cache.enabled = False
+
+# 1️⃣ Build the index
+index = InventoryIndex()
+print("🏗️ Indexed flights:", index.build())
+
+# 2️⃣ Same answer as the SQL search
+sql = FlightService.search_flights("Cairo", "Paris")
+FlightService.inventory_index = index
+indexed = FlightService.search_flights("Cairo", "Paris")
+key = lambda f: (f["date"], f["time"], f["flight_id"])
+assert sorted(sql, key=key) == sorted(indexed, key=key), "index and SQL search disagree"
+print("✅ Parity")
+
+# 3️⃣ A new flight shows up after an incremental refresh
+FlightService.add_flight("AK777", "Cairo", "Paris", "2025-11-01", "07:45", 399.0, 20)
+print("🔁 Rows reloaded:", index.refresh())
+print("🗓️ Window search:", index.search("Cairo", "Paris", start_date="2025-11-01", end_date="2025-11-30"))
+FlightService.inventory_index = None
+index.close()
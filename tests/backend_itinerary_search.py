@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+import sys, os
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend import database
+from backend.flight_service import FlightService
+
+# Use a throwaway database with a tiny hub network
+database.DB_NAME = os.path.join(tempfile.mkdtemp(), "itinerary_test.db")
+database.initialize_database()
+
+FlightService.add_flight("AK201", "Cairo", "Jeddah", "2025-11-10", "06:00", 150.0, 40, duration_minutes=130)
+FlightService.add_flight("AK202", "Jeddah", "Karachi", "2025-11-10", "09:30", 210.0, 40, duration_minutes=240)
+FlightService.add_flight("AK203", "Cairo", "Dubai", "2025-11-10", "07:00", 180.0, 40, duration_minutes=200)
+FlightService.add_flight("AK204", "Dubai", "Karachi", "2025-11-10", "12:00", 120.0, 40, duration_minutes=130)
+FlightService.add_flight("AK205", "Cairo", "Karachi", "2025-11-10", "23:00", 520.0, 40, duration_minutes=330)
+
+# 1️⃣ Cheapest first: one-stop options beat the direct flight
+for itinerary in FlightService.search_connections("Cairo", "Karachi", "2025-11-10", max_stops=1):
+    print("💲", itinerary["total_price"], [leg["flight_number"] for leg in itinerary["legs"]],
+          itinerary["departure"], "→", itinerary["arrival"], "layovers:", itinerary["layovers"])
+
+# 2️⃣ Earliest arrival first
+best = FlightService.search_connections("Cairo", "Karachi", "2025-11-10", sort_by="arrival", limit=1)
+print("⏱️ Earliest arrival:", best[0]["arrival"], [leg["flight_number"] for leg in best[0]["legs"]])
+
+# 3️⃣ An explicit min_layover=0 is honoured (a 5-minute connection, on a fresh day)
+FlightService.add_flight("AK206", "Cairo", "Jeddah", "2025-11-12", "06:00", 150.0, 40, duration_minutes=130)
+FlightService.add_flight("AK207", "Jeddah", "Karachi", "2025-11-12", "08:15", 90.0, 40, duration_minutes=240)
+tight = lambda **kw: [[leg["flight_number"] for leg in i["legs"]]
+                      for i in FlightService.search_connections("Cairo", "Karachi", "2025-11-12", **kw)]
+print("🏃 5-min connection | default min_layover:", tight(), "| min_layover=0:", tight(min_layover=0))
+
+# 4️⃣ A cheap leg that reaches the hub too late doesn't hide a dearer one that connects
+FlightService.add_flight("E1", "Aden", "Hub", "2030-11-14", "20:00", 50.0, 40)
+FlightService.add_flight("E2", "Aden", "Hub", "2030-11-14", "06:00", 80.0, 40)
+FlightService.add_flight("X1", "Hub", "Zagora", "2030-11-14", "09:00", 100.0, 40)
+for limit in (1, 2):
+    found = [[leg["flight_number"] for leg in i["legs"]]
+             for i in FlightService.search_connections("Aden", "Zagora", "2030-11-14", limit=limit)]
+    assert found == [["E2", "X1"]], (limit, found)
+    print(f"🧭 limit={limit}:", found)
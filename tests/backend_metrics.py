@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+import sys, os
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend import database, metrics, group_commit
+from backend.user_service import UserService
+from backend.flight_service import FlightService
+from backend.booking_service import BookingService
+
+# Use a throwaway database
+database.DB_NAME = os.path.join(tempfile.mkdtemp(), "metrics_test.db")
+database.initialize_database()
+
+# 1️⃣ Nothing is recorded while disabled
+FlightService.search_flights("Cairo", "Paris")
+print("⚪ Enabled:", metrics.is_enabled(), "| services seen:", len(metrics.snapshot()["services"]))
+
+# 2️⃣ Enabled: service methods and SQL statements get histograms
+metrics.enable(slow_query_ms=0)   # log every statement as "slow" to see plans
+FlightService.add_flight("AK101", "Cairo", "Paris", "2030-11-01", "09:30", 320.0, 50)
+UserService.register_user("sara", "pw", "sara@example.com")
+user = UserService.login_user("sara", "pw")
+for _ in range(20):
+    flights = FlightService.search_flights("Cairo", "Paris", "2030-11-01")
+booking = BookingService.create_booking(user["user_id"], flights[0]["flight_id"], 2)
+BookingService.get_user_bookings(user["user_id"])
+
+snap = metrics.snapshot()
+search = snap["services"]["FlightService.search_flights"]
+print("🧩 search_flights:", search["count"], "calls,", search["rows"], "rows, p50", search["p50_ms"], "ms")
+print("🧩 create_booking calls:", snap["services"]["BookingService.create_booking"]["count"])
+print("🗄️ Statement shapes:", len(snap["sql"]))
+print("🗄️ Example shape:", next(s for s in snap["sql"] if s.startswith("UPDATE flights")))
+slow = next(e for e in snap["slow_queries"] if e["shape"].startswith("SELECT"))
+print("🐢 Slow query plan:", slow["plan"])
+
+# Split mode: statements on the group-commit writer's connection are traced too
+metrics.reset()
+group_commit.enable()
+BookingService.create_booking(user["user_id"], flights[0]["flight_id"], 1)
+group_commit.disable()
+writes = [shape for shape in metrics.snapshot()["sql"] if shape.startswith(("INSERT INTO bookings", "UPDATE flights"))]
+assert len(writes) == 2, writes
+print("✍️ Writer statements traced:", writes)
+
+# 3️⃣ Disabling restores the original methods
+metrics.disable()
+metrics.reset()
+FlightService.search_flights("Cairo", "Paris")
+print("⚪ After disable:", metrics.snapshot()["services"], metrics.snapshot()["sql"])
+metrics.report()
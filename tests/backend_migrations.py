@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+import sys, os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.database import initialize_database, pooled_connection
+from backend.migrations import current_version, latest_version, migration_history, check_query_plans
+
+# Upgrades the existing database file in place (no-op if already current)
+initialize_database()
+
+with pooled_connection() as conn:
+    # 1️⃣ Schema is at the latest version
+    print("📦 Schema version:", current_version(conn), "/ latest:", latest_version())
+
+    # 2️⃣ Each migration recorded how long it took
+    for entry in migration_history(conn):
+        print("🛠️ Applied:", entry)
+
+    # 3️⃣ Hot queries use their indexes
+    for name, ok, plan in check_query_plans(conn):
+        print("✅" if ok else "❌", name, plan)
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+import sys, os
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend import database, pricing
+from backend.user_service import UserService
+from backend.flight_service import FlightService
+from backend.booking_service import BookingService
+
+# Use a throwaway database
+database.DB_NAME = os.path.join(tempfile.mkdtemp(), "pricing_test.db")
+database.initialize_database()
+
+TODAY = "2030-03-01"
+FlightService.add_flight("AK100", "Cairo", "Dubai", "2030-03-02", "08:00", 200.0, 10)   # tomorrow
+FlightService.add_flight("AK101", "Cairo", "Dubai", "2030-03-20", "08:00", 200.0, 10)   # 19 days out
+FlightService.add_flight("AK102", "Cairo", "Dubai", "2030-06-01", "08:00", 200.0, 10)   # 92 days out
+FlightService.add_flight("AK103", "Cairo", "Dubai", "2030-02-01", "08:00", 200.0, 10)   # departed
+UserService.register_user("omar", "pw")
+omar = UserService.login_user("omar", "pw")
+flights = {f["flight_number"]: f["flight_id"] for f in FlightService.search_flights("Cairo", "Dubai")}
+BookingService.create_booking(omar["user_id"], flights["AK101"], 8)                     # 80% full
+
+
+def prices():
+    with database.pooled_connection() as conn:
+        return {r[0]: (r[1], r[2]) for r in conn.execute("SELECT flight_number, price, base_price FROM flights ORDER BY flight_number")}
+
+
+# 1️⃣ Dry run reports without writing
+report = pricing.reprice(today=TODAY, dry_run=True)
+pricing.print_report(report, dry_run=True)
+print("🧪 Prices untouched:", all(p == 200.0 for p, _ in prices().values()))
+
+# 2️⃣ Reprice: 1 day out x1.3 at 0% full -> 234; 80% full 19 days out x1.15 x1.05 -> 241;
+#    92 days out -> 171; departed flight not considered
+report = pricing.reprice(today=TODAY)
+pricing.print_report(report)
+print("💹 Prices (price, base):", prices())
+
+# 3️⃣ Repricing again is a no-op (always from the base fare, never compounding)
+print("🔁 Second run repriced:", pricing.reprice(today=TODAY)["repriced"])
+
+# 4️⃣ Custom rules: the ceiling and floor bound the result
+steep = {"days_out": [(0, 5.0)], "load_factor": [(0.0, 1.0)], "ceiling": 1.5}
+print("📈 Capped at 1.5x:", pricing.reprice(steep, today=TODAY)["repriced"], prices()["AK100"])
+cheap = {"days_out": [(0, 0.1)], "load_factor": [(0.0, 1.0)]}
+print("📉 Floored at 0.6x:", pricing.reprice(cheap, today=TODAY)["repriced"], prices()["AK100"])
+
+# 5️⃣ Bookings see the new fare; a schedule re-import resets the base fare
+booking = BookingService.create_booking(omar["user_id"], flights["AK100"], 1)
+print("🎫 Booked at:", booking["total_price"])
+FlightService.bulk_import_flights([{"flight_number": "AK100", "origin": "Cairo", "destination": "Dubai",
+                                    "date": "2030-03-02", "time": "08:00", "price": 300.0, "available_seats": 9}],
+                                  upsert=True)
+print("📥 After import (price, base):", prices()["AK100"])
+print("🧪 Nothing upcoming:", pricing.reprice(today="2031-01-01"))
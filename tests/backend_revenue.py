@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+import sys, os
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend import database, group_commit, revenue
+from backend.user_service import UserService
+from backend.flight_service import FlightService
+from backend.booking_service import BookingService
+
+# Use a throwaway database
+database.DB_NAME = os.path.join(tempfile.mkdtemp(), "revenue_test.db")
+database.initialize_database()
+
+FlightService.add_flight("AK500", "Cairo", "Jeddah", "2030-05-01", "07:00", 150.0, 10)
+FlightService.add_flight("AK501", "Cairo", "Jeddah", "2030-05-02", "07:00", 150.0, 10)
+FlightService.add_flight("AK600", "Amman", "Doha", "2030-05-01", "18:00", 90.0, 20)
+UserService.register_user("lina", "pw")
+lina = UserService.login_user("lina", "pw")
+flights = {f["flight_number"]: f["flight_id"] for f in FlightService.search_flights("Cairo", "Jeddah")}
+flights.update({f["flight_number"]: f["flight_id"] for f in FlightService.search_flights("Amman", "Doha")})
+
+# 1️⃣ Bookings and cancellations update the summaries in the same transaction
+b1 = BookingService.create_booking(lina["user_id"], flights["AK500"], 4)
+b2 = BookingService.create_booking(lina["user_id"], flights["AK501"], 2)
+b3 = BookingService.create_booking(lina["user_id"], flights["AK600"], 5)
+BookingService.cancel_booking(b2["booking_id"])
+print("🛣️ Routes:", [(r["origin"], r["destination"], r["revenue"], r["seats_sold"], round(r["load_factor"], 3))
+                     for r in revenue.route_report()])
+print("📅 Days:", [(r["date"], r["flights"], r["revenue"], round(r["load_factor"], 3)) for r in revenue.daily_report()])
+print("✈️ Top flight:", {k: revenue.flight_report(limit=1)[0][k] for k in ("flight_number", "revenue", "load_factor")})
+
+# 2️⃣ Batch and group-commit bookings, admin seat edits and schedule moves stay consistent
+BookingService.create_bookings_batch([(lina["user_id"], flights["AK600"], 3), (lina["user_id"], flights["AK501"], 1)])
+group_commit.enable()
+BookingService.create_booking(lina["user_id"], flights["AK500"], 1)
+BookingService.cancel_booking(b1["booking_id"])
+group_commit.disable()
+FlightService.update_available_seats(flights["AK600"], 40)
+FlightService.bulk_import_flights([{"flight_number": "AK501", "origin": "Cairo", "destination": "Riyadh",
+                                    "date": "2030-05-02", "time": "07:00", "price": 150.0, "available_seats": 9}],
+                                  upsert=True)
+print("💰 Totals:", {k: revenue.totals()[k] for k in ("flights", "bookings", "seats_sold", "revenue")})
+print("🛣️ Moved route:", [(r["origin"], r["destination"], r["bookings"]) for r in revenue.route_report()])
+result = revenue.check()
+print("🔎 Consistent:", result["ok"], result["mismatches"])
+
+# 3️⃣ A drifted summary is detected and rebuilt
+with database.pooled_connection() as conn:
+    conn.execute("UPDATE revenue_by_day SET revenue = revenue + 10 WHERE date = '2030-05-01'")
+    conn.execute("DELETE FROM revenue_by_flight WHERE flight_id = ?", (flights["AK600"],))
+    conn.commit()
+result = revenue.check()
+print("🔎 After tampering:", result["ok"], result["mismatches"], [e["key"] for e in result["examples"]])
+print("🔄 Rebuild:", revenue.rebuild()["rows"])
+print("🔎 After rebuild:", revenue.check()["ok"])
+revenue.main(["report", "--by", "day"])
@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+import sys, os
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend import database
+from backend.flight_service import FlightService
+from backend.schedule_import import import_schedule
+
+# Use a throwaway database so the real one is untouched
+tmp_dir = tempfile.mkdtemp()
+database.DB_NAME = os.path.join(tmp_dir, "import_test.db")
+database.initialize_database()
+
+# 1️⃣ Write a small CSV schedule (one invalid row)
+csv_path = os.path.join(tmp_dir, "schedule.csv")
+with open(csv_path, "w", encoding="utf-8") as f:
+    f.write("flight_number,origin,destination,date,time,price,available_seats\n")
+    for i in range(25):
+        f.write(f"AK{300 + i},Cairo,Dubai,2025-12-{i + 1:02d},08:15,275.0,180\n")
+    f.write("AK999,Cairo,Cairo,2025-12-01,xx:yy,abc,10\n")
+
+summary = import_schedule(csv_path, chunk_size=10, on_chunk=print)
+print("📥 First import:", {k: summary[k] for k in ("inserted", "updated", "skipped", "errors")})
+
+# 2️⃣ Re-import with upsert: nothing new, existing rows updated
+summary = import_schedule(csv_path, chunk_size=10, upsert=True)
+print("🔁 Upsert re-import:", {k: summary[k] for k in ("inserted", "updated", "skipped")})
+
+# 3️⃣ Flight count unchanged by the upsert
+print("✈️ Flights in DB:", len(FlightService.get_all_flights()))
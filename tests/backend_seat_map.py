@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+import sys, os
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend import database, group_commit
+from backend.seat_map import parse_layout, BUILTIN_LAYOUTS
+from backend.user_service import UserService
+from backend.flight_service import FlightService
+from backend.booking_service import BookingService
+
+# Use a throwaway database
+database.DB_NAME = os.path.join(tempfile.mkdtemp(), "seat_map_test.db")
+database.initialize_database()
+
+# 1️⃣ Layouts and in-memory allocation
+a320 = parse_layout(BUILTIN_LAYOUTS["A320"])
+a380 = parse_layout(BUILTIN_LAYOUTS["A380"])
+print("🛫 A320:", a320.capacity, "seats,", a320.blob_size, "bytes | A380:", a380.capacity, "seats,", a380.blob_size, "bytes")
+occupied = a320.mask([a320.index[s] for s in ("4A", "4B", "5E")])
+print("🪑 3 together:", [a320.labels[i] for i in a320.allocate(occupied, 3)])      # 4DEF (not across the aisle)
+print("🪑 2 together:", [a320.labels[i] for i in a320.allocate(occupied, 2)])      # 1A 1C (business pair)
+print("🪑 2 in Y:", [a320.labels[i] for i in a320.allocate(occupied, 2, "Y")])
+full_but_gaps = a320.all_seats & ~a320.mask([a320.index[s] for s in ("7A", "9F")])
+print("🪑 No pair left, split:", [a320.labels[i] for i in a320.allocate(full_but_gaps, 2)])
+print("🪑 Too many:", a320.allocate(full_but_gaps, 3))
+
+# 2️⃣ Bookings on a flight with a seat map
+FlightService.add_flight("AK380", "Dubai", "London", "2030-11-01", "02:30", 700.0, 999)
+UserService.register_user("sara", "pw", "sara@example.com")
+sara = UserService.login_user("sara", "pw")
+flight_id = FlightService.search_flights("Dubai", "London")[0]["flight_id"]
+early = BookingService.create_booking(sara["user_id"], flight_id, 2)
+print("🎫 Booked before the map:", early["seats"])
+print("🗺️ Set layout:", FlightService.set_seat_layout(flight_id, "A380"))
+print("🗺️ Unknown layout:", FlightService.set_seat_layout(flight_id, "Concorde"))
+seat_info = FlightService.get_seat_map(flight_id)
+print("🗺️ Map:", seat_info["layout"], seat_info["capacity"], "seats,", seat_info["free"], "free, taken", seat_info["occupied"])
+family = BookingService.create_booking(sara["user_id"], flight_id, 4, cabin="Y")
+print("👨‍👩‍👧‍👦 Family of 4 in Y:", family["seats"])
+print("🚫 Unknown cabin:", BookingService.create_booking(sara["user_id"], flight_id, 1, cabin="W"))
+first = [BookingService.create_booking(sara["user_id"], flight_id, 1, cabin="F") for _ in range(13)]
+print("🥂 First class:", [b and b["seats"] for b in first][-2:], "| cabins free:", FlightService.get_seat_map(flight_id)["cabins"])
+
+# 3️⃣ Cancel releases the seats; the group-commit writer assigns seats too
+print("🛑 Cancel family:", BookingService.cancel_booking(family["booking_id"]))
+print("🗺️ Free after cancel:", FlightService.get_seat_map(flight_id)["free"])
+group_commit.enable()
+again = BookingService.create_booking(sara["user_id"], flight_id, 4, cabin="Y")
+print("🔀 Via writer:", again["seats"])
+group_commit.disable()
+batch = BookingService.create_bookings_batch([(sara["user_id"], flight_id, 2), (sara["user_id"], flight_id, 3)])
+print("📦 Batch seats:", [r["booking"]["seats"] for r in batch])
+info = FlightService.get_seat_map(flight_id)
+with database.pooled_connection() as conn:
+    seats_left = conn.execute("SELECT available_seats FROM flights WHERE flight_id = ?", (flight_id,)).fetchone()[0]
+print("🔢 Map free == available_seats:", info["free"] == seats_left, f"({seats_left})")
+print("📘 Listing shows seats:", [b["seats"] for b in BookingService.get_user_bookings(sara["user_id"])][:3])
+
+# 4️⃣ A booking whose stored seats don't fit the map: cancel fails cleanly and changes nothing
+broken = BookingService.create_booking(sara["user_id"], flight_id, 1, cabin="Y")
+with database.pooled_connection() as conn:
+    conn.execute("UPDATE bookings SET seats = 'Z99' WHERE booking_id = ?", (broken["booking_id"],))
+    conn.commit()
+print("🧩 Cancel with unknown seat:", BookingService.cancel_booking(broken["booking_id"]),
+      "| booking kept:", BookingService.get_booking(broken["booking_id"]) is not None,
+      "| map still consistent:", FlightService.get_seat_map(flight_id)["free"] == FlightService.get_flight_by_id(flight_id)["available_seats"])
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+import sys, os
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend import database
+from backend.database import pooled_connection
+from backend.text_search import match_expression, user_match_expression
+from backend.user_service import UserService
+from backend.flight_service import FlightService
+from backend.booking_service import BookingService
+
+# Use a throwaway database
+database.DB_NAME = os.path.join(tempfile.mkdtemp(), "search_test.db")
+database.initialize_database()
+
+print("🔤 MATCH for 'cai par':", match_expression("cai par"))
+print("🔤 MATCH for user 7:", user_match_expression(7, 'AK1 "NEAR"'))
+
+FlightService.add_flight("AK101", "Cairo", "London", "2030-11-01", "09:30", 320.0, 50)
+FlightService.add_flight("AK102", "Cairo", "Paris", "2030-11-02", "14:00", 450.0, 50)
+FlightService.add_flight("SV310", "Jeddah", "Paris", "2030-11-03", "08:00", 280.0, 50)
+UserService.register_user("sara", "pw", "sara@example.com")
+UserService.register_user("omar", "pw", "omar@example.com")
+sara = UserService.login_user("sara", "pw")
+omar = UserService.login_user("omar", "pw")
+
+# 1️⃣ Flight search: prefixes, all words required, flight number ranks first
+print("✈️ 'par':", [f["flight_number"] for f in FlightService.search_flights_text("par")])
+print("✈️ 'cai par':", [f["flight_number"] for f in FlightService.search_flights_text("cai par")])
+print("✈️ 'ak10':", [f["flight_number"] for f in FlightService.search_flights_text("ak10")])
+
+# 2️⃣ Booking search only sees the user's own bookings
+for flight in FlightService.search_flights_text("cai"):
+    BookingService.create_booking(sara["user_id"], flight["flight_id"], 1)
+BookingService.create_booking(omar["user_id"], FlightService.search_flights_text("sv310")[0]["flight_id"], 1)
+print("📘 Sara 'paris':", [b["to_city"] for b in BookingService.search_user_bookings(sara["user_id"], "paris")])
+print("📘 Omar 'paris':", [b["flight_number"] for b in BookingService.search_user_bookings(omar["user_id"], "paris")])
+page = BookingService.get_user_bookings_page(sara["user_id"], search="lon", with_total=True)
+print("📄 Sara page for 'lon':", [b["to_city"] for b in page["items"]], "total", page["total"])
+
+# 3️⃣ Triggers keep the index in sync with flight edits and cancellations
+with pooled_connection() as conn:
+    conn.execute("UPDATE flights SET destination = 'Lyon' WHERE flight_number = 'AK102'")
+    conn.commit()
+print("🔁 Sara 'lyon' after reroute:", [b["to_city"] for b in BookingService.search_user_bookings(sara["user_id"], "lyon")])
+for booking in BookingService.search_user_bookings(sara["user_id"], "lyon"):
+    BookingService.cancel_booking(booking["booking_id"])
+print("🗑️ Sara 'lyon' after cancel:", BookingService.search_user_bookings(sara["user_id"], "lyon"))
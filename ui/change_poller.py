@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+# ui/change_poller.py
+"""
+Live refresh for open pages.
+
+ChangePoller polls a backend.change_feed.ChangeFeed on a timer, off the GUI
+thread, and emits `changed` only when something did change. Pages connect
+an apply_changes(changes) slot and patch just the rows named there:
+
+    self.poller = ChangePoller(user_id=user["user_id"], parent=self)
+    self.poller.changed.connect(page.apply_changes)
+    self.poller.start()
+
+An idle poll is one PRAGMA data_version; a busy one reads only the new
+change_log entries and the flights rows they name. Every PRUNE_INTERVAL_MS
+(and once at start) entries older than change_feed.RETENTION_HOURS are
+pruned, so the log stays bounded however long the app runs.
+"""
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+from backend.change_feed import ChangeFeed, prune
+from ui.workers import BackendRunner
+
+POLL_INTERVAL_MS = 1000
+PRUNE_INTERVAL_MS = 60 * 60 * 1000
+
+
+class ChangePoller(QObject):
+    changed = pyqtSignal(object)  # a ChangeFeed.poll() result with something in it
+
+    def __init__(self, user_id=None, interval_ms=POLL_INTERVAL_MS, parent=None):
+        super().__init__(parent)
+        self.feed = ChangeFeed(user_id=user_id)
+        self.runner = BackendRunner(self)
+        self.timer = QTimer(self)
+        self.timer.setInterval(interval_ms)
+        self.timer.timeout.connect(self.poll)
+        self.prune_timer = QTimer(self)
+        self.prune_timer.setInterval(PRUNE_INTERVAL_MS)
+        self.prune_timer.timeout.connect(self.prune)
+
+    def start(self):
+        """Position the feed at the end of the log, then poll every interval."""
+        self.runner.submit("poll", self.feed.start, on_result=lambda _: self.timer.start())
+        self.prune()
+        self.prune_timer.start()
+
+    def stop(self):
+        self.timer.stop()
+        self.prune_timer.stop()
+        self.runner.cancel_all()
+        self.feed.close()
+
+    def prune(self):
+        if self.runner.is_busy("prune"):
+            return
+        self.runner.submit("prune", prune, on_error=lambda e: print(f"⚠️ Change log prune failed: {e}"))
+
+    def poll(self):
+        # a slow poll is never superseded: the feed must not run twice at once
+        if self.runner.is_busy("poll"):
+            return
+        self.runner.submit("poll", self.feed.poll, on_result=self._deliver,
+                           on_error=lambda e: print(f"⚠️ Change poll failed: {e}"))
+
+    def _deliver(self, changes):
+        if changes["reset"] or changes["flights"] or changes["bookings"]:
+            self.changed.emit(changes)
@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 import sys
+import importlib
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QLabel, QPushButton,
     QHBoxLayout, QMessageBox, QStackedWidget
@@ -7,9 +8,17 @@ from PyQt5.QtWidgets import (
 from PyQt5.QtGui import QFont
 from PyQt5.QtCore import Qt
 
-# Import pages
-from ui.pages.flights_page import FlightsPage
-from ui.pages.bookings_page import BookingsPage
+from ui.change_poller import ChangePoller
+
+# Pages are built on first visit: name -> (module, class). A page module
+# pulls in its backend services, so none of it is imported at login. Pages
+# with an apply_changes(changes) slot get live updates from the ChangePoller.
+PAGES = {
+    "flights": ("ui.pages.flights_page", "FlightsPage"),
+    "bookings": ("ui.pages.bookings_page", "BookingsPage"),
+    "metrics": ("ui.pages.metrics_page", "MetricsPage"),
+}
+ADMIN_PAGES = {"metrics"}
 
 
 class DashboardWindow(QWidget):
@@ -37,12 +46,14 @@ class DashboardWindow(QWidget):
         self.home_btn = QPushButton("🏠 Home")
         self.flights_btn = QPushButton("🛫 Flights")
         self.bookings_btn = QPushButton("📘 My Bookings")
+        self.metrics_btn = QPushButton("📊 Metrics")
         self.logout_btn = QPushButton("🚪 Logout")
 
         # Sidebar events
         self.home_btn.clicked.connect(lambda: self.switch_page("home"))
         self.flights_btn.clicked.connect(lambda: self.switch_page("flights"))
         self.bookings_btn.clicked.connect(lambda: self.switch_page("bookings"))
+        self.metrics_btn.clicked.connect(lambda: self.switch_page("metrics"))
         self.logout_btn.clicked.connect(self.logout)
 
         # Add to sidebar
@@ -51,44 +62,55 @@ class DashboardWindow(QWidget):
         sidebar.addWidget(self.home_btn)
         sidebar.addWidget(self.flights_btn)
         sidebar.addWidget(self.bookings_btn)
+        if self.user.get("is_admin"):
+            sidebar.addWidget(self.metrics_btn)  # admin only
         sidebar.addStretch()
         sidebar.addWidget(self.logout_btn)
 
         # === Main content area (StackedWidget) ===
         self.stack = QStackedWidget()
 
-        # Create pages
+        # Only the home page exists up front; the others are built by page()
         self.home_page = QLabel(f"👋 Welcome, {self.user['username']}!\n\nUse the sidebar to navigate.")
         self.home_page.setAlignment(Qt.AlignCenter) # type: ignore
         self.home_page.setFont(QFont("Segoe UI", 12))
-
-        self.flights_page = FlightsPage(self.user)
-
-        self.bookings_page = BookingsPage(self.user)
-
-        # Add pages to stack
-        self.stack.addWidget(self.home_page)       # index 0
-        self.stack.addWidget(self.flights_page)    # index 1
-        self.stack.addWidget(self.bookings_page)   # index 2
+        self.stack.addWidget(self.home_page)
+        self.pages = {"home": self.home_page}
 
         # Add both sidebar + stack to main layout
         main_layout.addLayout(sidebar, 1)
         main_layout.addWidget(self.stack, 4)
 
         # Start on home
-        self.stack.setCurrentIndex(0)
+        self.stack.setCurrentWidget(self.home_page)
+
+        # Live updates: one poller for every open page (bookings: this user's only)
+        self.poller = ChangePoller(user_id=self.user["user_id"], parent=self)
+        self.poller.start()
+
+    def page(self, name: str) -> QWidget:
+        """The page widget, imported and built on first use."""
+        widget = self.pages.get(name)
+        if widget is None:
+            module, cls = PAGES[name]
+            widget = getattr(importlib.import_module(module), cls)(self.user)
+            self.stack.addWidget(widget)
+            self.pages[name] = widget
+            if hasattr(widget, "apply_changes"):
+                self.poller.changed.connect(widget.apply_changes)
+        return widget
 
     def switch_page(self, page: str):
         """Switch between stacked pages"""
-        if page == "home":
-            self.stack.setCurrentIndex(0)
-        elif page == "flights":
-            self.stack.setCurrentIndex(1)
-        elif page == "bookings":
-            self.stack.setCurrentIndex(2)
+        if page != "home" and page not in PAGES:
+            return
+        if page in ADMIN_PAGES and not self.user.get("is_admin"):
+            return
+        self.stack.setCurrentWidget(self.page(page))
 
     def logout(self):
         QMessageBox.information(self, "Logout", "Logging out...")
+        self.poller.stop()
         self.close()
 
     def load_styles(self):
@@ -0,0 +1,248 @@
+# -*- coding: utf-8 -*-
+# ui/flights_table.py
+"""
+Virtualized flights table.
+
+FlightsTableModel only holds the pages the view has scrolled through: Qt
+asks canFetchMore()/fetchMore() as the user nears the bottom, and the next
+keyset page is fetched in the background through a BackendRunner. Sorting
+is pushed down to FlightService.get_flights_page, so a header click is one
+indexed query rather than a re-sort of everything in memory. Changes made
+elsewhere arrive through apply_changes() (ui.change_poller) and patch only
+the rows they touch.
+
+BookButtonDelegate paints the "Book Now" button, so there is no widget
+per row.
+"""
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QEvent, pyqtSignal
+from PyQt5.QtWidgets import QStyledItemDelegate, QStyleOptionButton, QStyle, QApplication
+
+from backend.flight_service import FlightService, FLIGHT_SORT_KEYS
+from backend.pagination import decode_cursor
+
+# (flight key, header) — None marks the action column
+FLIGHT_TABLE_COLUMNS = [
+    ("flight_id", "ID"),
+    ("origin", "From"),
+    ("destination", "To"),
+    ("date", "Date"),
+    ("available_seats", "Available Seats"),
+    (None, "Action"),
+]
+ACTION_COLUMN = 5
+PAGE_SIZE = 200
+
+
+class FlightsTableModel(QAbstractTableModel):
+    total_changed = pyqtSignal(int)
+    load_failed = pyqtSignal(object)
+
+    def __init__(self, runner, parent=None, page_size=PAGE_SIZE):
+        super().__init__(parent)
+        self.runner = runner
+        self.page_size = page_size
+        self.sort_by = "date"
+        self.descending = False
+        self.total = 0
+        self._flights = []
+        self._row_by_id = {}
+        self._next_cursor = None
+        self._exhausted = True
+        self._fetching = False
+        self._load_error = None  # set by a failed fetch; only reload() clears it
+
+    # ------------------------------------------------------------------
+    # Qt model interface
+    # ------------------------------------------------------------------
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._flights)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(FLIGHT_TABLE_COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return FLIGHT_TABLE_COLUMNS[section][1]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        flight = self._flights[index.row()]
+        key = FLIGHT_TABLE_COLUMNS[index.column()][0]
+        if role == Qt.DisplayRole and key is not None:
+            return str(flight[key])
+        if role == Qt.UserRole:
+            return flight
+        if role == Qt.TextAlignmentRole and key in ("flight_id", "available_seats"):
+            return Qt.AlignCenter
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        # after an error, wait for an explicit refresh or sort instead of retrying on every scroll
+        return not parent.isValid() and not self._exhausted and self._load_error is None
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self._exhausted or self._fetching or self._load_error is not None:
+            return
+        self._request(self._next_cursor, with_total=False)
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        key = FLIGHT_TABLE_COLUMNS[column][0]
+        if key not in FLIGHT_SORT_KEYS:
+            return
+        descending = order == Qt.DescendingOrder
+        if (key, descending) == (self.sort_by, self.descending):
+            return
+        self.sort_by, self.descending = key, descending
+        self.reload()
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+    def reload(self):
+        """Drop loaded rows and fetch the first page (supersedes any fetch in flight)."""
+        self.clear()
+        self._load_error = None
+        self._request(None, with_total=True)
+
+    def clear(self):
+        self.beginResetModel()
+        self._flights = []
+        self._row_by_id = {}
+        self._next_cursor = None
+        self._exhausted = True
+        self.endResetModel()
+
+    def _request(self, cursor, with_total):
+        self._fetching = True
+        self.runner.submit(
+            "page", FlightService.get_flights_page,
+            sort_by=self.sort_by, descending=self.descending, cursor=cursor,
+            page_size=self.page_size, with_total=with_total,
+            on_result=self.add_page, on_error=self._failed,
+        )
+
+    def _failed(self, error):
+        self._fetching = False
+        self._load_error = error
+        self.load_failed.emit(error)
+
+    def add_page(self, page):
+        """Append a get_flights_page() result."""
+        self._fetching = False
+        # a live patch may already have placed some of these rows
+        items = [flight for flight in page["items"] if flight["flight_id"] not in self._row_by_id]
+        if items:
+            first = len(self._flights)
+            self.beginInsertRows(QModelIndex(), first, first + len(items) - 1)
+            for offset, flight in enumerate(items):
+                self._row_by_id[flight["flight_id"]] = first + offset
+            self._flights.extend(items)
+            self.endInsertRows()
+        self._next_cursor = page["next_cursor"]
+        self._exhausted = self._next_cursor is None
+        if page["total"] is not None:
+            self.total = page["total"]
+            self.total_changed.emit(self.total)
+
+    def flight_at(self, row):
+        return self._flights[row]
+
+    def update_flight(self, flight):
+        """Patch one loaded row in place (e.g. seats after a booking)."""
+        if not flight:
+            return
+        row = self._row_by_id.get(flight["flight_id"])
+        if row is None:
+            return
+        self._flights[row] = {**self._flights[row], **flight}
+        self.dataChanged.emit(self.index(row, 0), self.index(row, len(FLIGHT_TABLE_COLUMNS) - 1))
+
+    # ------------------------------------------------------------------
+    # Live changes
+    # ------------------------------------------------------------------
+    def apply_changes(self, ops, rows):
+        """
+        Patch the loaded rows from a ChangeFeed.poll() result (`flights` ops
+        and `flight_rows`): drop deleted flights, update changed ones in place
+        (moving them if their sort key changed) and slot new ones in when they
+        sort inside the loaded range. Anything past it arrives with fetchMore.
+        """
+        if self._fetching and not self._flights:
+            return  # the first page (and its total) is on its way
+        total = self.total
+        for flight_id, op in ops.items():
+            row = self._row_by_id.get(flight_id)
+            fresh = rows.get(flight_id)
+            if op == "D" or fresh is None:
+                if row is not None:
+                    self._remove_row(row)
+                total -= op == "D"
+                continue
+            total += op == "I"
+            if row is not None and self._sort_key(self._flights[row]) == self._sort_key(fresh):
+                self.update_flight(fresh)
+                continue
+            if row is not None:
+                self._remove_row(row)
+            self._place(fresh)
+        if total != self.total:
+            self.total = max(total, 0)
+            self.total_changed.emit(self.total)
+
+    def _sort_key(self, flight):
+        return tuple(flight[col] for col in FLIGHT_SORT_KEYS[self.sort_by])
+
+    def _precedes(self, a, b):
+        return a > b if self.descending else a < b
+
+    def _place(self, flight):
+        key = self._sort_key(flight)
+        if not self._exhausted and self._next_cursor and not self._precedes(key, decode_cursor(self._next_cursor)[1]):
+            return  # past the loaded range
+        lo, hi = 0, len(self._flights)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._precedes(self._sort_key(self._flights[mid]), key):
+                lo = mid + 1
+            else:
+                hi = mid
+        self.beginInsertRows(QModelIndex(), lo, lo)
+        self._flights.insert(lo, flight)
+        self._reindex(lo)
+        self.endInsertRows()
+
+    def _remove_row(self, row):
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._row_by_id[self._flights.pop(row)["flight_id"]]
+        self._reindex(row)
+        self.endRemoveRows()
+
+    def _reindex(self, first):
+        for row in range(first, len(self._flights)):
+            self._row_by_id[self._flights[row]["flight_id"]] = row
+
+
+class BookButtonDelegate(QStyledItemDelegate):
+    """Draws a push button in the action column and reports clicks by row."""
+
+    clicked = pyqtSignal(int)
+
+    def paint(self, painter, option, index):
+        flight = index.data(Qt.UserRole)
+        button = QStyleOptionButton()
+        button.rect = option.rect.adjusted(4, 2, -4, -2)
+        button.text = "Book Now" if flight and flight["available_seats"] > 0 else "Sold Out"
+        button.state = QStyle.State_Enabled if flight and flight["available_seats"] > 0 else QStyle.State_None
+        style = option.widget.style() if option.widget else QApplication.style()
+        style.drawControl(QStyle.CE_PushButton, button, painter, option.widget)
+
+    def editorEvent(self, event, model, option, index):
+        if (event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton
+                and option.rect.contains(event.pos())):
+            flight = index.data(Qt.UserRole)
+            if flight and flight["available_seats"] > 0:
+                self.clicked.emit(index.row())
+            return True
+        return super().editorEvent(event, model, option, index)
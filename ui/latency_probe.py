@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+# ui/latency_probe.py
+"""
+Event-loop stall probe.
+
+A fast QTimer records how late each tick fires. A responsive GUI thread
+fires within a millisecond or two; anything that blocks it (a query, a lock
+wait, a big table rebuild) shows up as one late tick of that length.
+
+    probe = EventLoopProbe()
+    probe.start()
+    ...                       # use the UI
+    print(probe.summary())    # {"ticks", "max_ms", "p95_ms", "p99_ms", "stalls", "stalled_ms"}
+"""
+import time
+
+from PyQt5.QtCore import QObject, QTimer
+
+STALL_THRESHOLD_MS = 50.0   # a tick this late is a visible freeze
+
+
+class EventLoopProbe(QObject):
+    def __init__(self, interval_ms=5, parent=None):
+        super().__init__(parent)
+        self.interval_ms = interval_ms
+        self._timer = QTimer(self)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self._tick)
+        self._last = None
+        self.lateness_ms = []
+
+    def start(self):
+        self.reset()
+        self._last = time.perf_counter()
+        self._timer.start()
+
+    def stop(self):
+        self._timer.stop()
+
+    def reset(self):
+        self.lateness_ms = []
+        self._last = time.perf_counter()
+
+    def _tick(self):
+        now = time.perf_counter()
+        self.lateness_ms.append(max(0.0, (now - self._last) * 1000 - self.interval_ms))
+        self._last = now
+
+    def summary(self, threshold_ms=STALL_THRESHOLD_MS):
+        samples = sorted(self.lateness_ms)
+        if not samples:
+            return {"ticks": 0, "max_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0, "stalls": 0, "stalled_ms": 0.0}
+        stalls = [s for s in samples if s >= threshold_ms]
+        return {
+            "ticks": len(samples),
+            "max_ms": round(samples[-1], 1),
+            "p95_ms": round(samples[int(0.95 * (len(samples) - 1))], 1),
+            "p99_ms": round(samples[int(0.99 * (len(samples) - 1))], 1),
+            "stalls": len(stalls),
+            "stalled_ms": round(sum(stalls), 1),
+        }
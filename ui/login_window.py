@@ -10,7 +10,7 @@ from PyQt5.QtWidgets import (
 from PyQt5.QtGui import QFont
 from PyQt5.QtCore import Qt
 from backend.user_service import UserService
-from ui.dashboard_window import DashboardWindow
+from ui.workers import BackendRunner
 
 from PyQt5.QtGui import QIcon
 from PyQt5.QtWidgets import QApplication
@@ -22,6 +22,7 @@ class LoginWindow(QWidget):
         self.setWindowTitle("Al-Kawthar Flight Booking – Login")
         self.setGeometry(100, 100, 400, 300)
         self.setStyleSheet(self.load_styles())
+        self.runner = BackendRunner(self)
         self.init_ui()
 
     def init_ui(self):
@@ -65,9 +66,22 @@ class LoginWindow(QWidget):
             QMessageBox.warning(self, "Error", "Please fill all fields.")
             return
 
-        user = UserService.login_user(email, password)
+        # password hashing + lookup run off the GUI thread
+        self.login_btn.setEnabled(False)
+        self.login_btn.setText("⏳ Logging in...")
+        self.runner.submit(
+            "login", UserService.login_user, email, password,
+            on_result=self.login_done,
+            on_error=lambda e: self.login_done(None),
+        )
+
+    def login_done(self, user):
+        self.login_btn.setEnabled(True)
+        self.login_btn.setText("Login")
         if user:
             QMessageBox.information(self, "Success", f"Welcome back, {user['username']}!")
+            # Imported here, not at startup: the login window shows sooner
+            from ui.dashboard_window import DashboardWindow
             self.dashboard = DashboardWindow(user)
             self.dashboard.show()
             self.close()
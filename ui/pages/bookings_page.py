@@ -3,9 +3,12 @@ from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QLabel, QTableWidget, QTableWidgetItem,
     QPushButton, QHBoxLayout, QLineEdit, QMessageBox, QComboBox
 )
-from PyQt5.QtCore import Qt, QDate
+from PyQt5.QtCore import Qt, QDate, QTimer
 from backend.booking_service import BookingService
 from backend.flight_service import FlightService
+from ui.workers import BackendRunner
+
+SEARCH_DEBOUNCE_MS = 250
 
 
 class BookingsPage(QWidget):
@@ -13,13 +16,18 @@ class BookingsPage(QWidget):
         super().__init__()
         self.user = user
 
-        # Pagination settings
-        self.all_bookings = []  # 🔹 store full dataset
-        self.bookings = []      # 🔹 filtered/paged version
+        # Pagination settings (keyset cursors — only the visible page is fetched)
+        self.bookings = []      # 🔹 rows of the visible page
         self.current_page = 1
-        self.filtered_bookings = []
+        self.total = 0
+        self.page_cursor = None  # cursor that produced the visible page
+        self.next_cursor = None
+        self.prev_cursor = None
         self.page_size = 5
 
+        # Backend calls run on a worker pool; results come back as signals
+        self.runner = BackendRunner(self)
+
         self.init_ui()
 
     def init_ui(self):
@@ -31,13 +39,25 @@ class BookingsPage(QWidget):
         title.setAlignment(Qt.AlignCenter) # type: ignore
         title.setStyleSheet("font-size: 22px; font-weight: bold; margin-bottom: 15px;")
 
+        # --- Loading indicator ---
+        self.status_label = QLabel("")
+        self.status_label.setAlignment(Qt.AlignCenter) # type: ignore
+        self.runner.busy_changed.connect(self.set_loading)
+
         # --- Filter bar ---
         filter_layout = QHBoxLayout()
 
         self.search_input = QLineEdit()
-        self.search_input.setPlaceholderText("Search by destination...")
+        self.search_input.setPlaceholderText("Search by flight, origin or destination...")
         self.search_input.setStyleSheet("padding: 6px; border-radius: 5px; border: 1px solid #aaa;")
-        self.search_input.textChanged.connect(self.apply_filters)
+
+        # Debounce: query once typing pauses, not on every keystroke
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self.apply_filters)
+        self.search_input.textChanged.connect(self.search_timer.start)
+        self.search_input.returnPressed.connect(self.apply_filters)
 
         self.filter_combo = QComboBox()
         self.filter_combo.addItems(["All Bookings", "Upcoming Only"])
@@ -51,7 +71,7 @@ class BookingsPage(QWidget):
         self.table = QTableWidget()
         self.table.setColumnCount(6)
         self.table.setHorizontalHeaderLabels([
-            "Booking ID", "Flight ID", "From", "To", "Date", "Actions"
+            "Booking ID", "Flight", "From", "To", "Date", "Actions"
         ])
         self.table.setColumnWidth(0, 80)
         self.table.setColumnWidth(1, 80)
@@ -81,58 +101,82 @@ class BookingsPage(QWidget):
 
         # --- Assemble layout ---
         layout.addWidget(title)
+        layout.addWidget(self.status_label)
         layout.addLayout(filter_layout)
         layout.addWidget(self.table)
         layout.addLayout(pagination_layout)
 
         self.setLayout(layout)
-        self.load_bookings()
+        # Load data once the page has painted
+        QTimer.singleShot(0, self.load_bookings)
 
     # ------------------------------
     # Data loading and filtering
     # ------------------------------
+    def set_loading(self, busy):
+        self.status_label.setText("⏳ Loading..." if busy else "")
+
     def load_bookings(self):
-        # fetch all bookings from DB
-        data = BookingService.get_user_bookings(self.user["user_id"])
-        # normalize
-        self.all_bookings = [self._normalize_booking(b) for b in data]
-        self.apply_filters()  # show all initially
+        # restart from the first page with the current filters
+        self.fetch_page(None, 1)
+
+    def fetch_page(self, cursor, page_number, with_total=None):
+        """Fetch only the visible page from the DB, off the GUI thread."""
+        # a newer request (typing, paging) supersedes one still in flight
+        self.runner.submit(
+            "page", BookingService.get_user_bookings_page,
+            self.user["user_id"],
+            cursor=cursor,
+            page_size=self.page_size,
+            search=self.search_input.text().strip() or None,
+            upcoming_only=self.filter_combo.currentText() == "Upcoming Only",
+            with_total=cursor is None if with_total is None else with_total,
+            on_result=lambda page: self.show_page(cursor, page_number, page),
+            on_error=lambda e: QMessageBox.warning(self, "Error", f"Unable to load bookings: {e}"),
+        )
+
+    def show_page(self, cursor, page_number, page):
+        if page["total"] is not None:
+            self.total = page["total"]
+        self.current_page = page_number
+        self.page_cursor = cursor
+        self.next_cursor = page["next_cursor"]
+        self.prev_cursor = page["prev_cursor"]
+        self.bookings = [self._normalize_booking(b) for b in page["items"]]
+        self.refresh_table()
 
     def _normalize_booking(self, b):
         return {
-            "id": b.get("id"),
+            "booking_id": b.get("booking_id"),
+            "flight_id": b.get("flight_id"),
             "flight_number": b.get("flight_number", "N/A"),
-            "departure": b.get("departure", "N/A"),
-            "arrival": b.get("arrival", "N/A"),
-            "date": b.get("date", "N/A"),
-            "status": b.get("status", "N/A"),
+            "departure": b.get("from_city", "N/A"),
+            "arrival": b.get("to_city", "N/A"),
+            "date": b.get("flight_date", "N/A"),
         }
 
-    def apply_filters(self):
-        search_text = self.search_input.text().strip().lower()
-        if search_text:
-            self.bookings = [
-                b for b in self.all_bookings
-                if search_text in b["flight_number"].lower()
-                or search_text in b["departure"].lower()
-                or search_text in b["arrival"].lower()
-            ]
-        else:
-            self.bookings = self.all_bookings.copy()
+    def apply_changes(self, changes):
+        """
+        React to ChangePoller.changed: refetch just the visible page when one
+        of this user's bookings, or a flight shown on it, changed.
+        """
+        shown = {b["flight_id"] for b in self.bookings}
+        if changes["reset"]:
+            self.load_bookings()
+        elif changes["bookings"] or shown.intersection(changes["flights"]):
+            self.fetch_page(self.page_cursor, self.current_page, with_total=bool(changes["bookings"]))
 
-        self.current_page = 1
-        self.refresh_table()
+    def apply_filters(self):
+        self.search_timer.stop()
+        self.load_bookings()
 
     # ------------------------------
     # Table rendering
     # ------------------------------
     def refresh_table(self):
-        # pagination logic
-        total = len(self.bookings)
-        start = (self.current_page - 1) * self.page_size
-        end = start + self.page_size
-        visible = self.bookings[start:end]
+        visible = self.bookings
 
+        self.table.clearSpans()
         self.table.setRowCount(0)
 
         if not visible:
@@ -142,37 +186,37 @@ class BookingsPage(QWidget):
             self.table.setItem(0, 0, no_item)
             self.table.setSpan(0, 0, 1, 6)
             self.page_label.setText("Page 1")
+            self.prev_button.setEnabled(False)
+            self.next_button.setEnabled(False)
             return
 
         self.table.setRowCount(len(visible))
         for row_idx, booking in enumerate(visible):
-            self.table.setItem(row_idx, 0, QTableWidgetItem(str(booking["flight_number"])))
-            self.table.setItem(row_idx, 1, QTableWidgetItem(booking["departure"]))
-            self.table.setItem(row_idx, 2, QTableWidgetItem(booking["arrival"]))
-            self.table.setItem(row_idx, 3, QTableWidgetItem(booking["date"]))
-            self.table.setItem(row_idx, 4, QTableWidgetItem(booking["status"]))
+            self.table.setItem(row_idx, 0, QTableWidgetItem(str(booking["booking_id"])))
+            self.table.setItem(row_idx, 1, QTableWidgetItem(str(booking["flight_number"])))
+            self.table.setItem(row_idx, 2, QTableWidgetItem(booking["departure"]))
+            self.table.setItem(row_idx, 3, QTableWidgetItem(booking["arrival"]))
+            self.table.setItem(row_idx, 4, QTableWidgetItem(booking["date"]))
 
             cancel_button = QPushButton("Cancel")
-            cancel_button.clicked.connect(lambda _, b=booking: self.cancel_booking(b))
+            cancel_button.clicked.connect(lambda _, bid=booking["booking_id"]: self.cancel_booking(bid))
             self.table.setCellWidget(row_idx, 5, cancel_button)
 
-        total_pages = max(1, (total + self.page_size - 1) // self.page_size)
+        total_pages = max(1, (self.total + self.page_size - 1) // self.page_size)
         self.page_label.setText(f"Page {self.current_page} of {total_pages}")
+        self.prev_button.setEnabled(self.prev_cursor is not None)
+        self.next_button.setEnabled(self.next_cursor is not None)
 
     # ------------------------------
     # Pagination handlers
     # ------------------------------
     def next_page(self):
-        total = len(self.filtered_bookings)
-        total_pages = max(1, (total + self.page_size - 1) // self.page_size)
-        if self.current_page < total_pages:
-            self.current_page += 1
-            self.refresh_table()
+        if self.next_cursor:
+            self.fetch_page(self.next_cursor, self.current_page + 1)
 
     def prev_page(self):
-        if self.current_page > 1:
-            self.current_page -= 1
-            self.refresh_table()
+        if self.prev_cursor:
+            self.fetch_page(self.prev_cursor, self.current_page - 1)
 
     # ------------------------------
     # Cancel booking logic
@@ -187,9 +231,17 @@ class BookingsPage(QWidget):
         )
 
         if reply == QMessageBox.Yes:
-            success = BookingService.cancel_booking(booking_id)
-            if success:
-                QMessageBox.information(self, "Booking Canceled", "Your booking has been canceled successfully.")
-                self.load_bookings()
-            else:
-                QMessageBox.warning(self, "Error", "Unable to cancel the booking. Please try again.")
+            # one channel per booking: cancelling another booking must not supersede this write
+            self.runner.submit(
+                f"cancel-{booking_id}", BookingService.cancel_booking, booking_id,
+                on_result=self.cancel_done,
+                on_error=lambda e: self.cancel_done(False),
+            )
+
+    def cancel_done(self, success):
+        if success:
+            QMessageBox.information(self, "Booking Canceled", "Your booking has been canceled successfully.")
+            self.total = max(0, self.total - 1)
+            self.fetch_page(self.page_cursor, self.current_page)
+        else:
+            QMessageBox.warning(self, "Error", "Unable to cancel the booking. Please try again.")
@@ -1,14 +1,16 @@
 # -*- coding: utf-8 -*-
 from typing import Optional
 from PyQt5.QtWidgets import (
-    QWidget, QVBoxLayout, QLabel, QTableWidget, QTableWidgetItem,
+    QWidget, QVBoxLayout, QLabel, QTableView,
     QPushButton, QMessageBox, QHeaderView, QHBoxLayout
 )
 from PyQt5.QtGui import QFont
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QTimer
 
 from backend.flight_service import FlightService
 from backend.booking_service import BookingService
+from ui.workers import BackendRunner
+from ui.flights_table import FlightsTableModel, BookButtonDelegate, ACTION_COLUMN
 
 
 class FlightsPage(QWidget):
@@ -25,15 +27,36 @@ class FlightsPage(QWidget):
         title.setAlignment(Qt.AlignCenter) # type: ignore
         self._layout.addWidget(title)
 
-        # Table setup
-        self.table = QTableWidget()
-        self.table.setColumnCount(6)
-        self.table.setHorizontalHeaderLabels([
-            "ID", "From", "To", "Date", "Available Seats", "Action"
-        ])
+        # Loading indicator
+        self.status_label = QLabel("")
+        self.status_label.setAlignment(Qt.AlignCenter) # type: ignore
+        self._layout.addWidget(self.status_label)
+
+        # Backend calls run on a worker pool; results come back as signals
+        self.runner = BackendRunner(self)
+        self.runner.busy_changed.connect(self.set_loading)
+
+        # Table setup: rows are fetched page by page as the user scrolls
+        self.model = FlightsTableModel(self.runner, self)
+        self.model.total_changed.connect(lambda _: self.set_loading(self.runner.is_busy()))
+        self.model.load_failed.connect(self.show_load_error)
+
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.book_delegate = BookButtonDelegate(self.table)
+        self.book_delegate.clicked.connect(self.book_row)
+        self.table.setItemDelegateForColumn(ACTION_COLUMN, self.book_delegate)
+
         header = self.table.horizontalHeader()
         if header:
             header.setSectionResizeMode(QHeaderView.Stretch)
+            header.setSortIndicator(3, Qt.AscendingOrder)  # matches the model's default (date)
+        rows = self.table.verticalHeader()
+        if rows:
+            rows.setSectionResizeMode(QHeaderView.Fixed)  # uniform rows: no per-row measuring
+            rows.setDefaultSectionSize(30)
+            rows.hide()
+        self.table.setSortingEnabled(True)  # header clicks -> model.sort -> ORDER BY in SQL
         self._layout.addWidget(self.table)
 
         # Refresh button
@@ -44,41 +67,61 @@ class FlightsPage(QWidget):
         btn_layout.setAlignment(Qt.AlignCenter) # type: ignore
         self._layout.addLayout(btn_layout)
 
-        # Load data
-        self.load_flights()
+        # Load data once the page has painted
+        QTimer.singleShot(0, self.load_flights)
+
+    def set_loading(self, busy: bool) -> None:
+        if busy:
+            self.status_label.setText("⏳ Loading...")
+        else:
+            self.status_label.setText(f"Showing {self.model.rowCount():,} of {self.model.total:,} flights")
+        self.refresh_btn.setEnabled(not busy)
 
     def load_flights(self) -> None:
-        """Load flight data from the database"""
-        flights = FlightService.get_all_flights() or []
-        self.table.setRowCount(len(flights))
-
-        for row_idx, flight in enumerate(flights):
-            self.table.setItem(row_idx, 0, QTableWidgetItem(str(flight.get("flight_id", ""))))
-            self.table.setItem(row_idx, 1, QTableWidgetItem(flight.get("departure", "")))
-            self.table.setItem(row_idx, 2, QTableWidgetItem(flight.get("destination", "")))
-            self.table.setItem(row_idx, 3, QTableWidgetItem(flight.get("date", "")))
-            self.table.setItem(row_idx, 4, QTableWidgetItem(str(flight.get("available_seats", ""))))
-
-            # Book button
-            book_btn = QPushButton("Book Now")
-            book_btn.clicked.connect(lambda _, fid=flight["flight_id"]: self.book_flight(fid))
-            self.table.setCellWidget(row_idx, 5, book_btn)
+        """Reload from the first page (a newer refresh supersedes this one)"""
+        self.model.reload()
+
+    def apply_changes(self, changes: dict) -> None:
+        """Patch the rows changed elsewhere (ChangePoller.changed); a reset reloads."""
+        if changes["reset"]:
+            self.load_flights()
+        elif changes["flights"]:
+            self.model.apply_changes(changes["flights"], changes["flight_rows"])
+
+    def show_load_error(self, error: Exception) -> None:
+        QMessageBox.critical(self, "Error", f"❌ Could not load flights: {error}")
+
+    def book_row(self, row: int) -> None:
+        self.book_flight(self.model.flight_at(row)["flight_id"])
 
     def book_flight(self, flight_id: int) -> None:
-        """Book a flight using BookingService"""
-        try:
-            booking: Optional[dict] = BookingService.create_booking(
-                user_id=self.user["user_id"],
-                flight_id=flight_id,
-                seat_count=1
-            )
-            if not booking:
-                raise ValueError("Booking creation failed.")
-            QMessageBox.information(
-                self,
-                "Booking Confirmed",
-                f"✅ Booking created successfully!\n\nBooking ID: {booking['booking_id']}"
-            )
-            self.load_flights()  # Refresh available seats
-        except Exception as e:
-            QMessageBox.critical(self, "Booking Failed", f"❌ {str(e)}")
+        """Book a flight using BookingService (one booking in flight at a time)"""
+        if self.runner.is_busy("book"):
+            return
+        self.runner.submit(
+            "book", BookingService.create_booking,
+            user_id=self.user["user_id"],
+            flight_id=flight_id,
+            seat_count=1,
+            on_result=self.booking_done,
+            on_error=self.booking_failed,
+        )
+
+    def booking_done(self, booking: Optional[dict]) -> None:
+        if not booking:
+            self.booking_failed(ValueError("Booking creation failed."))
+            return
+        QMessageBox.information(
+            self,
+            "Booking Confirmed",
+            f"✅ Booking created successfully!\n\nBooking ID: {booking['booking_id']}"
+        )
+        # Refresh available seats on just that row
+        flight_id = booking["flight_id"]
+        self.runner.submit(
+            f"row-{flight_id}", FlightService.get_flight_by_id, flight_id,
+            on_result=self.model.update_flight,
+        )
+
+    def booking_failed(self, error: Exception) -> None:
+        QMessageBox.critical(self, "Booking Failed", f"❌ {str(error)}")
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+from PyQt5.QtWidgets import (
+    QWidget, QVBoxLayout, QLabel, QTableWidget, QTableWidgetItem,
+    QPushButton, QHBoxLayout, QHeaderView, QTabWidget
+)
+from PyQt5.QtCore import Qt, QTimer
+
+from backend import metrics
+
+REFRESH_MS = 2000
+
+
+class MetricsPage(QWidget):
+    """Admin view of backend.metrics: service and SQL latency, slow queries."""
+
+    def __init__(self, user: dict):
+        super().__init__()
+        self.user = user
+        self.init_ui()
+
+        # Only poll while the page is on screen and instrumentation is on
+        self.timer = QTimer(self)
+        self.timer.setInterval(REFRESH_MS)
+        self.timer.timeout.connect(self.refresh)
+
+    def init_ui(self):
+        layout = QVBoxLayout()
+        layout.setAlignment(Qt.AlignTop) # type: ignore
+
+        title = QLabel("📊 Performance Metrics")
+        title.setAlignment(Qt.AlignCenter) # type: ignore
+        title.setStyleSheet("font-size: 22px; font-weight: bold; margin-bottom: 15px;")
+
+        # --- Controls ---
+        controls = QHBoxLayout()
+        self.toggle_button = QPushButton()
+        self.toggle_button.clicked.connect(self.toggle)
+        self.reset_button = QPushButton("🧹 Reset")
+        self.reset_button.clicked.connect(self.reset)
+        self.refresh_button = QPushButton("🔄 Refresh")
+        self.refresh_button.clicked.connect(self.refresh)
+        self.status_label = QLabel("")
+        controls.addWidget(self.toggle_button)
+        controls.addWidget(self.reset_button)
+        controls.addWidget(self.refresh_button)
+        controls.addStretch()
+        controls.addWidget(self.status_label)
+
+        # --- Tables ---
+        self.services_table = self._make_table(["Method", "Calls", "p50 ms", "p95 ms", "p99 ms", "Max ms", "Rows", "Errors"])
+        self.sql_table = self._make_table(["Statement", "Count", "p50 ms", "p95 ms", "p99 ms", "Max ms", "Total ms"])
+        self.slow_table = self._make_table(["When", "ms", "Statement", "Plan"], stretch=2)
+
+        tabs = QTabWidget()
+        tabs.addTab(self.services_table, "Service methods")
+        tabs.addTab(self.sql_table, "SQL statements")
+        tabs.addTab(self.slow_table, "Slow queries")
+
+        layout.addWidget(title)
+        layout.addLayout(controls)
+        layout.addWidget(tabs)
+        self.setLayout(layout)
+        self.refresh()
+
+    def _make_table(self, headers, stretch=0):
+        table = QTableWidget()
+        table.setColumnCount(len(headers))
+        table.setHorizontalHeaderLabels(headers)
+        table.setEditTriggers(QTableWidget.NoEditTriggers)
+        header = table.horizontalHeader()
+        if header:
+            header.setSectionResizeMode(QHeaderView.ResizeToContents)
+            header.setSectionResizeMode(stretch, QHeaderView.Stretch)
+        return table
+
+    # ------------------------------
+    # Page lifecycle
+    # ------------------------------
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh()
+        if metrics.is_enabled():
+            self.timer.start()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.timer.stop()
+
+    # ------------------------------
+    # Actions
+    # ------------------------------
+    def toggle(self):
+        if metrics.is_enabled():
+            metrics.disable()
+            self.timer.stop()
+        else:
+            metrics.enable()
+            self.timer.start()
+        self.refresh()
+
+    def reset(self):
+        metrics.reset()
+        self.refresh()
+
+    def refresh(self):
+        snap = metrics.snapshot()
+        enabled = snap["enabled"]
+        self.toggle_button.setText("⏸ Disable instrumentation" if enabled else "▶ Enable instrumentation")
+        self.status_label.setText("🟢 Recording" if enabled else "⚪ Off")
+
+        self._fill(self.services_table, [
+            (name, s["count"], s["p50_ms"], s["p95_ms"], s["p99_ms"], s["max_ms"], s["rows"], s["errors"])
+            for name, s in snap["services"].items()
+        ])
+        self._fill(self.sql_table, [
+            (shape, s["count"], s["p50_ms"], s["p95_ms"], s["p99_ms"], s["max_ms"], s["total_ms"])
+            for shape, s in snap["sql"].items()
+        ])
+        self._fill(self.slow_table, [
+            (e["at"], e["ms"], e["shape"], " | ".join(e["plan"]))
+            for e in snap["slow_queries"]
+        ])
+
+    def _fill(self, table, rows):
+        table.setRowCount(len(rows))
+        for row_idx, row in enumerate(rows):
+            for col_idx, value in enumerate(row):
+                item = QTableWidgetItem(str(value))
+                if col_idx == 0 or isinstance(value, str) and len(value) > 40:
+                    item.setToolTip(str(value))
+                table.setItem(row_idx, col_idx, item)
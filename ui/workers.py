@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+# ui/workers.py
+"""
+Run backend calls off the GUI thread.
+
+BackendRunner hands blocking service calls to a QThreadPool and delivers
+their results back on the GUI thread through signals:
+
+    self.runner = BackendRunner(self)
+    self.runner.busy_changed.connect(self.set_loading)
+    self.runner.submit("load", FlightService.get_all_flights, on_result=self.show_flights)
+
+Calls are grouped by channel. Submitting on a channel supersedes the
+previous call there: if it has not started it is pulled from the queue,
+otherwise its result is dropped when it arrives. Only reads should share a
+channel — a superseded write still runs to completion.
+"""
+import traceback
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal, pyqtSlot
+
+
+class WorkerSignals(QObject):
+    result = pyqtSignal(int, object)   # task id, return value
+    error = pyqtSignal(int, object)    # task id, exception
+    finished = pyqtSignal(int)         # task id
+
+
+class ServiceTask(QRunnable):
+    """One blocking call, executed on a pool thread."""
+
+    def __init__(self, task_id, fn, args, kwargs):
+        super().__init__()
+        self.task_id = task_id
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.cancelled = False
+        self.signals = WorkerSignals()
+        # The runner keeps the reference; tryTake() needs the object alive.
+        self.setAutoDelete(False)
+
+    @pyqtSlot()
+    def run(self):
+        try:
+            if self.cancelled:
+                return
+            value = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            e.traceback_text = traceback.format_exc()
+            self.signals.error.emit(self.task_id, e)
+        else:
+            self.signals.result.emit(self.task_id, value)
+        finally:
+            self.signals.finished.emit(self.task_id)
+
+
+class BackendRunner(QObject):
+    """Per-page dispatcher: one pool, latest-wins channels, a busy signal."""
+
+    busy_changed = pyqtSignal(bool)
+
+    def __init__(self, parent=None, pool=None):
+        super().__init__(parent)
+        self.pool = pool or QThreadPool.globalInstance()
+        self._next_id = 0
+        self._tasks = {}    # task id -> (task, channel, on_result, on_error)
+        self._latest = {}   # channel -> task id whose result is still wanted
+        self._busy = False
+
+    def submit(self, channel, fn, *args, on_result=None, on_error=None, **kwargs):
+        """Queue fn(*args, **kwargs); returns the task id."""
+        self._supersede(channel)
+        self._next_id += 1
+        task = ServiceTask(self._next_id, fn, args, kwargs)
+        task.signals.result.connect(self._on_result)
+        task.signals.error.connect(self._on_error)
+        task.signals.finished.connect(self._on_finished)
+
+        self._tasks[task.task_id] = (task, channel, on_result, on_error)
+        self._latest[channel] = task.task_id
+        self.pool.start(task)
+        self._update_busy()
+        return task.task_id
+
+    def cancel(self, channel):
+        """Drop the pending call on `channel`, if any."""
+        self._supersede(channel)
+        self._update_busy()
+
+    def cancel_all(self):
+        for channel in list(self._latest):
+            self._supersede(channel)
+        self._update_busy()
+
+    def _supersede(self, channel):
+        task_id = self._latest.pop(channel, None)
+        entry = self._tasks.get(task_id)
+        if entry is None:
+            return
+        task = entry[0]
+        task.cancelled = True
+        if self.pool.tryTake(task):
+            # never started, so no finished signal will come
+            del self._tasks[task_id]
+
+    def is_busy(self, channel=None):
+        if channel is None:
+            return bool(self._latest)
+        return channel in self._latest
+
+    # ------------------------------------------------------------------
+    # Delivery (GUI thread)
+    # ------------------------------------------------------------------
+    def _wanted(self, task_id):
+        entry = self._tasks.get(task_id)
+        if entry is None or self._latest.get(entry[1]) != task_id:
+            return None
+        return entry
+
+    @pyqtSlot(int, object)
+    def _on_result(self, task_id, value):
+        entry = self._wanted(task_id)
+        if entry is None:
+            return
+        del self._latest[entry[1]]
+        if entry[2] is not None:
+            entry[2](value)
+
+    @pyqtSlot(int, object)
+    def _on_error(self, task_id, error):
+        entry = self._wanted(task_id)
+        if entry is None:
+            return
+        del self._latest[entry[1]]
+        if entry[3] is not None:
+            entry[3](error)
+        else:
+            print(f"❌ Background call failed: {error}")
+            print(getattr(error, "traceback_text", ""))
+
+    @pyqtSlot(int)
+    def _on_finished(self, task_id):
+        entry = self._tasks.pop(task_id, None)
+        if entry is None:
+            return
+        if self._latest.get(entry[1]) == task_id:
+            # finished without delivering anything
+            del self._latest[entry[1]]
+        self._update_busy()
+
+    def _update_busy(self):
+        busy = self.is_busy()
+        if busy != self._busy:
+            self._busy = busy
+            self.busy_changed.emit(busy)